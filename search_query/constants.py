@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import typing
+import warnings
+import weakref
 from dataclasses import dataclass
 from enum import Enum
 from typing import Tuple
@@ -82,24 +84,79 @@ class ListToken:
 
 # pylint: disable=too-few-public-methods
 class SearchField:
-    """SearchField class."""
+    """SearchField class.
 
-    def __init__(
-        self,
+    Search fields are immutable. Fields without a position are interned,
+    i.e., there is one (shared) instance per field value, which can be
+    compared by identity. When a field is assigned to a query node, the
+    position is stored at the node (see Query.field_position).
+    """
+
+    __slots__ = ("value", "_position", "__weakref__")
+
+    value: str
+    _position: typing.Optional[typing.Tuple[int, int]]
+
+    # Interned (shared) search fields by value (dropped when no longer referenced)
+    _INTERNED: weakref.WeakValueDictionary[
+        str, SearchField
+    ] = weakref.WeakValueDictionary()
+
+    def __new__(
+        cls,
         value: str,
         *,
         position: typing.Optional[typing.Tuple[int, int]] = None,
-    ) -> None:
-        """init method"""
-        self.value = value
-        self.position = position
+    ) -> SearchField:
+        if position is None:
+            field = cls._INTERNED.get(value)
+            if field is not None:
+                return field
+        field = super().__new__(cls)
+        object.__setattr__(field, "value", value)
+        object.__setattr__(field, "_position", position)
+        if position is None:
+            cls._INTERNED[value] = field
+        return field
+
+    @property
+    def position(self) -> typing.Optional[typing.Tuple[int, int]]:
+        """Position passed to the constructor (deprecated).
+
+        Query nodes store the position of their field (see Query.field_position).
+        """
+        warnings.warn(
+            "SearchField.position is deprecated (and None for the fields of "
+            "query nodes); use Query.field_position instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._position
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        raise AttributeError("SearchField instances are immutable")
+
+    def __reduce__(self) -> tuple:
+        return (_create_search_field, (self.value, self._position))
+
+    def __copy__(self) -> SearchField:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> SearchField:
+        return self
 
     def __str__(self) -> str:
         return self.value
 
     def copy(self) -> SearchField:
-        """Return a copy of the SearchField instance."""
-        return SearchField(self.value, position=self.position)
+        """Return a copy of the SearchField instance (immutable, i.e., itself)."""
+        return self
+
+
+def _create_search_field(
+    value: str, position: typing.Optional[typing.Tuple[int, int]]
+) -> SearchField:
+    return SearchField(value, position=position)
 
 
 class Operators:
@@ -180,6 +237,13 @@ class Fields:
         ]
 
 
+class RecordStatus:
+    """Record status labels (colrev_status) used to evaluate queries"""
+
+    RELEVANT = {"rev_included"}
+    IRRELEVANT = {"rev_excluded", "rev_prescreen_excluded"}
+
+
 class ExitCodes:
     """Exit codes"""
 
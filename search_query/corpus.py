@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Indexed record corpus for evaluating queries."""
+from __future__ import annotations
+
+import re
+import typing
+
+from search_query.constants import Fields
+from search_query.constants import RecordStatus
+
+TOKEN_REGEX = re.compile(r"\w+")
+
+
+def token_positions(text: str) -> typing.Dict[str, typing.List[int]]:
+    """Map each token of the (lower-cased) text to its sorted token offsets."""
+    positions: typing.Dict[str, typing.List[int]] = {}
+    for offset, token in enumerate(TOKEN_REGEX.findall(text)):
+        positions.setdefault(token, []).append(offset)
+    return positions
+
+
+class RecordCorpus:
+    """Inverted index over a records dict (as passed to Query.evaluate()).
+
+    The indexed fields are lower-cased and tokenized once. Queries are then
+    evaluated as set operations on posting lists (sets of record indices)
+    instead of scanning every record for every query node.
+    """
+
+    INDEXED_FIELDS = (Fields.TITLE, Fields.ABSTRACT)
+
+    def __init__(self, records_dict: dict) -> None:
+        self.records_dict = records_dict
+        self.record_ids: typing.List[str] = list(records_dict)
+        self.records: typing.List[dict] = list(records_dict.values())
+        self.all_ids = frozenset(range(len(self.records)))
+
+        self.texts: typing.Dict[str, typing.List[str]] = {}
+        self.postings: typing.Dict[str, typing.Dict[str, typing.Set[int]]] = {}
+        for field in self.INDEXED_FIELDS:
+            texts = []
+            postings: typing.Dict[str, typing.Set[int]] = {}
+            for index, record in enumerate(self.records):
+                text = record.get(field, "")
+                text = text.lower() if isinstance(text, str) else ""
+                texts.append(text)
+                for token in TOKEN_REGEX.findall(text):
+                    postings.setdefault(token, set()).add(index)
+            self.texts[field] = texts
+            self.postings[field] = postings
+
+        relevant_ids = set()
+        irrelevant_ids = set()
+        for index, record in enumerate(self.records):
+            status = record.get("colrev_status")
+            if status in RecordStatus.RELEVANT:
+                relevant_ids.add(index)
+            elif status in RecordStatus.IRRELEVANT:
+                irrelevant_ids.add(index)
+        self.relevant_ids = frozenset(relevant_ids)
+        self.irrelevant_ids = frozenset(irrelevant_ids)
+
+        self._fragment_cache: typing.Dict[typing.Tuple[str, str], frozenset] = {}
+        self._token_pattern_cache: typing.Dict[typing.Tuple[str, str], frozenset] = {}
+        self._positions: typing.Dict[
+            typing.Tuple[str, int], typing.Dict[str, typing.List[int]]
+        ] = {}
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def records_with_token(self, field: str, token: str) -> frozenset:
+        """Return the indices of records in which the token occurs."""
+        return frozenset(self.postings[field].get(token, ()))
+
+    def records_with_token_pattern(self, field: str, pattern: re.Pattern) -> frozenset:
+        """Return the indices of records with a token that matches the pattern."""
+        key = (field, pattern.pattern)
+        if key not in self._token_pattern_cache:
+            selected: typing.Set[int] = set()
+            for token, ids in self.postings[field].items():
+                if pattern.fullmatch(token):
+                    selected.update(ids)
+            self._token_pattern_cache[key] = frozenset(selected)
+        return self._token_pattern_cache[key]
+
+    def records_with_fragment(self, field: str, fragment: str) -> frozenset:
+        """Return the indices of records with a token that contains the fragment.
+
+        The fragment must consist of word characters (see TOKEN_REGEX), so that
+        any occurrence in a text is contained in exactly one token.
+        """
+        key = (field, fragment)
+        if key not in self._fragment_cache:
+            selected: typing.Set[int] = set()
+            for token, ids in self.postings[field].items():
+                if fragment in token:
+                    selected.update(ids)
+            self._fragment_cache[key] = frozenset(selected)
+        return self._fragment_cache[key]
+
+    def token_positions(
+        self, field: str, index: int
+    ) -> typing.Dict[str, typing.List[int]]:
+        """Return the positional index of a record field (built once, on demand)."""
+        key = (field, index)
+        if key not in self._positions:
+            self._positions[key] = token_positions(self.texts[field][index])
+        return self._positions[key]
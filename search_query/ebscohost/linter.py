@@ -302,78 +302,79 @@ class EBSCOQueryStringLinter(QueryStringLinter):
     def check_unsupported_wildcards(self, query: Query) -> None:
         """Check for unsupported characters in the search string."""
 
-        if query.is_term():
-            pattern = re.compile(r"[*?#]")
-            for match in pattern.finditer(query.value):
-                wildcard_value = match.group()
-                index = match.start()
-                position = (-1, -1)
-                if query.position:
-                    position = (
-                        query.position[0] + index,
-                        query.position[0] + match.end(),
-                    )
-
-                is_term_start = index == 0 or query.value[:index].strip('"').isspace()
-                is_term_end = (
-                    index == len(query.value) - 1
-                    or query.value[index:].strip('"').isspace()
+        for node in query.walk():
+            if node.is_term():
+                self._check_unsupported_wildcards_in_term(node)
+
+    def _check_unsupported_wildcards_in_term(self, query: Query) -> None:
+        pattern = re.compile(r"[*?#]")
+        for match in pattern.finditer(query.value):
+            wildcard_value = match.group()
+            index = match.start()
+            position = (-1, -1)
+            if query.position:
+                position = (
+                    query.position[0] + index,
+                    query.position[0] + match.end(),
                 )
 
-                if wildcard_value == "*":
-                    if is_term_start:
-                        self.add_message(
-                            QueryErrorCode.EBSCO_WILDCARD_UNSUPPORTED,
-                            positions=[position],
-                            details="Wildcard at the beginning of a term has no effect.",
-                            fatal=False,
-                        )
-                    elif not query.value[index - 1] == " ":
-                        leading_char_count = 0
-                        prev = wildcard_value
-                        for c in reversed(query.value[:index]):
-                            if c in ' "' or leading_char_count >= 3:
-                                break
-                            if c == "*" or (c in "#?" and prev in "#?"):
-                                # Count multiple # or ? wildcards in a row as one char, skip * wildcards.
-                                continue
-                            leading_char_count += 1
-                            prev = c
-                        if leading_char_count < 3:
-                            self.add_message(
-                                QueryErrorCode.EBSCO_WILDCARD_UNSUPPORTED,
-                                positions=[position],
-                                details="EBSCOHost documentation recommends using at least three characters before *. Shorter prefixes may yield inconsistent results.",
-                                fatal=False,
-                            )
-
-                if wildcard_value == "?":
-                    if is_term_start:
-                        self.add_message(
-                            QueryErrorCode.EBSCO_WILDCARD_UNSUPPORTED,
-                            positions=[position],
-                            details="Wildcard at the beginning of a term has no effect.",
-                            fatal=False,
-                        )
-                    if is_term_end and query.value[index - 1] != "#":
-                        self.add_message(
-                            QueryErrorCode.EBSCO_WILDCARD_UNSUPPORTED,
-                            positions=[position],
-                            details="Trailing ? is interpreted as a literal question mark, not a wildcard. Use #? to force wildcard behavior.",
-                            fatal=False,
-                        )
+            is_term_start = index == 0 or query.value[:index].strip('"').isspace()
+            is_term_end = (
+                index == len(query.value) - 1
+                or query.value[index:].strip('"').isspace()
+            )
 
-                if wildcard_value == "#":
-                    if is_term_start:
+            if wildcard_value == "*":
+                if is_term_start:
+                    self.add_message(
+                        QueryErrorCode.EBSCO_WILDCARD_UNSUPPORTED,
+                        positions=[position],
+                        details="Wildcard at the beginning of a term has no effect.",
+                        fatal=False,
+                    )
+                elif not query.value[index - 1] == " ":
+                    leading_char_count = 0
+                    prev = wildcard_value
+                    for c in reversed(query.value[:index]):
+                        if c in ' "' or leading_char_count >= 3:
+                            break
+                        if c == "*" or (c in "#?" and prev in "#?"):
+                            # Count multiple # or ? wildcards in a row as one char, skip * wildcards.
+                            continue
+                        leading_char_count += 1
+                        prev = c
+                    if leading_char_count < 3:
                         self.add_message(
                             QueryErrorCode.EBSCO_WILDCARD_UNSUPPORTED,
                             positions=[position],
-                            details="Wildcard beginning of a term has no effect.",
+                            details="EBSCOHost documentation recommends using at least three characters before *. Shorter prefixes may yield inconsistent results.",
                             fatal=False,
                         )
 
-        for child in query.children:
-            self.check_unsupported_wildcards(child)
+            if wildcard_value == "?":
+                if is_term_start:
+                    self.add_message(
+                        QueryErrorCode.EBSCO_WILDCARD_UNSUPPORTED,
+                        positions=[position],
+                        details="Wildcard at the beginning of a term has no effect.",
+                        fatal=False,
+                    )
+                if is_term_end and query.value[index - 1] != "#":
+                    self.add_message(
+                        QueryErrorCode.EBSCO_WILDCARD_UNSUPPORTED,
+                        positions=[position],
+                        details="Trailing ? is interpreted as a literal question mark, not a wildcard. Use #? to force wildcard behavior.",
+                        fatal=False,
+                    )
+
+            if wildcard_value == "#":
+                if is_term_start:
+                    self.add_message(
+                        QueryErrorCode.EBSCO_WILDCARD_UNSUPPORTED,
+                        positions=[position],
+                        details="Wildcard beginning of a term has no effect.",
+                        fatal=False,
+                    )
 
     def _get_generic_field_set(self, value: str) -> set:
         return syntax_str_to_generic_field_set(value)
@@ -395,8 +396,9 @@ class EBSCOQueryStringLinter(QueryStringLinter):
 
         term_field_query = self.get_query_with_normalized_fields_at_terms(query)
         self._check_redundant_terms(term_field_query, ["TI", "AB", "XB"])
-        self._check_non_global_date_filter(term_field_query)
-        self._check_non_global_journal_filter(term_field_query)
+        # Note: filters in nested AND/NOT subqueries are not reported
+        self._check_non_global_date_filter(term_field_query, check_nested=False)
+        self._check_non_global_journal_filter(term_field_query, check_nested=False)
         self._check_for_wildcard_usage(term_field_query)
 
 
@@ -30,20 +30,27 @@ class EBSCOParser(QueryStringParser):
 
     QUOTATION_MARK_REGEX = re.compile(r'"')
     TERM_REGEX = re.compile(r'[^\s()"]+')
+    # Field tokens that could be search terms (see fix_ambiguous_tokens())
+    POTENTIAL_TERM_REGEX = re.compile(r"[A-Z]{2,}")
+    # Note: search fields do not end the look-ahead for closing quotes
+    QUOTE_BOUNDARY_TOKEN_TYPES = ()
 
     OPERATOR_REGEX = re.compile(
         "|".join([LOGIC_OPERATOR_REGEX.pattern, PROXIMITY_OPERATOR_REGEX.pattern])
     )
 
+    # Note: one named group per token type
     pattern = re.compile(
         "|".join(
-            [
-                PARENTHESIS_REGEX.pattern,
-                LOGIC_OPERATOR_REGEX.pattern,
-                PROXIMITY_OPERATOR_REGEX.pattern,
-                FIELD_REGEX.pattern,
-                QUOTATION_MARK_REGEX.pattern,
-                TERM_REGEX.pattern,
+            f"(?P<{token_type.name}>{token_pattern})"
+            for token_type, token_pattern in [
+                (TokenTypes.PARENTHESIS_OPEN, r"\("),
+                (TokenTypes.PARENTHESIS_CLOSED, r"\)"),
+                (TokenTypes.LOGIC_OPERATOR, LOGIC_OPERATOR_REGEX.pattern),
+                (TokenTypes.PROXIMITY_OPERATOR, PROXIMITY_OPERATOR_REGEX.pattern),
+                (TokenTypes.FIELD, FIELD_REGEX.pattern),
+                (TokenTypes.QUOTATION_MARK, QUOTATION_MARK_REGEX.pattern),
+                (TokenTypes.TERM, TERM_REGEX.pattern),
             ]
         )
     )
@@ -93,112 +100,86 @@ class EBSCOParser(QueryStringParser):
         token.value = operator
         return distance
 
-    def _has_closing_quote(self, index: int) -> bool:
-        """Look ahead from a quote at `index` to see if a matching closing quote exists. Stops at defined structural boundaries to identify likely unbalanced quotes."""
-        if self.tokens[index].type != TokenTypes.QUOTATION_MARK:
-            return False
-
-        open_paren = 0
-        index += 1
-        for token in self.tokens[index:]:
-            if token.type == TokenTypes.PARENTHESIS_OPEN:
-                open_paren += 1
-            if token.type == TokenTypes.PARENTHESIS_CLOSED:
-                if open_paren <= 0:
-                    # Boundary: unmatched local closing paren → likely unbalanced quote
-                    break
-                open_paren -= 1
-            if (
-                token.type in [TokenTypes.LOGIC_OPERATOR, TokenTypes.RANGE_OPERATOR]
-                and token.value.isupper()
-            ):
-                # Boundary: upper case operator → likely unbalanced quote
-                break
-            if token.type == TokenTypes.QUOTATION_MARK:
-                if open_paren != 0:
-                    # Boundary: unmatched local opening paren → likely unbalanced quote
-                    break
-                # Matching closing quote found
-                return True
-
-        return False
-
     def fix_ambiguous_tokens(self) -> None:
         """Fix ambiguous tokens that could be misinterpreted as a search field."""
 
-        def is_potential_term(token_str: str) -> bool:
-            return bool(re.fullmatch(r"[A-Z]{2,}", token_str))
+        # Note: the fixes are stages (generators) applied in one pass over the tokens
+        tokens = self._fix_fields_followed_by_fields(self.tokens)
+        tokens = self._fix_fields_followed_by_operators(tokens)
+        tokens = self._fix_fields_followed_by_closing_parentheses(tokens)
+        self.tokens = list(tokens)
 
+    def _fix_fields_followed_by_fields(
+        self, tokens: typing.Iterable[Token]
+    ) -> typing.Iterator[Token]:
         # Field token followed by term which is misclassified as a field token
-        for i in range(len(self.tokens) - 1):
-            current = self.tokens[i]
-            next_token = self.tokens[i + 1]
-
+        for current, next_token in self._with_next_token(tokens):
             if (
-                current.type == TokenTypes.FIELD
+                next_token is not None
+                and current.type == TokenTypes.FIELD
                 and next_token.type == TokenTypes.FIELD
-                and is_potential_term(next_token.value)
+                and self.POTENTIAL_TERM_REGEX.fullmatch(next_token.value)
             ):
                 # Reclassify the second field token as a TERM
                 next_token.type = TokenTypes.TERM
+            yield current
 
+    def _fix_fields_followed_by_operators(
+        self, tokens: typing.Iterable[Token]
+    ) -> typing.Iterator[Token]:
         # Term followed by operator is misclassified as a field token
-        for i in range(len(self.tokens) - 1):
-            current = self.tokens[i]
-            next_token = self.tokens[i + 1]
-
+        for current, next_token in self._with_next_token(tokens):
             if (
-                current.type == TokenTypes.FIELD
+                next_token is not None
+                and current.type == TokenTypes.FIELD
                 and next_token.type
                 in [TokenTypes.LOGIC_OPERATOR, TokenTypes.PROXIMITY_OPERATOR]
-                and is_potential_term(current.value)
+                and self.POTENTIAL_TERM_REGEX.fullmatch(current.value)
             ):
-                # Reclassify the second field token as a TERM
+                # Reclassify the field token as a TERM
                 current.type = TokenTypes.TERM
+            yield current
 
+    def _fix_fields_followed_by_closing_parentheses(
+        self, tokens: typing.Iterable[Token]
+    ) -> typing.Iterator[Token]:
         # Operator followed by a field token followed by a closing parenthesis
-        for i in range(len(self.tokens) - 2):
-            current = self.tokens[i]
-            next_token = self.tokens[i + 1]
-            next_next_token = self.tokens[i + 2]
-
+        previous: typing.List[Token] = []
+        for token in tokens:
             if (
-                current.type
+                len(previous) == 2
+                and previous[0].type
                 in [TokenTypes.LOGIC_OPERATOR, TokenTypes.PROXIMITY_OPERATOR]
-                and next_token.type == TokenTypes.FIELD
-                and next_next_token.type == TokenTypes.PARENTHESIS_CLOSED
+                and previous[1].type == TokenTypes.FIELD
+                and token.type == TokenTypes.PARENTHESIS_CLOSED
             ):
                 # Reclassify the field token as a TERM
-                next_token.type = TokenTypes.TERM
+                previous[1].type = TokenTypes.TERM
+            if len(previous) == 2:
+                yield previous.pop(0)
+            previous.append(token)
+        yield from previous
 
     def tokenize(self) -> None:
         """Tokenize the query_str."""
 
         self.tokens = []
-        token_type = TokenTypes.UNKNOWN
+        previous_end = -1
         for match in self.pattern.finditer(self.query_str):
             value = match.group()
-            value = value.strip()
             start, end = match.span()
 
-            # Determine token type
-            if self.PARENTHESIS_REGEX.fullmatch(value):
-                if value == "(":
-                    token_type = TokenTypes.PARENTHESIS_OPEN
-                else:
-                    token_type = TokenTypes.PARENTHESIS_CLOSED
-            elif self.LOGIC_OPERATOR_REGEX.fullmatch(value):
-                token_type = TokenTypes.LOGIC_OPERATOR
-            elif self.PROXIMITY_OPERATOR_REGEX.fullmatch(value):
-                token_type = TokenTypes.PROXIMITY_OPERATOR
-            elif self.FIELD_REGEX.fullmatch(value):
-                token_type = TokenTypes.FIELD
-            elif self.QUOTATION_MARK_REGEX.fullmatch(value):
-                token_type = TokenTypes.QUOTATION_MARK
-            elif self.TERM_REGEX.fullmatch(value):
-                token_type = TokenTypes.TERM
-            else:  # pragma: no cover
-                token_type = TokenTypes.UNKNOWN
+            # Determine token type (named group of the pattern)
+            token_type = TokenTypes[match.lastgroup]  # type: ignore
+            if (
+                token_type == TokenTypes.TERM
+                and start == previous_end
+                and self._is_word_character(self.query_str[start - 1])
+            ):
+                # Note: terms attached to a previous word (no word boundary)
+                # are classified by their value
+                token_type = self._get_token_type(value)
+            previous_end = end
 
             # Append token with its type and position to self.tokens
             self.tokens.append(
@@ -215,39 +196,55 @@ class EBSCOParser(QueryStringParser):
     ) -> Query:
         """Top-down predictive parser for query tree."""
 
+        # Note: subqueries are parsed as index ranges of the (shared) tokens,
+        # and the query tree is validated once (not for every node)
+        self._index_tokens(tokens)
+        with Query.deferred_validation():
+            return self._parse_range(tokens, 0, len(tokens), field_context)
+
+    def _parse_range(
+        self,
+        tokens: list[Token],
+        start: int,
+        end: int,
+        field_context: SearchField | None,
+    ) -> Query:
         # Look ahead to see if field is followed by something valid
         if (
-            tokens
-            and tokens[0].type == TokenTypes.FIELD
-            and len(tokens) > 1
-            and tokens[1].type == TokenTypes.PARENTHESIS_OPEN
+            end - start > 1
+            and tokens[start].type == TokenTypes.FIELD
+            and tokens[start + 1].type == TokenTypes.PARENTHESIS_OPEN
         ):
-            field_token = tokens.pop(0)
+            field_token = tokens[start]
             field_context = SearchField(
                 value=field_token.value, position=field_token.position
             )
-
-        if self._is_compound_query(tokens):
-            return self._parse_compound_query(tokens, field_context)
-        if self._is_nested_query(tokens):
-            return self._parse_nested_query(tokens, field_context)
-        if self._is_term_query(tokens):
-            return self._parse_term(tokens, field_context)
+            start += 1
+
+        if self._is_compound_query(tokens, start, end):
+            return self._parse_compound_query(tokens, start, end, field_context)
+        if self._is_nested_query(tokens, start, end):
+            return self._parse_nested_query(tokens, start, end, field_context)
+        if self._is_term_query(tokens, start, end):
+            return self._parse_term(tokens, start, end, field_context)
         raise ValueError(
-            f"Unrecognized query structure: \n{' '.join(t.value for t in tokens)}\n"
+            "Unrecognized query structure: \n"
+            f"{' '.join(t.value for t in tokens[start:end])}\n"
             "Expected a term, nested query, or compound query."
         )
 
-    def _is_term_query(self, tokens: list[Token]) -> bool:
-        return bool(tokens and len(tokens) <= 2 and tokens[-1].type == TokenTypes.TERM)
+    def _is_term_query(self, tokens: list[Token], start: int, end: int) -> bool:
+        return 0 < end - start <= 2 and tokens[end - 1].type == TokenTypes.TERM
 
-    def _is_compound_query(self, tokens: list[Token]) -> bool:
-        return bool(self._get_operator_indices(tokens))
+    def _is_compound_query(self, tokens: list[Token], start: int, end: int) -> bool:
+        _, lo, hi = self._get_operators_at_depth(start, end, self._depths[start])
+        return lo < hi
 
-    def _is_nested_query(self, tokens: list[Token]) -> bool:
+    def _is_nested_query(self, tokens: list[Token], start: int, end: int) -> bool:
         return (
-            tokens[0].type == TokenTypes.PARENTHESIS_OPEN
-            and tokens[-1].type == TokenTypes.PARENTHESIS_CLOSED
+            end > start
+            and tokens[start].type == TokenTypes.PARENTHESIS_OPEN
+            and tokens[end - 1].type == TokenTypes.PARENTHESIS_CLOSED
         )
 
     def _get_operator_type(self, token: Token) -> str:
@@ -262,37 +259,39 @@ class EBSCOParser(QueryStringParser):
             return "NEAR" if val.startswith("N") else "WITHIN"
         raise ValueError(f"Unrecognized operator: {token.value}")
 
-    def _get_operator_indices(self, tokens: list[Token]) -> list[int]:
+    def _get_operator_indices(
+        self, tokens: list[Token], start: int, end: int
+    ) -> list[int]:
         """Get indices of top-level operators with the lowest precedence value."""
+        operators, lo, hi = self._get_operators_at_depth(
+            start, end, self._depths[start]
+        )
+        if lo == hi:
+            return []
+
+        # The operators of the same type as the first operator, starting
+        # at the last operator with a lower precedence (if any)
+        first_op = self._get_operator_type(tokens[operators[lo]])
+        first_precedence = self.linter.get_precedence(first_op)
         indices: list[int] = []
-        depth = 0
-        prev_op = None
-
-        for i, token in enumerate(tokens):
-            if token.type == TokenTypes.PARENTHESIS_OPEN:
-                depth += 1
-            elif token.type == TokenTypes.PARENTHESIS_CLOSED:
-                depth -= 1
-            elif depth == 0 and token.type in [
-                TokenTypes.LOGIC_OPERATOR,
-                TokenTypes.PROXIMITY_OPERATOR,
-            ]:
-                op = self._get_operator_type(token)
-                if prev_op is None:
-                    prev_op = op
-                    indices.append(i)
-                elif op == prev_op:
-                    indices.append(i)
-                elif self.linter.get_precedence(op) < self.linter.get_precedence(
-                    prev_op
-                ):
-                    indices = [i]
+        for i in reversed(range(lo, hi)):
+            op = self._get_operator_type(tokens[operators[i]])
+            if op == first_op:
+                indices.append(operators[i])
+            elif self.linter.get_precedence(op) < first_precedence:
+                indices.append(operators[i])
+                break
+        indices.reverse()
         return indices
 
     def _parse_compound_query(
-        self, tokens: list[Token], field_context: SearchField | None
+        self,
+        tokens: list[Token],
+        start: int,
+        end: int,
+        field_context: SearchField | None,
     ) -> Query:
-        op_indices = self._get_operator_indices(tokens)
+        op_indices = self._get_operator_indices(tokens, start, end)
         if not op_indices:
             raise ValueError("No operator found for compound query.")
 
@@ -302,51 +301,54 @@ class EBSCOParser(QueryStringParser):
             distance = self._extract_proximity_distance(tokens[op_indices[0]])
         children = []
 
-        start = 0
+        child_start = start
         for idx in op_indices:
-            sub_tokens = tokens[start:idx]
-            children.append(
-                self.parse_query_tree(sub_tokens, field_context=field_context)
-            )
-            start = idx + 1
+            children.append(self._parse_range(tokens, child_start, idx, field_context))
+            child_start = idx + 1
 
-        children.append(
-            self.parse_query_tree(tokens[start:], field_context=field_context)
-        )
+        children.append(self._parse_range(tokens, child_start, end, field_context))
 
         return Query.create(
             value=operator_type,
             field=field_context,
             children=children,  # type: ignore
-            position=(tokens[0].position[0], tokens[-1].position[1]),
+            position=(tokens[start].position[0], tokens[end - 1].position[1]),
             platform="deactivated",
             distance=distance,
         )
 
     def _parse_nested_query(
-        self, tokens: list[Token], field_context: SearchField | None
+        self,
+        tokens: list[Token],
+        start: int,
+        end: int,
+        field_context: SearchField | None,
     ) -> Query:
-        return self.parse_query_tree(tokens[1:-1], field_context=field_context)
+        return self._parse_range(tokens, start + 1, end - 1, field_context)
 
     def _parse_term(
-        self, tokens: list[Token], field_context: SearchField | None
+        self,
+        tokens: list[Token],
+        start: int,
+        end: int,
+        field_context: SearchField | None,
     ) -> Query:
-        if len(tokens) == 1:
+        if end - start == 1:
             return Term(
-                value=tokens[0].value,
-                position=tokens[0].position,
+                value=tokens[start].value,
+                position=tokens[start].position,
                 field=field_context or None,
                 platform="deactivated",
             )
-        assert len(tokens) == 2, "Expected exactly one search term token."
+        assert end - start == 2, "Expected exactly one search term token."
 
-        token = tokens[1]
+        token = tokens[start + 1]
 
         return Term(
             value=token.value,
             position=token.position,
             field=SearchField(
-                value=tokens[0].value, position=tokens[0].position or (-1, -1)
+                value=tokens[start].value, position=tokens[start].position or (-1, -1)
             ),
             platform="deactivated",
         )
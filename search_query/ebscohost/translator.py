@@ -6,6 +6,7 @@ from search_query.constants import Fields
 from search_query.ebscohost.constants import generic_field_to_syntax_field
 from search_query.ebscohost.constants import syntax_str_to_generic_field_set
 from search_query.query import Query
+from search_query.query import SearchField
 from search_query.translator_base import QueryTranslator
 
 
@@ -18,20 +19,19 @@ class EBSCOTranslator(QueryTranslator):
         Translate search fields to standard names using self.field_TRANSLATION_MAP
         """
 
-        # Filter out fields and translate based on field_TRANSLATION_MAP
-        if query.field:
-            original_value = query.field.value
+        # Iterate through queries
+        for node in query.walk():
+            # Filter out fields and translate based on field_TRANSLATION_MAP
+            if not node.field:
+                continue
+            original_value = node.field.value
             generic_fields = syntax_str_to_generic_field_set(original_value)
             if len(generic_fields) == 1:
-                query.field.value = generic_fields.pop()
+                node.field = SearchField(generic_fields.pop())
             else:  # pragma: no cover
                 # No multiple-field mappings for EBSCO?
                 raise NotImplementedError
 
-        # Iterate through queries
-        for child in query.children:
-            cls.translate_fields_to_generic(child)
-
     @classmethod
     def to_generic_syntax(cls, query: Query) -> Query:
         """Convert the query to a generic syntax."""
@@ -43,25 +43,19 @@ class EBSCOTranslator(QueryTranslator):
 
     @classmethod
     def _translate_fields(cls, query: Query) -> None:
-        if query.field:
-            translated_field = generic_field_to_syntax_field(query.field.value)
-            query.field.value = translated_field
-
-        if query.operator:
-            for child in query.children:
-                cls._translate_fields(child)
+        for node in query.walk():
+            if node.field:
+                translated_field = generic_field_to_syntax_field(node.field.value)
+                node.field = SearchField(translated_field)
 
     @classmethod
     def replace_non_supported_fields(cls, query: Query) -> None:
         """Replace non-supported fields with nearest supported field."""
 
-        if query.field:
-            if query.field.value == Fields.KEYWORDS_PLUS:
+        for node in query.walk():
+            if node.field and node.field.value == Fields.KEYWORDS_PLUS:
                 print('Replacing non-supported field "KEYWORDS_PLUS" with "KEYWORDS"')
-                query.field.value = Fields.KEYWORDS
-
-        for child in query.children:
-            cls.replace_non_supported_fields(child)
+                node.field = SearchField(Fields.KEYWORDS)
 
     @classmethod
     def to_specific_syntax(cls, query: Query) -> Query:
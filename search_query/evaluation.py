@@ -0,0 +1,601 @@
+#!/usr/bin/env python3
+"""Evaluation of queries against labelled records."""
+from __future__ import annotations
+
+import collections
+import csv
+import itertools
+import json
+import os
+import re
+import typing
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+
+from search_query.constants import Operators
+from search_query.constants import RecordStatus
+from search_query.corpus import RecordCorpus
+from search_query.matcher import compile_query
+from search_query.matcher import compile_query_nodes
+from search_query.matcher import CompiledQuery
+from search_query.matcher import Matcher
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from search_query.query import Query
+
+DEFAULT_CHUNK_SIZE = 1000
+# Number of records used to estimate the match rates of the query nodes
+DEFAULT_SAMPLE_SIZE = 100
+# Number of (compiled) queries whose match results are cached by a session
+SESSION_CACHE_SIZE = 128
+
+# Compiled query of a worker process (shipped once, see _init_worker())
+_WORKER_QUERY: typing.Optional[CompiledQuery] = None
+
+
+def count_records(
+    compiled_query: CompiledQuery, records: typing.Iterable[dict]
+) -> dict:
+    """Count the confusion matrix of a query for labelled records.
+
+    Records without a relevant/irrelevant colrev_status are ignored.
+    """
+    relevant = irrelevant = true_positives = false_positives = 0
+    for record in records:
+        status = record.get("colrev_status")
+        if status in RecordStatus.RELEVANT:
+            relevant += 1
+            if compiled_query.matches(record):
+                true_positives += 1
+        elif status in RecordStatus.IRRELEVANT:
+            irrelevant += 1
+            if compiled_query.matches(record):
+                false_positives += 1
+
+    return {
+        "total_evaluated": relevant + irrelevant,
+        "selected": true_positives + false_positives,
+        "true_positives": true_positives,
+        "false_positives": false_positives,
+        "false_negatives": relevant - true_positives,
+    }
+
+
+def merge_counts(counts: typing.Iterable[dict]) -> dict:
+    """Merge (partial) confusion matrix counts."""
+    merged = {
+        "total_evaluated": 0,
+        "selected": 0,
+        "true_positives": 0,
+        "false_positives": 0,
+        "false_negatives": 0,
+    }
+    for partial_counts in counts:
+        for key in merged:
+            merged[key] += partial_counts[key]
+    return merged
+
+
+def count_corpus(
+    compiled_query: CompiledQuery,
+    corpus: RecordCorpus,
+    memo: typing.Optional[dict] = None,
+) -> dict:
+    """Count the confusion matrix of a query for an indexed corpus."""
+    selected_ids = compiled_query.select(corpus, memo)
+    true_positives = len(selected_ids & corpus.relevant_ids)
+    false_positives = len(selected_ids & corpus.irrelevant_ids)
+    return {
+        "total_evaluated": len(corpus.relevant_ids) + len(corpus.irrelevant_ids),
+        "selected": true_positives + false_positives,
+        "true_positives": true_positives,
+        "false_positives": false_positives,
+        "false_negatives": len(corpus.relevant_ids) - true_positives,
+    }
+
+
+def get_metrics(counts: dict) -> dict:
+    """Add precision, recall and F1 score to the confusion matrix counts."""
+    results = dict(counts)
+    precision = (
+        results["true_positives"]
+        / (results["true_positives"] + results["false_positives"])
+        if (results["true_positives"] + results["false_positives"]) > 0
+        else 0
+    )
+    recall = (
+        results["true_positives"]
+        / (results["true_positives"] + results["false_negatives"])
+        if (results["true_positives"] + results["false_negatives"]) > 0
+        else 0
+    )
+    f1 = (
+        (2 * precision * recall) / (precision + recall)
+        if (precision + recall) > 0
+        else 0
+    )
+
+    results["precision"] = precision
+    results["recall"] = recall
+    results["f1_score"] = f1
+
+    return results
+
+
+def _init_worker(compiled_query: CompiledQuery) -> None:
+    global _WORKER_QUERY  # pylint: disable=global-statement
+    _WORKER_QUERY = compiled_query
+
+
+def _count_chunk(records: typing.List[dict]) -> dict:
+    assert _WORKER_QUERY is not None, "Worker was not initialized"
+    return count_records(_WORKER_QUERY, records)
+
+
+def _chunks(
+    records: typing.Iterable[dict], chunk_size: int
+) -> typing.Iterator[typing.List[dict]]:
+    iterator = iter(records)
+    while True:
+        chunk = list(itertools.islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def count_records_parallel(
+    compiled_query: CompiledQuery,
+    records: typing.Iterable[dict],
+    *,
+    workers: typing.Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict:
+    """Count the confusion matrix in a process pool.
+
+    The compiled query is shipped once per worker. Records are sent in
+    chunks, with a bounded number of chunks in flight, and the partial
+    counts are merged.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be a positive integer (or None)")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+
+    partial_counts = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(compiled_query,),
+    ) as executor:
+        pending: typing.List[Future] = []
+        for chunk in _chunks(records, chunk_size):
+            pending.append(executor.submit(_count_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                partial_counts.append(pending.pop(0).result())
+        partial_counts.extend(future.result() for future in pending)
+
+    return merge_counts(partial_counts)
+
+
+def get_confusion_matrix(
+    compiled_query: CompiledQuery,
+    records: typing.Union[dict, RecordCorpus, typing.Iterable[dict]],
+    *,
+    workers: typing.Optional[int] = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict:
+    """Count the confusion matrix for a records dict, an indexed corpus,
+    or a stream of records (which is consumed one record at a time).
+
+    The first records are used as a sample to order the children of the
+    query nodes by their match rates (see CompiledQuery.reorder()), unless
+    there are fewer records than the sample size.
+    An indexed corpus is evaluated with set operations (in this process),
+    i.e., workers and chunk_size do not apply.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("workers must be a positive integer (or None)")
+    if isinstance(records, RecordCorpus):
+        return count_corpus(compiled_query, records)
+    if isinstance(records, dict):
+        records = records.values()
+    records_iterator = iter(records)
+    sample = list(itertools.islice(records_iterator, DEFAULT_SAMPLE_SIZE))
+    if len(sample) == DEFAULT_SAMPLE_SIZE:
+        compiled_query = compiled_query.reorder(sample)
+    records = itertools.chain(sample, records_iterator)
+    if workers == 1:
+        return count_records(compiled_query, records)
+    return count_records_parallel(
+        compiled_query, records, workers=workers, chunk_size=chunk_size
+    )
+
+
+def evaluate_many(
+    queries: typing.Iterable[Query], records: typing.Union[dict, RecordCorpus]
+) -> typing.List[dict]:
+    """Evaluate many (variants of) queries in one pass over the records.
+
+    Identical subtrees are shared across the queries (see compile_query()),
+    so that the selection of each distinct subquery is computed only once.
+    Returns the results of Query.evaluate() for each query.
+    """
+    corpus = records if isinstance(records, RecordCorpus) else RecordCorpus(records)
+    interned: dict = {}
+    memo: dict = {}
+    return [
+        get_metrics(count_corpus(compile_query(query, interned=interned), corpus, memo))
+        for query in queries
+    ]
+
+
+class EvaluationSession:
+    """Evaluate queries repeatedly as records are added, changed or relabelled.
+
+    The match result of each record is cached per (interned) compiled query,
+    keyed by the content of the record fields that the query reads. When
+    evaluating again, only new or changed records are matched; changes of the
+    colrev_status only update the confusion matrix.
+
+    The match results of the `max_queries` most recently evaluated queries
+    are cached (the others, and their interned nodes, are evicted).
+    """
+
+    def __init__(self, max_queries: int = SESSION_CACHE_SIZE) -> None:
+        self.max_queries = max_queries
+        self._interned: dict = {}
+        # compiled query root -> record ID -> (content key, match result),
+        # in the order of the last evaluation (least recently evaluated first)
+        self._matches: typing.OrderedDict[
+            Matcher, typing.Dict[str, typing.Tuple[tuple, bool]]
+        ] = collections.OrderedDict()
+        self.nr_matched = 0
+
+    def evaluate(self, query: Query, records_dict: dict) -> dict:
+        """Evaluate the query (see Query.evaluate()), matching only records
+        that are new or changed since the last evaluation of the query."""
+        compiled_query = compile_query(query, interned=self._interned)
+        fields = compiled_query.fields()
+        cached = self._matches.get(compiled_query.root, {})
+        matches: typing.Dict[str, typing.Tuple[tuple, bool]] = {}
+
+        relevant = irrelevant = true_positives = false_positives = 0
+        for record_id, record in records_dict.items():
+            content_key = tuple(record.get(field) for field in fields)
+            cached_match = cached.get(record_id)
+            if cached_match is not None and cached_match[0] == content_key:
+                matches[record_id] = cached_match
+            else:
+                self.nr_matched += 1
+                matches[record_id] = (content_key, compiled_query.matches(record))
+            selected = matches[record_id][1]
+
+            status = record.get("colrev_status")
+            if status in RecordStatus.RELEVANT:
+                relevant += 1
+                true_positives += selected
+            elif status in RecordStatus.IRRELEVANT:
+                irrelevant += 1
+                false_positives += selected
+
+        # Records that were removed are dropped from the cache
+        self._matches[compiled_query.root] = matches
+        self._matches.move_to_end(compiled_query.root)
+        if len(self._matches) > self.max_queries:
+            self._evict()
+        return get_metrics(
+            {
+                "total_evaluated": relevant + irrelevant,
+                "selected": true_positives + false_positives,
+                "true_positives": true_positives,
+                "false_positives": false_positives,
+                "false_negatives": relevant - true_positives,
+            }
+        )
+
+    def _evict(self) -> None:
+        """Evict the least recently evaluated queries and their interned nodes."""
+        while len(self._matches) > self.max_queries:
+            self._matches.popitem(last=False)
+        # Note: nodes shared with the remaining queries are kept (interned)
+        retained = {
+            node for root in self._matches for node in CompiledQuery(root).nodes()
+        }
+        self._interned = {
+            key: node for key, node in self._interned.items() if node in retained
+        }
+
+
+def _child_counts(
+    node: Query, relevant_selections: typing.Dict[Query, frozenset]
+) -> typing.Dict[int, int]:
+    """Count, for each (relevant) record, the number of children selecting it."""
+    counts: typing.Dict[int, int] = {}
+    for child in node.children:
+        for index in relevant_selections[child]:
+            counts[index] = counts.get(index, 0) + 1
+    return counts
+
+
+# pylint: disable=too-many-branches
+def _selection_without_leaf(
+    root: Query,
+    path: tuple,
+    relevant_selections: typing.Dict[Query, frozenset],
+    child_counts: typing.Dict[Query, typing.Dict[int, int]],
+) -> frozenset:
+    """Recompute the (relevant) selection of the root without a leaf.
+
+    Only the nodes on the path from the leaf to the root are recomputed,
+    based on the cached selections of their children:
+    removing a child of an AND/OR node keeps the remaining children,
+    removing the negative child of a NOT node keeps the positive child,
+    and removing the last child of an AND/OR node or the positive child
+    of a NOT node removes the node itself.
+    """
+    if not path:
+        return frozenset()
+    ancestors = [root]
+    for index in path[:-1]:
+        ancestors.append(ancestors[-1].children[index])
+
+    # new is None while the current node is removed
+    new: typing.Optional[frozenset] = None
+    old = relevant_selections[ancestors[-1].children[path[-1]]]
+    for parent, index in zip(reversed(ancestors), reversed(path)):
+        parent_selection = relevant_selections[parent]
+        nr_children = len(parent.children)
+        if new is None and nr_children == 1:
+            old = parent_selection
+            continue
+
+        if parent.value == Operators.OR:
+            changed = new if new is not None else frozenset()
+            lost = {i for i in old - changed if child_counts[parent][i] == 1}
+            updated = (parent_selection - lost) | (changed - old)
+        elif parent.value == Operators.AND:
+            counts = child_counts[parent]
+            if new is None:
+                updated = parent_selection | {
+                    i
+                    for i, count in counts.items()
+                    if count == nr_children - 1 and i not in old
+                }
+            else:
+                updated = (parent_selection - (old - new)) | {
+                    i for i in new - old if counts.get(i, 0) == nr_children - 1
+                }
+        elif parent.value == Operators.NOT:
+            positive, negative = parent.children
+            if index == 0:
+                if new is None:
+                    old = parent_selection
+                    continue
+                updated = new - relevant_selections[negative]
+            elif new is None:
+                updated = relevant_selections[positive]
+            else:
+                updated = relevant_selections[positive] - new
+        else:  # pragma: no cover
+            raise ValueError(f"Invalid operator value: {parent.value}")
+        old, new = parent_selection, frozenset(updated)
+
+    return new if new is not None else frozenset()
+
+
+def get_node_report(query: Query, records: typing.Union[dict, RecordCorpus]) -> dict:
+    """Report the selections of each node of a query.
+
+    In addition to the results of Query.evaluate(), the report lists
+    - "nodes": the number of records selected by each node, and its true
+      and false positives,
+    - "terms": for each term (or NEAR/RANGE query), its true positives and
+      the recall that would be lost if it was removed from the query.
+
+    Nodes are identified by their path (child indices from the root).
+    The selection of each (distinct) node is computed once; the recall loss
+    is derived from the cached selections along the path to the root.
+    """
+    # pylint: disable=too-many-locals
+    corpus = records if isinstance(records, RecordCorpus) else RecordCorpus(records)
+    query_with_term_fields, matchers = compile_query_nodes(query)
+    memo: dict = {}
+    relevant_selections: typing.Dict[Query, frozenset] = {}
+
+    report = get_metrics(
+        count_corpus(CompiledQuery(matchers[query_with_term_fields]), corpus, memo)
+    )
+    report["nodes"] = []
+    report["terms"] = []
+
+    # Depth-first (pre-order)
+    leaves = []
+    stack: typing.List[typing.Tuple[Query, tuple]] = [(query_with_term_fields, ())]
+    while stack:
+        node, path = stack.pop()
+        selected = matchers[node].selection(corpus, memo)
+        relevant_selections[node] = selected & corpus.relevant_ids
+        report["nodes"].append(
+            {
+                "path": path,
+                "query": node.to_generic_string(),
+                "selected": len(selected),
+                "true_positives": len(relevant_selections[node]),
+                "false_positives": len(selected & corpus.irrelevant_ids),
+            }
+        )
+        if node.value in {Operators.AND, Operators.OR, Operators.NOT}:
+            stack.extend(
+                (node.children[index], path + (index,))
+                for index in reversed(range(len(node.children)))
+            )
+        else:
+            leaves.append((node, path))
+
+    child_counts = {
+        node: _child_counts(node, relevant_selections)
+        for node in relevant_selections
+        if node.value in {Operators.AND, Operators.OR}
+    }
+    true_positives = report["true_positives"]
+    nr_relevant = len(corpus.relevant_ids)
+    for node, path in leaves:
+        true_positives_lost = true_positives - len(
+            _selection_without_leaf(
+                query_with_term_fields, path, relevant_selections, child_counts
+            )
+        )
+        report["terms"].append(
+            {
+                "path": path,
+                "query": node.to_generic_string(),
+                "true_positives": len(relevant_selections[node]),
+                "true_positives_lost": true_positives_lost,
+                "recall_loss": true_positives_lost / nr_relevant if nr_relevant else 0,
+            }
+        )
+
+    return report
+
+
+BIB_ENTRY_START_REGEX = re.compile(r"@(\w+)\s*\{\s*([^,\s]*)\s*,")
+BIB_FIELD_REGEX = re.compile(r"\s*([\w\-:.]+)\s*=\s*")
+BIB_SKIPPED_ENTRY_TYPES = {"comment", "string", "preamble"}
+
+
+def _read_bib_value(entry: str, start: int) -> typing.Tuple[str, int]:
+    """Read a (braced, quoted or bare) field value starting at `start`.
+
+    Escaped characters (e.g., \\{) are skipped. An unterminated value is read
+    up to the end of the entry (the returned position is beyond its end).
+    """
+    if start >= len(entry):
+        return "", start
+    if entry[start] in '{"':
+        closing = "}" if entry[start] == "{" else '"'
+        depth = 0
+        index = start + 1
+        while index < len(entry):
+            char = entry[index]
+            if char == "\\":
+                index += 1
+            elif char == "{":
+                depth += 1
+            elif char == "}" and depth > 0:
+                depth -= 1
+            elif char == closing and depth == 0:
+                break
+            index += 1
+        if index >= len(entry) and closing == '"':
+            # Quoted values may contain unbalanced braces
+            index = start + 1
+            while index < len(entry) and entry[index] != '"':
+                index += 2 if entry[index] == "\\" else 1
+        return entry[start + 1 : index], index + 1
+
+    end = start
+    while end < len(entry) and entry[end] not in ",}":
+        end += 1
+    return entry[start:end].strip(), end
+
+
+def _find_bib_entry_end(text: str) -> int:
+    """Return the end of the first entry (after its closing brace),
+    or -1 if the entry is incomplete."""
+    depth = 0
+    position = text.find("{")
+    while 0 <= position < len(text):
+        char = text[position]
+        if char == "=" and depth == 1:
+            # Field values are read with the same scan as in _parse_bib_entry()
+            position += 1
+            while position < len(text) and text[position].isspace():
+                position += 1
+            _, position = _read_bib_value(text, position)
+            continue
+        if char == "\\":
+            position += 1
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return position + 1
+        position += 1
+    return -1
+
+
+def _parse_bib_entry(entry: str) -> typing.Optional[dict]:
+    match = BIB_ENTRY_START_REGEX.match(entry)
+    if not match or match.group(1).lower() in BIB_SKIPPED_ENTRY_TYPES:
+        return None
+    record = {"ENTRYTYPE": match.group(1).lower(), "ID": match.group(2)}
+    position = match.end()
+    while True:
+        field_match = BIB_FIELD_REGEX.match(entry, position)
+        if not field_match:
+            break
+        value, position = _read_bib_value(entry, field_match.end())
+        value = value.replace("{", "").replace("}", "")
+        record[field_match.group(1).lower()] = " ".join(value.split())
+        # Skip to the next field
+        while position < len(entry) and entry[position] in " \t\r\n,":
+            position += 1
+    return record
+
+
+def _iter_bib(path: str) -> typing.Iterator[dict]:
+    entry_text = ""
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if not entry_text and not line.lstrip().startswith("@"):
+                continue
+            entry_text += line
+            # Note: entries end at their closing brace (not at a line end)
+            end = _find_bib_entry_end(entry_text)
+            while end != -1:
+                record = _parse_bib_entry(entry_text[:end].strip())
+                if record is not None:
+                    yield record
+                entry_text = entry_text[end:].lstrip()
+                if not entry_text.startswith("@"):
+                    entry_text = ""
+                end = _find_bib_entry_end(entry_text)
+
+
+def _iter_jsonl(path: str) -> typing.Iterator[dict]:
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                record = json.loads(line)
+                # null values are read as empty fields
+                yield {
+                    key: "" if value is None else value for key, value in record.items()
+                }
+
+
+def _iter_csv(path: str) -> typing.Iterator[dict]:
+    with open(path, encoding="utf-8", newline="") as file:
+        # Missing cells (rows shorter than the header) are read as empty fields
+        yield from csv.DictReader(file, restval="")
+
+
+RECORD_FILE_READERS: typing.Dict[str, typing.Callable[[str], typing.Iterator[dict]]] = {
+    ".bib": _iter_bib,
+    ".jsonl": _iter_jsonl,
+    ".ndjson": _iter_jsonl,
+    ".csv": _iter_csv,
+}
+
+
+def iter_records(path: str) -> typing.Iterator[dict]:
+    """Stream the records of a JSONL, CSV or BibTeX file (one at a time)."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in RECORD_FILE_READERS:
+        raise ValueError(
+            f"Unsupported record file format: {extension} "
+            f"(supported: {', '.join(RECORD_FILE_READERS)})"
+        )
+    return RECORD_FILE_READERS[extension](path)
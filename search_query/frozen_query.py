@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Immutable (hash-consed) query nodes."""
+from __future__ import annotations
+
+import typing
+import weakref
+
+from search_query.constants import Operators
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from search_query.query import Query
+
+# Operators whose children can be reordered without changing the query
+# Note: WITHIN (EBSCO Wn) requires the terms in the given order
+UNORDERED_OPERATORS = {
+    Operators.AND,
+    Operators.OR,
+    Operators.NEAR,
+}
+
+# Identical nodes are shared (while they are referenced)
+_INTERNED: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+
+class FrozenQuery:
+    """Immutable query node with structural equality and hashing.
+
+    Nodes are interned: creating a node that is identical to an existing one
+    (same operator, value, field, distance and children in the same order)
+    returns the existing node, i.e., repeated subqueries share one object.
+    Nodes can be used as dict keys and sets; the children of AND, OR and NEAR
+    queries are compared regardless of their order (i.e., reordered nodes are
+    equal but not the same object), WITHIN queries are order-sensitive.
+    """
+
+    __slots__ = (
+        "value",
+        "operator",
+        "field",
+        "distance",
+        "children",
+        "_key",
+        "_hash",
+        "__weakref__",
+    )
+
+    value: str
+    operator: bool
+    field: typing.Optional[str]
+    distance: typing.Optional[int]
+    children: typing.Tuple[FrozenQuery, ...]
+
+    # pylint: disable=too-many-arguments
+    def __new__(
+        cls,
+        value: str,
+        *,
+        operator: bool = True,
+        field: typing.Optional[str] = None,
+        children: typing.Iterable[FrozenQuery] = (),
+        distance: typing.Optional[int] = None,
+    ) -> FrozenQuery:
+        children = tuple(children)
+        # Note: children are (interned) nodes and can be identified by their id
+        identity = (
+            value,
+            operator,
+            field,
+            distance,
+            tuple(id(child) for child in children),
+        )
+        node = _INTERNED.get(identity)
+        if node is not None:
+            return node
+
+        node = super().__new__(cls)
+        object.__setattr__(node, "value", value)
+        object.__setattr__(node, "operator", operator)
+        object.__setattr__(node, "field", field)
+        object.__setattr__(node, "distance", distance)
+        object.__setattr__(node, "children", children)
+        key = (
+            value,
+            operator,
+            field,
+            distance,
+            frozenset(children) if value in UNORDERED_OPERATORS else children,
+        )
+        object.__setattr__(node, "_key", key)
+        object.__setattr__(node, "_hash", hash(key))
+        _INTERNED[identity] = node
+        return node
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        raise AttributeError("FrozenQuery nodes are immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("FrozenQuery nodes are immutable")
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, FrozenQuery) or self._hash != other._hash:
+            return False
+        return self._key == other._key
+
+    def __reduce__(self) -> tuple:
+        return (
+            _create,
+            (self.value, self.operator, self.field, self.children, self.distance),
+        )
+
+    def __repr__(self) -> str:
+        field = f"[{self.field}]" if self.field else ""
+        if not self.operator:
+            return f"{self.value}{field}"
+        value = (
+            f"{self.value}/{self.distance}" if self.distance is not None else self.value
+        )
+        children = ", ".join(repr(child) for child in self.children)
+        return f"{value}{field}[{children}]"
+
+    @classmethod
+    def from_query(cls, query: Query) -> FrozenQuery:
+        """Convert a (mutable) query tree to frozen nodes."""
+        # Note: iterative post-order traversal (children before parents)
+        frozen: typing.Dict[int, FrozenQuery] = {}
+        stack = [(query, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if not expanded:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children)
+                continue
+            frozen[id(node)] = cls(
+                node.value,
+                operator=node.operator,
+                field=node.field.value if node.field else None,
+                children=[frozen[id(child)] for child in node.children],
+                distance=getattr(node, "distance", None),
+            )
+        return frozen[id(query)]
+
+    def to_query(self, *, platform: str = "generic") -> Query:
+        """Convert the frozen nodes to a (mutable) query tree."""
+        # pylint: disable=import-outside-toplevel
+        from search_query.constants import SearchField
+        from search_query.query import Query
+
+        # Note: shared nodes are converted to separate query nodes
+        queries: typing.Dict[int, typing.List[Query]] = {}
+        with Query.deferred_validation():
+            stack: typing.List[typing.Tuple[FrozenQuery, bool]] = [(self, False)]
+            while stack:
+                node, expanded = stack.pop()
+                if not expanded:
+                    stack.append((node, True))
+                    stack.extend((child, False) for child in node.children)
+                    continue
+                query = Query.create(
+                    node.value,
+                    operator=node.operator,
+                    field=SearchField(node.field) if node.field else None,
+                    children=[queries[id(child)].pop() for child in node.children],
+                    platform=platform,
+                    distance=node.distance or 0,
+                )
+                queries.setdefault(id(node), []).append(query)
+        return queries[id(self)].pop()
+
+
+def _create(
+    value: str,
+    operator: bool,
+    field: typing.Optional[str],
+    children: typing.Tuple[FrozenQuery, ...],
+    distance: typing.Optional[int],
+) -> FrozenQuery:
+    return FrozenQuery(
+        value, operator=operator, field=field, children=children, distance=distance
+    )
@@ -21,20 +21,18 @@ class GenericSerializer(StringSerializer):
         if not hasattr(query, "value"):  # pragma: no cover
             return " (?) "
 
-        result = ""
-        query_content = query.value
-        if hasattr(query, "distance"):  # and isinstance(query.distance, int):
-            query_content += f"/{query.distance}"
-        if query.field:
-            query_content += f"[{query.field}]"
-
-        result = f"{result}{query_content}"
-        if query.children == []:
-            return result
-
-        result = f"{result}["
-        for child in query.children:
-            result = f"{result}{self.to_string(child)}"
-            if child != query.children[-1]:
-                result = f"{result}, "
-        return f"{result}]"
+        # Note: iterative post-order traversal (children before parents)
+        strings: typing.Dict[int, str] = {}
+        for node in query.walk(post_order=True):
+            node_content = node.value
+            if hasattr(node, "distance"):  # and isinstance(node.distance, int):
+                node_content += f"/{node.distance}"
+            if node.field:
+                node_content += f"[{node.field}]"
+
+            if node.children:
+                node_content += (
+                    "[" + ", ".join(strings[id(child)] for child in node.children) + "]"
+                )
+            strings[id(node)] = node_content
+        return strings[id(query)]
@@ -17,6 +17,7 @@ from search_query.constants import GENERAL_ERROR_POSITION
 from search_query.constants import Operators
 from search_query.constants import PLATFORM
 from search_query.constants import QueryErrorCode
+from search_query.constants import SearchField
 from search_query.constants import Token
 from search_query.constants import TokenTypes
 from search_query.exception import ListQuerySyntaxError
@@ -282,24 +283,22 @@ class QueryStringLinter:
         Note: compile valid_FIELD_REGEX with/out flags=re.IGNORECASE
         """
 
-        if query.field:
-            # pylint: disable=no-member
-            if not self.VALID_fieldS_REGEX.match(query.field.value):  # type: ignore
-                pos_info = ""
-                if query.field.position:
-                    pos_info = f" at position {query.field.position}"
-                details = f"Search field {query.field}{pos_info} is not supported."
-                details += f" Supported fields for {self.PLATFORM.value.upper()}: "
-                details += f"{self.VALID_fieldS_REGEX.pattern}"
-                self.add_message(
-                    QueryErrorCode.FIELD_UNSUPPORTED,
-                    positions=[query.field.position or (-1, -1)],
-                    details=details,
-                    fatal=True,
-                )
-
-        for child in query.children:
-            self.check_unsupported_fields_in_query(child)
+        for node in query.walk():
+            if node.field:
+                # pylint: disable=no-member
+                if not self.VALID_fieldS_REGEX.match(node.field.value):  # type: ignore
+                    pos_info = ""
+                    if node.field_position:
+                        pos_info = f" at position {node.field_position}"
+                    details = f"Search field {node.field}{pos_info} is not supported."
+                    details += f" Supported fields for {self.PLATFORM.value.upper()}: "
+                    details += f"{self.VALID_fieldS_REGEX.pattern}"
+                    self.add_message(
+                        QueryErrorCode.FIELD_UNSUPPORTED,
+                        positions=[node.field_position or (-1, -1)],
+                        details=details,
+                        fatal=True,
+                    )
 
     def check_operator_capitalization(self) -> None:
         """Check if operators are capitalized."""
@@ -374,81 +373,78 @@ class QueryStringLinter:
                     )
 
     def check_unbalanced_quotes_in_terms(self, query: Query) -> None:
-        """Recursively check for unbalanced quotes in quoted search terms."""
+        """Check for unbalanced quotes in quoted search terms."""
 
-        if query.is_term():
-            value = query.value.strip()
-            if '"' not in value:
-                return
+        for node in query.walk():
+            if node.is_term():
+                self._check_unbalanced_quotes_in_term(node)
 
-            quote_count = value.count('"')
-
-            # Case 1: Properly quoted (e.g., "AI")
-            if quote_count == 2 and value.startswith('"') and value.endswith('"'):
-                return
-            positions = []
-            if query.position:
-                positions.append(query.position)
+    def _check_unbalanced_quotes_in_term(self, query: Query) -> None:
+        value = query.value.strip()
+        if '"' not in value:
+            return
 
-            # Case 2: unmatched opening quote
-            if value.startswith('"') and not value.endswith('"'):
-                self.add_message(
-                    QueryErrorCode.UNBALANCED_QUOTES,
-                    positions=positions,
-                    details="Unmatched opening quote",
-                    fatal=True,
-                )
+        quote_count = value.count('"')
 
-            # Case 3: unmatched closing quote
-            elif value.endswith('"') and not value.startswith('"'):
-                self.add_message(
-                    QueryErrorCode.UNBALANCED_QUOTES,
-                    positions=positions,
-                    details="Unmatched closing quote",
-                    fatal=True,
-                )
+        # Case 1: Properly quoted (e.g., "AI")
+        if quote_count == 2 and value.startswith('"') and value.endswith('"'):
+            return
+        positions = []
+        if query.position:
+            positions.append(query.position)
 
-            # Case 4: unbalanced or excessive quotes
-            elif quote_count % 2 != 0:
-                self.add_message(
-                    QueryErrorCode.UNBALANCED_QUOTES,
-                    positions=positions,
-                    details="Unbalanced quotes inside term",
-                    fatal=True,
-                )
-            elif quote_count % 2 == 0:
-                self.add_message(
-                    QueryErrorCode.UNBALANCED_QUOTES,
-                    positions=positions,
-                    details="Suspicious or excessive quote usage",
-                    fatal=True,
-                )
+        # Case 2: unmatched opening quote
+        if value.startswith('"') and not value.endswith('"'):
+            self.add_message(
+                QueryErrorCode.UNBALANCED_QUOTES,
+                positions=positions,
+                details="Unmatched opening quote",
+                fatal=True,
+            )
 
-            return
+        # Case 3: unmatched closing quote
+        elif value.endswith('"') and not value.startswith('"'):
+            self.add_message(
+                QueryErrorCode.UNBALANCED_QUOTES,
+                positions=positions,
+                details="Unmatched closing quote",
+                fatal=True,
+            )
 
-        for child in query.children:
-            self.check_unbalanced_quotes_in_terms(child)
+        # Case 4: unbalanced or excessive quotes
+        elif quote_count % 2 != 0:
+            self.add_message(
+                QueryErrorCode.UNBALANCED_QUOTES,
+                positions=positions,
+                details="Unbalanced quotes inside term",
+                fatal=True,
+            )
+        elif quote_count % 2 == 0:
+            self.add_message(
+                QueryErrorCode.UNBALANCED_QUOTES,
+                positions=positions,
+                details="Suspicious or excessive quote usage",
+                fatal=True,
+            )
 
     def check_apostrophe_phrases(self, query: Query) -> None:
-        """Recursively check for search phrases created with apostrophes."""
+        """Check for search phrases created with apostrophes."""
 
-        if query.is_term():
+        for node in query.walk():
             if (
-                query.value.startswith("'")
-                and query.value.endswith("'")
-                and len(query.value) >= 2
+                node.is_term()
+                and node.value.startswith("'")
+                and node.value.endswith("'")
+                and len(node.value) >= 2
             ):
-                pos_1 = (query.position[0], query.position[0] + 1)
-                pos_2 = (query.position[1] - 1, query.position[1])
+                pos_1 = (node.position[0], node.position[0] + 1)
+                pos_2 = (node.position[1] - 1, node.position[1])
                 self.add_message(
                     QueryErrorCode.NON_STANDARD_QUOTES,
                     positions=[pos_1, pos_2],
                     details='Apostrophes used as quotation marks. Use standard double quotes (") instead.',
                 )
 
-        for child in query.children:
-            self.check_apostrophe_phrases(child)
-
     def check_unknown_token_types(self) -> None:
         """Check for unknown token types."""
         for token in self.tokens:
@@ -675,38 +671,45 @@ class QueryStringLinter:
             return self.OPERATOR_PRECEDENCE[token]
         return -1  # Not an operator
 
-    def _get_scoped_operators(self, tokens: typing.List[Token], start: int = 0) -> list:
-        """Get operators in the same subquery scope."""
-        if start >= len(tokens):
-            return []
+    def _get_scoped_operators(
+        self, tokens: typing.List[Token]
+    ) -> typing.Dict[int, typing.List[Token]]:
+        """Get the operators of each subquery scope (in one pass over the tokens).
 
-        operator_tokens = []
-        depth = 0
-        for token in tokens[start:]:
+        The scopes are identified by the index of their opening parenthesis
+        (-1: top level). An unmatched closing parenthesis ends the top level.
+        """
+        scopes: typing.Dict[int, typing.List[Token]] = {-1: []}
+        open_scopes = [scopes[-1]]
+        for index, token in enumerate(tokens):
             if token.type == TokenTypes.PARENTHESIS_OPEN:
-                depth += 1
-            if token.type == TokenTypes.PARENTHESIS_CLOSED:
-                if depth == 0:
-                    return operator_tokens
-                depth -= 1
-            if depth == 0 and token.type in [
+                scopes[index] = []
+                open_scopes.append(scopes[index])
+            elif token.type == TokenTypes.PARENTHESIS_CLOSED:
+                if len(open_scopes) > 1:
+                    open_scopes.pop()
+                else:
+                    # Operators after the end of the top level are not scoped
+                    open_scopes[0] = []
+            elif token.type in [
                 TokenTypes.LOGIC_OPERATOR,
                 TokenTypes.PROXIMITY_OPERATOR,
             ]:
-                operator_tokens.append(token)
+                open_scopes[-1].append(token)
 
-        return operator_tokens
+        return scopes
 
     def _print_unequal_precedence_warning(self) -> None:
         """Warn user about unequal precedence operators in the query string."""
         tokens = self.tokens
+        scoped_operators = self._get_scoped_operators(tokens)
 
         for index, token in enumerate(self.tokens):
             unequal_operators: typing.List[Token] = []
             if index == 0:
-                ops = self._get_scoped_operators(tokens, start=index)
+                ops = scoped_operators[-1]
             elif token.type == TokenTypes.PARENTHESIS_OPEN:
-                ops = self._get_scoped_operators(tokens, start=index + 1)
+                ops = scoped_operators[index]
             else:
                 continue
 
@@ -779,24 +782,22 @@ class QueryStringLinter:
 
         """
         modified_query = query.copy()
-        if modified_query.field:
+        for node in modified_query.walk():
+            if not node.field:
+                continue
             try:
-                modified_query.field.value = self._normalize_field(
-                    modified_query.field.value
-                )
+                field_position = node.field_position
+                node.field = SearchField(self._normalize_field(node.field.value))
+                node.field_position = field_position
             except ValueError:
                 pass
-            if modified_query.operator:
+            if node.operator:
                 # move search field from operator to terms
-                for child in modified_query.children:
+                for child in node.children:
                     if not child.field:
-                        child.field = modified_query.field.copy()
-                modified_query.field = None
-
-        for i, child in enumerate(modified_query.children):
-            modified_query.children[i] = self.get_query_with_normalized_fields_at_terms(
-                child
-            )
+                        child.field = node.field
+                        child.field_position = node.field_position
+                node.field = None
 
         return modified_query
 
@@ -805,62 +806,80 @@ class QueryStringLinter:
     ) -> None:
         """Check a search term for invalid characters"""
 
-        if query.is_term():
+        for node in query.walk():
+            if not node.is_term():
+                continue
             # Iterate over term to identify invalid characters
             # and replace them with whitespace
             for char in invalid_characters:
-                if char in query.value:
+                if char in node.value:
                     details = (
-                        f"Invalid character '{char}' in search term '{query.value}'"
+                        f"Invalid character '{char}' in search term '{node.value}'"
                     )
                     self.add_message(
                         error,
-                        positions=[query.position] if query.position else [],
+                        positions=[node.position] if node.position else [],
                         details=details,
                     )
 
-        for child in query.children:
-            self.check_invalid_characters_in_term_query(
-                child, invalid_characters, error
-            )
-
     def check_operators_with_fields(self, query: Query) -> None:
         """Check for operators with fields"""
 
-        if query.operator and query.field:
-            self.add_message(
-                QueryErrorCode.NESTED_QUERY_WITH_FIELD,
-                positions=[query.position] if query.position else [],
-                details="Nested query (operator) with search field is not supported",
-            )
-
-        for child in query.children:
-            self.check_operators_with_fields(child)
+        for node in query.walk():
+            if node.operator and node.field:
+                self.add_message(
+                    QueryErrorCode.NESTED_QUERY_WITH_FIELD,
+                    positions=[node.position] if node.position else [],
+                    details="Nested query (operator) with search field is not supported",
+                )
 
     @abstractmethod
     def syntax_str_to_generic_field_set(self, field_value: str) -> set[Fields]:
         """Translate a search field"""
 
-    def _check_non_global_date_filter(
-        self, query: Query, applies_globally: bool = True
-    ) -> None:
-        """Check for date filters in subqueries"""
+    def _get_filter_scopes(
+        self, query: Query, applies_globally: bool, check_nested: bool
+    ) -> typing.Iterator[typing.Tuple[Query, bool]]:
+        """Yield the terms and whether filters at the terms apply globally.
 
-        if query.operator:
-            if query.get_parent() is None and query.value != Operators.OR:
-                return
+        Filters apply globally unless an OR query combines them with other
+        operators (the children of a non-OR root are not checked, and the
+        children of nested non-OR queries only if check_nested is set).
+        """
+        stack = [(query, applies_globally)]
+        while stack:
+            node, node_applies_globally = stack.pop()
+            if not node.operator:
+                yield node, node_applies_globally
+                continue
+            if node.value != Operators.OR and (
+                not check_nested or node.get_parent() is None
+            ):
+                continue
 
-            for child in query.children:
-                applies_globally = applies_globally and not (
-                    query.value == Operators.OR
+            scopes = []
+            for child in node.children:
+                node_applies_globally = node_applies_globally and not (
+                    node.value == Operators.OR
                     and child.operator
                     and child.value != Operators.OR
                 )
-                self._check_non_global_date_filter(child, applies_globally)
-            return
+                scopes.append((child, node_applies_globally))
+            stack.extend(reversed(scopes))
 
-        if applies_globally or not query.field:
-            return
+    def _check_non_global_date_filter(
+        self, query: Query, applies_globally: bool = True, check_nested: bool = True
+    ) -> None:
+        """Check for date filters in subqueries"""
+
+        for term, term_applies_globally in self._get_filter_scopes(
+            query, applies_globally, check_nested
+        ):
+            if not term_applies_globally and term.field:
+                self._check_non_global_date_filter_in_term(term)
+
+    def _check_non_global_date_filter_in_term(self, query: Query) -> None:
+        assert query.field
 
         try:
             generic_fields = self.syntax_str_to_generic_field_set(query.field.value)
@@ -872,8 +891,8 @@ class QueryStringLinter:
             positions = [(-1, -1)]
             if query.position and query.position is not None:
                 positions = [query.position]
-                if query.field.position and query.field.position is not None:
-                    positions.append(query.field.position)
+                if query.field_position and query.field_position is not None:
+                    positions.append(query.field_position)
 
             self.add_message(
                 QueryErrorCode.DATE_FILTER_IN_SUBQUERY,
@@ -882,25 +901,18 @@ class QueryStringLinter:
             )
 
     def _check_non_global_journal_filter(
-        self, query: Query, applies_globally: bool = True
+        self, query: Query, applies_globally: bool = True, check_nested: bool = True
     ) -> None:
         """Check for non-global journal filters."""
 
-        if query.operator:
-            if query.get_parent() is None and query.value != Operators.OR:
-                return
-
-            for child in query.children:
-                applies_globally = applies_globally and not (
-                    query.value == Operators.OR
-                    and child.operator
-                    and child.value != Operators.OR
-                )
-                self._check_non_global_journal_filter(child, applies_globally)
-            return
+        for term, term_applies_globally in self._get_filter_scopes(
+            query, applies_globally, check_nested
+        ):
+            if not term_applies_globally and term.field:
+                self._check_non_global_journal_filter_in_term(term)
 
-        if applies_globally or not query.field:
-            return
+    def _check_non_global_journal_filter_in_term(self, query: Query) -> None:
+        assert query.field
 
         try:
             generic_fields = self.syntax_str_to_generic_field_set(query.field.value)
@@ -945,33 +957,28 @@ class QueryStringLinter:
         """Return a copy of the query with same-operator nesting flattened."""
         modified_query = query.copy()
 
-        if not modified_query.operator:
-            return modified_query
+        # Note: post-order, i.e., the children are flattened first
+        for node in modified_query.walk(post_order=True):
+            if not node.operator:
+                continue
 
-        flattened_children = []
-        for child in modified_query.children:
-            if (
-                child.operator
-                and child.value == query.value
-                and (
-                    not flatten_artificial_nesting_only
-                    or self._can_flatten_artificial_nesting(child)
-                )
-            ):
-                flattened_children.extend(
-                    self._flatten_same_operator(
-                        child,
-                        flatten_artificial_nesting_only=flatten_artificial_nesting_only,
-                    ).children
-                )
-            else:
-                flattened_children.append(
-                    self._flatten_same_operator(
-                        child,
-                        flatten_artificial_nesting_only=flatten_artificial_nesting_only,
+            flattened_children = []
+            flattened = False
+            for child in node.children:
+                if (
+                    child.operator
+                    and child.value == node.value
+                    and (
+                        not flatten_artificial_nesting_only
+                        or self._can_flatten_artificial_nesting(child)
                     )
-                )
-        modified_query.children = flattened_children
+                ):
+                    flattened_children.extend(child.children)
+                    flattened = True
+                else:
+                    flattened_children.append(child)
+            if flattened:
+                node.children = flattened_children
 
         return modified_query
 
@@ -1192,35 +1199,27 @@ class QueryStringLinter:
 
     def _check_unnecessary_nesting(self, query: Query) -> None:
         """Check for unnecessary same-operator nesting and provide simplification advice."""
-        if not query.position:
-            return
 
-        # Double nesting
-        if self._is_enclosed_in_paren(query.position) and self._is_enclosed_in_paren(
-            (query.position[0] - 1, query.position[1] + 1)
-        ):
-            start, end = query.position
-            open_paren_pos = (start - 2, start - 1)
-            end_paren_pos = (end + 1, end + 2)
-            self.add_message(
-                QueryErrorCode.UNNECESSARY_PARENTHESES,
-                positions=[open_paren_pos, end_paren_pos],
-                details="Unnecessary parentheses around query block.",
-            )
+        # Note: pre-order (explicit stack of nodes and their parents)
+        stack: typing.List[typing.Tuple[Query, typing.Optional[Query]]] = [
+            (query, None)
+        ]
+        while stack:
+            node, parent = stack.pop()
 
-        # Same-level operator nesting
-        for child in query.children:
+            # Same-level operator nesting
             if (
-                query.value in (Operators.AND, Operators.OR)
-                and child.operator
-                and child.value == query.value
-                and self._is_enclosed_in_paren(child.position)
+                parent is not None
+                and parent.value in (Operators.AND, Operators.OR)
+                and node.operator
+                and node.value == parent.value
+                and self._is_enclosed_in_paren(node.position)
                 and (
-                    not child.field
-                    or (query.field and query.field.value == child.field.value)
+                    not node.field
+                    or (parent.field and parent.field.value == node.field.value)
                 )
             ):
-                start, end = child.position
+                start, end = node.position
                 open_paren_pos = (start - 1, start)
                 end_paren_pos = (end, end + 1)
                 self.add_message(
@@ -1228,32 +1227,63 @@ class QueryStringLinter:
                     positions=[open_paren_pos, end_paren_pos],
                     details="Unnecessary parentheses around query block.",
                 )
-            self._check_unnecessary_nesting(child)
+
+            if not node.position:
+                continue
+
+            # Double nesting
+            if self._is_enclosed_in_paren(node.position) and self._is_enclosed_in_paren(
+                (node.position[0] - 1, node.position[1] + 1)
+            ):
+                start, end = node.position
+                open_paren_pos = (start - 2, start - 1)
+                end_paren_pos = (end + 1, end + 2)
+                self.add_message(
+                    QueryErrorCode.UNNECESSARY_PARENTHESES,
+                    positions=[open_paren_pos, end_paren_pos],
+                    details="Unnecessary parentheses around query block.",
+                )
+
+            stack.extend((child, node) for child in reversed(node.children))
 
     def _extract_subqueries(
         self, query: Query, subqueries: dict, subquery_types: dict, subquery_id: int = 0
     ) -> None:
         """Extract subqueries from query tree"""
-        if subquery_id not in subqueries:
-            subqueries[subquery_id] = []
-            if query.operator:
-                subquery_types[subquery_id] = query.value
-
-        for child in query.children:
-            if not child.children:
-                subqueries[subquery_id].append(child)
-            elif child.value == query.value:
-                self._extract_subqueries(child, subqueries, subquery_types, subquery_id)
-            else:
-                new_subquery_id = max(subqueries.keys()) + 1
-                self._extract_subqueries(
-                    child, subqueries, subquery_types, new_subquery_id
-                )
 
-        if not query.children:
-            subqueries[subquery_id].append(query)
+        # Note: pre-order, new subqueries are numbered when they are reached
+        # (None: new subquery)
+        max_subquery_id = max(subqueries, default=subquery_id)
+        stack: typing.List[typing.Tuple[Query, typing.Optional[int]]] = [
+            (query, subquery_id)
+        ]
+        while stack:
+            node, node_subquery_id = stack.pop()
+            if node_subquery_id is None:
+                node_subquery_id = max_subquery_id + 1
+            if node_subquery_id not in subqueries:
+                subqueries[node_subquery_id] = []
+                max_subquery_id = max(max_subquery_id, node_subquery_id)
+                if node.operator:
+                    subquery_types[node_subquery_id] = node.value
+
+            if not node.children:
+                subqueries[node_subquery_id].append(node)
+                continue
 
-    # pylint: disable=too-many-branches
+            stack.extend(
+                (
+                    child,
+                    (
+                        node_subquery_id
+                        if not child.children or child.value == node.value
+                        else None
+                    ),
+                )
+                for child in reversed(node.children)
+            )
+
+    # pylint: disable=too-many-locals
     def _check_redundant_terms(
         self, query: Query, redundancy_fields: list[str]
     ) -> None:
@@ -1281,91 +1311,113 @@ class QueryStringLinter:
             if operator == Operators.NOT:
                 terms.pop(0)  # First term of a NOT query cannot be redundant
 
+            # Note: only pairs of terms that can be redundant (same value, or
+            # one value among the words of the other) are compared
+            term_words = []
+            by_value: typing.Dict[str, typing.List[int]] = defaultdict(list)
+            by_stripped_value: typing.Dict[str, typing.List[int]] = defaultdict(list)
+            by_word: typing.Dict[str, typing.List[int]] = defaultdict(list)
+            for index, term in enumerate(terms):
+                stripped_value = term.value.strip('"').lower()
+                words = stripped_value.split()
+                term_words.append(words)
+                by_value[term.value.lower()].append(index)
+                by_stripped_value[stripped_value].append(index)
+                for word in set(words):
+                    by_word[word].append(index)
+
             redundant_terms = set()
-            for term_a in terms:
-                for term_b in terms:
-                    if (
-                        term_a == term_b
-                        or term_a in redundant_terms
-                        or term_b in redundant_terms
-                    ):
+            for index_a, term_a in enumerate(terms):
+                candidates = set(by_value[term_a.value.lower()])
+                if operator == Operators.AND:
+                    candidates.update(by_word.get(term_a.value.strip('"').lower(), []))
+                elif operator == Operators.OR:
+                    for word in term_words[index_a]:
+                        candidates.update(by_stripped_value.get(word, []))
+
+                # Compare in the order of the terms (the first match is reported)
+                for index_b in sorted(candidates):
+                    term_b = terms[index_b]
+                    if term_a is term_b or term_b in redundant_terms:
                         continue
-
-                    field_a = term_a.field.value if term_a.field else None
-                    field_b = term_b.field.value if term_b.field else None
-
-                    # 1) Exact duplicate term and field values => always redundant
-                    if (
-                        term_a.value.lower() == term_b.value.lower()
-                        and field_a == field_b
-                    ):
-                        details = (
-                            f"The term {Colors.ORANGE}{term_a.value}{Colors.END} is contained multiple times"
-                            " i.e., redundantly."
-                        )
+                    details = self._get_redundant_term_details(
+                        term_a, term_b, operator, redundancy_fields
+                    )
+                    if details:
                         self.add_message(
                             QueryErrorCode.REDUNDANT_TERM,
                             positions=[term_a.position],
                             details=details,
                         )
                         redundant_terms.add(term_a)
-                        continue
+                        break
 
-                    if (
-                        field_a not in redundancy_fields
-                        or field_b not in redundancy_fields
-                    ):
-                        continue
+    def _get_redundant_term_details(
+        self,
+        term_a: Query,
+        term_b: Query,
+        operator: str,
+        redundancy_fields: list[str],
+    ) -> typing.Optional[str]:
+        """Return details if term_a is redundant given term_b (else None)."""
+
+        field_a = term_a.field.value if term_a.field else None
+        field_b = term_b.field.value if term_b.field else None
+
+        # 1) Exact duplicate term and field values => always redundant
+        if term_a.value.lower() == term_b.value.lower() and field_a == field_b:
+            return (
+                f"The term {Colors.ORANGE}{term_a.value}{Colors.END} is contained multiple times"
+                " i.e., redundantly."
+            )
 
-                    # 2) AND: more-specific term makes the broader one redundant
-                    if (
-                        operator == Operators.AND
-                        and term_a.value.strip('"').lower()
-                        in term_b.value.strip('"').lower().split()
-                        and (
-                            field_a == field_b
-                            or self._get_generic_field_set(field_a)
-                            > self._get_generic_field_set(field_b)
-                        )
-                    ):
-                        details = (
-                            f"The term {Colors.ORANGE}{term_a.value}{Colors.END} is redundant in this AND query "
-                            f"because another term already restricts the results as much or more."
-                        )
-                        self.add_message(
-                            QueryErrorCode.REDUNDANT_TERM,
-                            positions=[term_a.position],
-                            details=details,
-                        )
-                        redundant_terms.add(term_a)
-                        continue
+        if field_a not in redundancy_fields or field_b not in redundancy_fields:
+            return None
 
-                    # 3) OR: broader term makes the more-specific one redundant
-                    if (
-                        operator == Operators.OR
-                        and term_b.value.strip('"').lower()
-                        in term_a.value.strip('"').lower().split()
-                        and (
-                            field_a == field_b
-                            or self._get_generic_field_set(field_a)
-                            < self._get_generic_field_set(field_b)
-                        )
-                    ):
-                        details = (
-                            f"The term {Colors.ORANGE}{term_a.value}{Colors.END} is redundant in this OR query "
-                            f"because another term already matches all of its results."
-                        )
-                        self.add_message(
-                            QueryErrorCode.REDUNDANT_TERM,
-                            positions=[term_a.position],
-                            details=details,
-                        )
-                        redundant_terms.add(term_a)
+        # 2) AND: more-specific term makes the broader one redundant
+        if (
+            operator == Operators.AND
+            and term_a.value.strip('"').lower()
+            in term_b.value.strip('"').lower().split()
+            and (
+                field_a == field_b
+                or self._get_generic_field_set(field_a)
+                > self._get_generic_field_set(field_b)
+            )
+        ):
+            return (
+                f"The term {Colors.ORANGE}{term_a.value}{Colors.END} is redundant in this AND query "
+                f"because another term already restricts the results as much or more."
+            )
+
+        # 3) OR: broader term makes the more-specific one redundant
+        if (
+            operator == Operators.OR
+            and term_b.value.strip('"').lower()
+            in term_a.value.strip('"').lower().split()
+            and (
+                field_a == field_b
+                or self._get_generic_field_set(field_a)
+                < self._get_generic_field_set(field_b)
+            )
+        ):
+            return (
+                f"The term {Colors.ORANGE}{term_a.value}{Colors.END} is redundant in this OR query "
+                f"because another term already matches all of its results."
+            )
+
+        return None
 
     # 10.1079_SEARCHRXIV.2023.00269.json
     def _check_for_opportunities_to_combine_subqueries(self, query: Query) -> None:
         """Check for opportunities to combine subqueries with the same search field."""
 
+        for node in query.walk():
+            self._check_for_opportunities_to_combine_subqueries_in_node(node)
+
+    def _check_for_opportunities_to_combine_subqueries_in_node(
+        self, query: Query
+    ) -> None:
         # Only consider top-level OR-connected subqueries with two children each
         if query.operator and query.value == Operators.OR:
             candidates = [
@@ -1424,17 +1476,14 @@ class QueryStringLinter:
                         details=details,
                     )
 
-        # iterate over subqueries
-        if query.children:
-            for child in query.children:
-                self._check_for_opportunities_to_combine_subqueries(child)
-
     def _check_for_wildcard_usage(self, term_field_query: Query) -> None:
         """Check whether wildcards could be used for multiple OR-terms."""
 
-        if term_field_query.is_term():
-            return
+        for node in term_field_query.walk():
+            if not node.is_term():
+                self._check_for_wildcard_usage_in_node(node)
 
+    def _check_for_wildcard_usage_in_node(self, term_field_query: Query) -> None:
         if term_field_query.value == "OR" and term_field_query.operator:
             term_query_groups = defaultdict(list)
 
@@ -1480,9 +1529,6 @@ class QueryStringLinter:
                             fatal=False,
                         )
 
-        for child in term_field_query.children:
-            self._check_for_wildcard_usage(child)
-
 
 class QueryListLinter:
     """Class for Query List Validation"""
@@ -0,0 +1,826 @@
+#!/usr/bin/env python3
+"""Compiled record matchers for queries."""
+from __future__ import annotations
+
+import functools
+import re
+import typing
+
+from search_query.constants import Fields
+from search_query.constants import Operators
+from search_query.corpus import token_positions
+from search_query.corpus import TOKEN_REGEX
+
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from search_query.corpus import RecordCorpus
+    from search_query.query import Query
+
+
+# pylint: disable=too-few-public-methods
+
+
+class RecordView:
+    """Record wrapper that caches normalized field values while matching."""
+
+    __slots__ = ("record", "_texts", "_positions")
+
+    def __init__(self, record: dict) -> None:
+        self.record = record
+        self._texts: typing.Dict[str, str] = {}
+        self._positions: typing.Dict[str, typing.Dict[str, typing.List[int]]] = {}
+
+    def text(self, field: str) -> str:
+        """Return the lower-cased value of a field (computed once per record)."""
+        try:
+            return self._texts[field]
+        except KeyError:
+            # Note: missing values (None) match like empty fields
+            text = (self.record.get(field) or "").lower()
+            self._texts[field] = text
+            return text
+
+    def positions(self, field: str) -> typing.Dict[str, typing.List[int]]:
+        """Return the positional index of a field (computed once per record)."""
+        try:
+            return self._positions[field]
+        except KeyError:
+            positions = token_positions(self.text(field))
+            self._positions[field] = positions
+            return positions
+
+
+class Matcher:
+    """Base class for compiled (immutable) matcher nodes."""
+
+    __slots__ = ()
+
+    def match(self, record: RecordView) -> bool:
+        """Check whether the node selects the record."""
+        raise NotImplementedError
+
+    def select(
+        self, corpus: RecordCorpus, memo: typing.Optional[dict] = None
+    ) -> frozenset:
+        """Return the indices of the corpus records selected by the node."""
+        return frozenset(
+            index
+            for index in corpus.all_ids
+            if self.match(RecordView(corpus.records[index]))
+        )
+
+    def estimate(self, corpus: RecordCorpus) -> int:
+        """Estimate (an upper bound of) the number of records selected."""
+        return len(corpus)
+
+    def selection(self, corpus: RecordCorpus, memo: typing.Optional[dict]) -> frozenset:
+        """Return select(corpus), memoized per (interned) node if a memo is given."""
+        if memo is None:
+            return self.select(corpus, memo)
+        selected = memo.get(self)
+        if selected is None:
+            selected = memo[self] = self.select(corpus, memo)
+        return selected
+
+
+# Wildcards: truncation (*), exactly one character (?),
+# and zero or one character (# in EBSCO, $ in Web of Science)
+WILDCARDS = {"*": r"\w*", "?": r"\w", "#": r"\w?", "$": r"\w?"}
+PHRASE_TOKEN_REGEX = re.compile(r"[\w*?#$]+")
+TERM_CACHE_SIZE = 4096
+# Operators compiled from the matchers of their children
+BOOLEAN_OPERATORS = {Operators.AND, Operators.OR, Operators.NOT}
+
+
+def _wildcard_regex(value: str) -> str:
+    """Translate a term value (with wildcards) to a regular expression."""
+    parts = []
+    for char in value:
+        if char in WILDCARDS:
+            parts.append(WILDCARDS[char])
+        elif char.isspace():
+            if not parts or parts[-1] != r"\s+":
+                parts.append(r"\s+")
+        else:
+            parts.append(re.escape(char))
+    return "".join(parts)
+
+
+class TermPattern:
+    """Precompiled matcher for a (normalized) term value."""
+
+    __slots__ = ("value", "regex", "fragments", "token")
+
+    def __init__(self, value: str) -> None:
+        self.value = value
+        regex = _wildcard_regex(value)
+        # Match whole words: add boundaries where the term starts/ends with a word
+        if PHRASE_TOKEN_REGEX.match(value[:1]):
+            regex = r"(?<!\w)" + regex
+        if PHRASE_TOKEN_REGEX.match(value[-1:]):
+            regex = regex + r"(?!\w)"
+        self.regex = re.compile(regex)
+        # Word-character fragments that every matching text must contain
+        self.fragments = tuple(TOKEN_REGEX.findall(value))
+        # Terms consisting of a single token can be looked up in the index
+        self.token: typing.Optional[typing.Union[str, re.Pattern]] = None
+        if self.fragments and PHRASE_TOKEN_REGEX.fullmatch(value):
+            self.token = (
+                value
+                if self.fragments == (value,)
+                else re.compile(_wildcard_regex(value))
+            )
+
+    def search(self, text: str) -> bool:
+        """Check whether the (lower-cased) text contains the term."""
+        return self.regex.search(text) is not None
+
+
+@functools.lru_cache(maxsize=TERM_CACHE_SIZE)
+def term_pattern(value: str) -> TermPattern:
+    """Return the (shared) precompiled matcher for a term value."""
+    return TermPattern(value.lower().strip('"'))
+
+
+class TermMatcher(Matcher):
+    """Matcher for search terms."""
+
+    __slots__ = ("field", "pattern")
+
+    def __init__(self, field: str, value: str) -> None:
+        if field not in {Fields.TITLE, Fields.ABSTRACT}:
+            raise ValueError(f"Unsupported search field: {field}")
+        self.field = field
+        self.pattern = term_pattern(value)
+
+    def match(self, record: RecordView) -> bool:
+        return self.pattern.search(record.text(self.field))
+
+    def estimate(self, corpus: RecordCorpus) -> int:
+        token = self.pattern.token
+        if isinstance(token, str) and self.field in corpus.postings:
+            return len(corpus.postings[self.field].get(token, ()))
+        return len(corpus)
+
+    def select(
+        self, corpus: RecordCorpus, memo: typing.Optional[dict] = None
+    ) -> frozenset:
+        token = self.pattern.token
+        if isinstance(token, str):
+            return corpus.records_with_token(self.field, token)
+        if token is not None:
+            return corpus.records_with_token_pattern(self.field, token)
+
+        candidates = corpus.all_ids
+        for fragment in self.pattern.fragments:
+            candidates = candidates & corpus.records_with_fragment(self.field, fragment)
+        texts = corpus.texts[self.field]
+        return frozenset(
+            index for index in candidates if self.pattern.search(texts[index])
+        )
+
+
+class BooleanMatcher(Matcher):
+    """Base class for AND/OR/NOT matchers.
+
+    Boolean matchers are evaluated iteratively (with an explicit stack),
+    so that deeply nested queries are not limited by the recursion depth.
+    Each child is matched in the order of the steps, and matching stops
+    as soon as a child does not have the expected result.
+    """
+
+    # Note: steps are (child, expected result) pairs in the order of matching
+    __slots__ = ("steps",)
+    steps: typing.Tuple[typing.Tuple[Matcher, bool], ...]
+
+    # Result of the node if a child does not have the expected result
+    SHORT_CIRCUIT_RESULT = False
+
+    def match(self, record: RecordView) -> bool:
+        return _match_iteratively(self, record)
+
+    def estimate(self, corpus: RecordCorpus) -> int:
+        return _estimate(self, corpus, {})
+
+    def select(
+        self, corpus: RecordCorpus, memo: typing.Optional[dict] = None
+    ) -> frozenset:
+        return _select_iteratively(self, corpus, {} if memo is None else memo)
+
+    def _estimate_from_children(
+        self, corpus: RecordCorpus, estimates: typing.Dict[Matcher, int]
+    ) -> int:
+        raise NotImplementedError
+
+    def _selection_order(
+        self, corpus: RecordCorpus, estimates: typing.Dict[Matcher, int]
+    ) -> typing.Tuple[Matcher, ...]:
+        """Return the children in the order of their selections."""
+        raise NotImplementedError
+
+    def _initial_selection(self, corpus: RecordCorpus) -> typing.Optional[frozenset]:
+        raise NotImplementedError
+
+    def _combine_selection(
+        self, selected: typing.Optional[frozenset], child_selection: frozenset
+    ) -> frozenset:
+        raise NotImplementedError
+
+    def _is_selection_final(self, selected: typing.Optional[frozenset]) -> bool:
+        """Check whether the remaining children cannot change the selection."""
+        return selected is not None and not selected
+
+
+class OrMatcher(BooleanMatcher):
+    """Matcher for OR queries."""
+
+    __slots__ = ("children",)
+
+    SHORT_CIRCUIT_RESULT = True
+
+    def __init__(self, children: typing.Tuple[Matcher, ...]) -> None:
+        self.children = children
+        self.steps = tuple((child, False) for child in children)
+
+    def _estimate_from_children(
+        self, corpus: RecordCorpus, estimates: typing.Dict[Matcher, int]
+    ) -> int:
+        return min(len(corpus), sum(estimates[child] for child in self.children))
+
+    def _selection_order(
+        self, corpus: RecordCorpus, estimates: typing.Dict[Matcher, int]
+    ) -> typing.Tuple[Matcher, ...]:
+        return self.children
+
+    def _initial_selection(self, corpus: RecordCorpus) -> typing.Optional[frozenset]:
+        return frozenset()
+
+    def _combine_selection(
+        self, selected: typing.Optional[frozenset], child_selection: frozenset
+    ) -> frozenset:
+        assert selected is not None
+        return selected | child_selection
+
+    def _is_selection_final(self, selected: typing.Optional[frozenset]) -> bool:
+        return False
+
+
+class AndMatcher(BooleanMatcher):
+    """Matcher for AND queries."""
+
+    __slots__ = ("children",)
+
+    def __init__(self, children: typing.Tuple[Matcher, ...]) -> None:
+        self.children = children
+        self.steps = tuple((child, True) for child in children)
+
+    def _estimate_from_children(
+        self, corpus: RecordCorpus, estimates: typing.Dict[Matcher, int]
+    ) -> int:
+        return min(estimates[child] for child in self.children)
+
+    def _selection_order(
+        self, corpus: RecordCorpus, estimates: typing.Dict[Matcher, int]
+    ) -> typing.Tuple[Matcher, ...]:
+        # Start with the most selective children (estimated from the index),
+        # which keeps the intersections small and stops early when empty
+        return tuple(
+            sorted(
+                self.children,
+                key=lambda child: _estimate(child, corpus, estimates),
+            )
+        )
+
+    def _initial_selection(self, corpus: RecordCorpus) -> typing.Optional[frozenset]:
+        return corpus.all_ids
+
+    def _combine_selection(
+        self, selected: typing.Optional[frozenset], child_selection: frozenset
+    ) -> frozenset:
+        assert selected is not None
+        return selected & child_selection
+
+
+class NotMatcher(BooleanMatcher):
+    """Matcher for NOT queries."""
+
+    __slots__ = ("positive", "negative", "negative_first")
+
+    def __init__(
+        self, positive: Matcher, negative: Matcher, negative_first: bool = False
+    ) -> None:
+        self.positive = positive
+        self.negative = negative
+        self.negative_first = negative_first
+        if negative_first:
+            self.steps = ((negative, False), (positive, True))
+        else:
+            self.steps = ((positive, True), (negative, False))
+
+    def _estimate_from_children(
+        self, corpus: RecordCorpus, estimates: typing.Dict[Matcher, int]
+    ) -> int:
+        return estimates[self.positive]
+
+    def _selection_order(
+        self, corpus: RecordCorpus, estimates: typing.Dict[Matcher, int]
+    ) -> typing.Tuple[Matcher, ...]:
+        return (self.positive, self.negative)
+
+    def _initial_selection(self, corpus: RecordCorpus) -> typing.Optional[frozenset]:
+        return None
+
+    def _combine_selection(
+        self, selected: typing.Optional[frozenset], child_selection: frozenset
+    ) -> frozenset:
+        if selected is None:
+            return child_selection
+        return selected - child_selection
+
+
+def _match_iteratively(root: BooleanMatcher, record: RecordView) -> bool:
+    # Frames: (boolean matcher, index of the next step)
+    stack: typing.List[typing.Tuple[BooleanMatcher, int]] = [(root, 0)]
+    result = False
+    while stack:
+        node, index = stack[-1]
+        if index > 0 and result != node.steps[index - 1][1]:
+            stack.pop()
+            result = node.SHORT_CIRCUIT_RESULT
+            continue
+        if index == len(node.steps):
+            stack.pop()
+            result = not node.SHORT_CIRCUIT_RESULT
+            continue
+        stack[-1] = (node, index + 1)
+        child = node.steps[index][0]
+        if isinstance(child, BooleanMatcher):
+            stack.append((child, 0))
+        else:
+            result = child.match(record)
+    return result
+
+
+def _estimate(
+    matcher: Matcher, corpus: RecordCorpus, estimates: typing.Dict[Matcher, int]
+) -> int:
+    """Return the estimate of a matcher (cached with those of its descendants)."""
+    if matcher not in estimates:
+        # Note: children before parents
+        for node in _distinct_nodes(matcher):
+            if node in estimates:
+                continue
+            if isinstance(node, BooleanMatcher):
+                estimates[node] = node._estimate_from_children(corpus, estimates)
+            else:
+                estimates[node] = node.estimate(corpus)
+    return estimates[matcher]
+
+
+def _select_iteratively(
+    root: BooleanMatcher, corpus: RecordCorpus, memo: dict
+) -> frozenset:
+    # pylint: disable=protected-access
+    estimates: typing.Dict[Matcher, int] = {}
+    # Frames: [boolean matcher, ordered children, index of the next child, selection]
+    stack: typing.List[list] = [
+        [
+            root,
+            root._selection_order(corpus, estimates),
+            0,
+            root._initial_selection(corpus),
+        ]
+    ]
+    while True:
+        frame = stack[-1]
+        node, children, index, selected = frame
+        if index < len(children) and not node._is_selection_final(selected):
+            child = children[index]
+            frame[2] = index + 1
+            if isinstance(child, BooleanMatcher) and child not in memo:
+                stack.append(
+                    [
+                        child,
+                        child._selection_order(corpus, estimates),
+                        0,
+                        child._initial_selection(corpus),
+                    ]
+                )
+                continue
+            frame[3] = node._combine_selection(selected, child.selection(corpus, memo))
+            continue
+
+        stack.pop()
+        if node is not root:
+            memo[node] = selected
+        if not stack:
+            return selected
+        parent = stack[-1]
+        parent[3] = parent[0]._combine_selection(parent[3], selected)
+
+
+class PhraseMatcher:
+    """Matcher for the (possibly quoted, multi-word or truncated) operand
+    of a proximity search, applied to positional indices."""
+
+    __slots__ = ("value", "tokens", "fragments")
+
+    def __init__(self, value: str) -> None:
+        value = value.lower().strip('"')
+        self.value = value
+        self.tokens: typing.Tuple[typing.Union[str, re.Pattern], ...] = tuple(
+            term_pattern(token).token or token
+            for token in PHRASE_TOKEN_REGEX.findall(value)
+        )
+        self.fragments = tuple(TOKEN_REGEX.findall(value))
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def _token_offsets(
+        self,
+        token: typing.Union[str, re.Pattern],
+        positions: typing.Dict[str, typing.List[int]],
+    ) -> typing.Iterable[int]:
+        if isinstance(token, str):
+            return positions.get(token, ())
+        offsets: typing.List[int] = []
+        for candidate, candidate_offsets in positions.items():
+            if token.fullmatch(candidate):
+                offsets.extend(candidate_offsets)
+        return offsets
+
+    def starts(self, positions: typing.Dict[str, typing.List[int]]) -> list:
+        """Return the sorted token offsets at which the phrase occurs."""
+        if not self.tokens:
+            return []
+        starts = set(self._token_offsets(self.tokens[0], positions))
+        for shift, token in enumerate(self.tokens[1:], start=1):
+            if not starts:
+                break
+            offsets = set(self._token_offsets(token, positions))
+            starts = {start for start in starts if start + shift in offsets}
+        return sorted(starts)
+
+
+def _within_distance(
+    starts1: list, length1: int, starts2: list, length2: int, distance: int
+) -> bool:
+    """Sorted merge: check whether two phrase occurrences are at most
+    `distance` tokens apart (gap between the end of one and the start of
+    the other)."""
+    # With d = start2 - start1, the gap is |2d - (length1 - length2)| / 2
+    # - (length1 + length2 - 2) / 2 (doubled to stay in integers)
+    offset = length1 - length2
+    limit = 2 * distance + length1 + length2 - 2
+    i = j = 0
+    while i < len(starts1) and j < len(starts2):
+        diff = 2 * (starts2[j] - starts1[i]) - offset
+        if abs(diff) <= limit:
+            return True
+        if diff < 0:
+            j += 1
+        else:
+            i += 1
+    return False
+
+
+class NearMatcher(Matcher):
+    """Matcher for NEAR/WITHIN queries."""
+
+    __slots__ = ("field", "term1", "term2", "distance")
+
+    def __init__(self, field: str, term1: str, term2: str, distance: int) -> None:
+        self.field = field
+        self.term1 = PhraseMatcher(term1)
+        self.term2 = PhraseMatcher(term2)
+        self.distance = distance
+
+    def match_positions(self, positions: typing.Dict[str, typing.List[int]]) -> bool:
+        """Check whether the positional index of a field matches."""
+        starts1 = self.term1.starts(positions)
+        if not starts1:
+            return False
+        starts2 = self.term2.starts(positions)
+        return _within_distance(
+            starts1, len(self.term1), starts2, len(self.term2), self.distance
+        )
+
+    def match(self, record: RecordView) -> bool:
+        if not isinstance(record.record.get(self.field, ""), str):
+            return False
+        return self.match_positions(record.positions(self.field))
+
+    def select(
+        self, corpus: RecordCorpus, memo: typing.Optional[dict] = None
+    ) -> frozenset:
+        if self.field not in corpus.postings:
+            return super().select(corpus, memo)
+        # Both terms must occur as tokens: restrict matching to these records
+        candidates = corpus.all_ids
+        for fragment in self.term1.fragments + self.term2.fragments:
+            candidates = candidates & corpus.records_with_fragment(self.field, fragment)
+        return frozenset(
+            index
+            for index in candidates
+            if self.match_positions(corpus.token_positions(self.field, index))
+        )
+
+
+class RangeMatcher(Matcher):
+    """Matcher for RANGE queries."""
+
+    __slots__ = ("field", "low", "high")
+
+    def __init__(self, field: str, low: str, high: str) -> None:
+        self.field = field
+        self.low = low.lower()
+        self.high = high.lower()
+
+    def match(self, record: RecordView) -> bool:
+        record_field = record.record.get(self.field, record.record.get("year", ""))
+
+        if self.low.isdigit() and self.high.isdigit() and record_field.isdigit():
+            return int(self.low) <= int(record_field) <= int(self.high)
+
+        # Match other cases here (e.g., dates)
+
+        raise ValueError("Both children of RANGE query must be numeric values")
+
+
+class CompiledQuery:
+    """Immutable matcher compiled from a query tree.
+
+    Search fields are pushed down to the terms, term values are normalized
+    and wildcard patterns are compiled once, so that the same matcher can be
+    applied to any number of records.
+    """
+
+    __slots__ = ("root",)
+
+    def __init__(self, root: Matcher) -> None:
+        self.root = root
+
+    def matches(self, record_dict: dict) -> bool:
+        """Indicates whether the compiled query selects a given record."""
+        return self.root.match(RecordView(record_dict))
+
+    def select(
+        self, corpus: RecordCorpus, memo: typing.Optional[dict] = None
+    ) -> frozenset:
+        """Return the indices of the corpus records selected by the query.
+
+        The memo (dict) caches the selections of (interned) nodes, e.g., to
+        share them between queries compiled with the same interning table.
+        """
+        return self.root.selection(corpus, memo)
+
+    def nodes(self) -> typing.List[Matcher]:
+        """Return the distinct matcher nodes (children before parents)."""
+        return _distinct_nodes(self.root)
+
+    def fields(self) -> typing.Tuple[str, ...]:
+        """Return the (sorted) record fields that are read by the query."""
+        fields = set()
+        for node in self.nodes():
+            if isinstance(node, (TermMatcher, NearMatcher, RangeMatcher)):
+                fields.add(node.field)
+            if isinstance(node, RangeMatcher):
+                fields.add("year")
+        return tuple(sorted(fields))
+
+    def reorder(self, records: typing.Iterable[dict]) -> CompiledQuery:
+        """Return an equivalent compiled query whose children are ordered
+        by their match rates on the (sample) records, so that matching
+        short-circuits as early as possible:
+        AND children that rarely match and OR children that often match
+        are checked first, and the negative child of a NOT query is checked
+        first if it is more likely to match than the positive child to fail.
+
+        Children that may raise errors (RANGE queries) keep their order.
+        """
+        nodes = _distinct_nodes(self.root)
+        match_rates = _match_rates(nodes, records)
+        may_raise: typing.Dict[Matcher, bool] = {}
+        reordered: typing.Dict[Matcher, Matcher] = {}
+        for node in nodes:
+            children = _children(node)
+            may_raise[node] = isinstance(node, RangeMatcher) or any(
+                may_raise[child] for child in children
+            )
+            if not children:
+                reordered[node] = node
+                continue
+            keep_order = any(may_raise[child] for child in children)
+            if isinstance(node, NotMatcher):
+                reordered[node] = NotMatcher(
+                    reordered[node.positive],
+                    reordered[node.negative],
+                    negative_first=not keep_order
+                    and match_rates[node.negative] > 1 - match_rates[node.positive],
+                )
+                continue
+            if not keep_order:
+                # Note: sorted() is stable, i.e., ties keep the written order
+                children = sorted(
+                    children,
+                    key=lambda child: match_rates[child],
+                    reverse=isinstance(node, OrMatcher),
+                )
+            reordered[node] = type(node)(  # type: ignore
+                tuple(reordered[child] for child in children)
+            )
+        return CompiledQuery(reordered[self.root])
+
+
+def _children(matcher: Matcher) -> typing.Tuple[Matcher, ...]:
+    if isinstance(matcher, NotMatcher):
+        return (matcher.positive, matcher.negative)
+    return getattr(matcher, "children", ())
+
+
+def _distinct_nodes(root: Matcher) -> typing.List[Matcher]:
+    """Return the distinct nodes of a matcher tree (children before parents)."""
+    nodes: typing.List[Matcher] = []
+    visited = set()
+    stack = [(root, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            nodes.append(node)
+        elif node not in visited:
+            visited.add(node)
+            stack.append((node, True))
+            stack.extend((child, False) for child in _children(node))
+    return nodes
+
+
+def _match_rates(
+    nodes: typing.List[Matcher], records: typing.Iterable[dict]
+) -> typing.Dict[Matcher, float]:
+    """Count the share of records matched by each node (children first)."""
+    matched = dict.fromkeys(nodes, 0)
+    nr_records = 0
+    for record in records:
+        nr_records += 1
+        view = RecordView(record)
+        results: typing.Dict[Matcher, bool] = {}
+        for node in nodes:
+            if isinstance(node, OrMatcher):
+                result = any(results[child] for child in node.children)
+            elif isinstance(node, AndMatcher):
+                result = all(results[child] for child in node.children)
+            elif isinstance(node, NotMatcher):
+                result = results[node.positive] and not results[node.negative]
+            else:
+                try:
+                    result = node.match(view)
+                except ValueError:
+                    result = False
+            results[node] = result
+            matched[node] += result
+    return {
+        node: count / nr_records if nr_records else 0 for node, count in matched.items()
+    }
+
+
+def _intern(
+    interned: dict, key: tuple, factory: typing.Callable[[], Matcher]
+) -> Matcher:
+    """Return the shared matcher node for a structural key (hash-consing)."""
+    matcher = interned.get(key)
+    if matcher is None:
+        matcher = interned[key] = factory()
+    return matcher
+
+
+def _compile_node(
+    query: Query, interned: dict, matchers: typing.Optional[dict] = None
+) -> Matcher:
+    """Compile the nodes of a query tree (children first, iteratively)."""
+    compiled: typing.Dict[Query, Matcher] = {}
+    stack = [(query, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if not expanded and node.value in BOOLEAN_OPERATORS and node.operator:
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(node.children))
+            continue
+        matcher = _compile_matcher(node, interned, compiled)
+        compiled[node] = matcher
+        if matchers is not None:
+            matchers[node] = matcher
+    return compiled[query]
+
+
+def _compile_matcher(
+    query: Query, interned: dict, compiled: typing.Dict[Query, Matcher]
+) -> Matcher:
+    # Note: children are compiled (and interned) before their parents, so that
+    # structural keys can refer to the identity of the (shared) child nodes.
+    if not query.operator:
+        assert query.field is not None, "Search field must be set for terms"
+        field, value = query.field.value, query.value
+        return _intern(
+            interned,
+            ("TERM", field, term_pattern(value).value),
+            lambda: TermMatcher(field, value),
+        )
+
+    if query.value in {Operators.OR, Operators.AND}:
+        children = tuple(compiled[child] for child in query.children)
+        matcher_class = OrMatcher if query.value == Operators.OR else AndMatcher
+        # Note: the order of children does not affect the selection
+        return _intern(
+            interned,
+            (query.value, frozenset(id(child) for child in children)),
+            lambda: matcher_class(children),
+        )
+
+    if query.value == Operators.NOT:
+        positive = compiled[query.children[0]]
+        negative = compiled[query.children[1]]
+        return _intern(
+            interned,
+            (Operators.NOT, id(positive), id(negative)),
+            lambda: NotMatcher(positive, negative),
+        )
+
+    if query.value in {Operators.NEAR, Operators.WITHIN}:
+        distance = getattr(query, "distance", None)
+        assert len(query.children) == 2, "NEAR query must have two children"
+        assert query.children[0].field, "First child must have a search field"
+        assert query.children[1].field, "Second child must have a search field"
+        assert distance is not None, "NEAR query must have a distance"
+        assert (
+            query.children[0].field.value == query.children[1].field.value
+        ), "Both children of NEAR query must have the same search field"
+        field = query.children[0].field.value
+        term1, term2 = query.children[0].value, query.children[1].value
+        near_matcher = NearMatcher(field, term1, term2, distance)
+        return _intern(
+            interned,
+            (
+                Operators.NEAR,
+                field,
+                frozenset({near_matcher.term1.value, near_matcher.term2.value}),
+                distance,
+            ),
+            lambda: near_matcher,
+        )
+
+    if query.value == Operators.RANGE:
+        assert len(query.children) == 2, "RANGE query must have two children"
+        assert query.children[0].field, "First child must have a search field"
+        assert query.children[1].field, "Second child must have a search field"
+        assert (
+            query.children[0].field.value == query.children[1].field.value
+        ), "Both children of RANGE query must have the same search field"
+        field = query.children[0].field.value
+        low, high = query.children[0].value, query.children[1].value
+        return _intern(
+            interned,
+            (Operators.RANGE, field, low.lower(), high.lower()),
+            lambda: RangeMatcher(field, low, high),
+        )
+
+    raise ValueError(f"Invalid operator value: {query.value}")  # pragma: no cover
+
+
+def compile_query(
+    query: Query, *, interned: typing.Optional[dict] = None
+) -> CompiledQuery:
+    """Compile a query tree into an immutable record matcher.
+
+    Structurally identical subtrees are compiled into a single (shared)
+    matcher node. Pass the same `interned` dict to share nodes across queries.
+    """
+    if interned is None:
+        interned = {}
+    return CompiledQuery(_compile_node(_with_term_fields(query), interned))
+
+
+def compile_query_nodes(
+    query: Query, *, interned: typing.Optional[dict] = None
+) -> typing.Tuple[Query, typing.Dict[Query, Matcher]]:
+    """Compile a query tree and return a copy of the query (with the search
+    fields moved to the terms) and the matcher of each of its nodes.
+
+    Operands of NEAR/WITHIN and RANGE queries are compiled as part of their
+    parent and have no matchers of their own.
+    """
+    query_with_term_fields = _with_term_fields(query)
+    matchers: typing.Dict[Query, Matcher] = {}
+    _compile_node(
+        query_with_term_fields, {} if interned is None else interned, matchers
+    )
+    return query_with_term_fields, matchers
+
+
+def _with_term_fields(query: Query) -> Query:
+    # pylint: disable=import-outside-toplevel
+    from search_query.translator_base import QueryTranslator
+
+    query_with_term_fields = query.copy()
+    query_with_term_fields._normalize_fields()  # pylint: disable=protected-access
+    QueryTranslator.move_fields_to_terms(query_with_term_fields)
+    return query_with_term_fields
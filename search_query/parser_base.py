@@ -2,6 +2,7 @@
 """Base query parser."""
 from __future__ import annotations
 
+import bisect
 import re
 import typing
 from abc import ABC
@@ -11,8 +12,10 @@ from search_query.constants import GENERAL_ERROR_POSITION
 from search_query.constants import ListToken
 from search_query.constants import ListTokenTypes
 from search_query.constants import OperatorNodeTokenTypes
+from search_query.constants import QueryErrorCode
 from search_query.constants import Token
 from search_query.constants import TokenTypes
+from search_query.exception import ListQuerySyntaxError
 from search_query.query import Query
 
 if typing.TYPE_CHECKING:  # pragma: no cover
@@ -39,6 +42,21 @@ class QueryStringParser(QueryParserBase, ABC):
     # Note: override the following:
     OPERATOR_REGEX: re.Pattern = re.compile(r"^(AND|OR|NOT)$", flags=re.IGNORECASE)
     LOGIC_OPERATOR_REGEX = re.compile(r"\b(AND|OR|NOT)\b", flags=re.IGNORECASE)
+    # Token regexes used to classify tokens by their value (see _get_token_type())
+    PARENTHESIS_REGEX = re.compile(r"[()]")
+    PROXIMITY_OPERATOR_REGEX: re.Pattern
+    FIELD_REGEX: re.Pattern
+    QUOTATION_MARK_REGEX = re.compile(r'"')
+    TERM_REGEX = re.compile(r'[^\s()"]+')
+    # Capitalized operators at the end of search terms (missing whitespace)
+    APPENDED_OPERATOR_REGEX = re.compile(r"(AND|OR|NOT)$")
+    # Token types of the operators that separate subqueries (see _index_tokens())
+    OPERATOR_TOKEN_TYPES: typing.Tuple[TokenTypes, ...] = (
+        TokenTypes.LOGIC_OPERATOR,
+        TokenTypes.PROXIMITY_OPERATOR,
+    )
+    # Token types at which the look-ahead for closing quotes stops
+    QUOTE_BOUNDARY_TOKEN_TYPES: typing.Tuple[TokenTypes, ...] = (TokenTypes.FIELD,)
 
     linter: QueryStringLinter
 
@@ -61,6 +79,9 @@ class QueryStringParser(QueryParserBase, ABC):
         self.ignore_failing_linter = ignore_failing_linter
         self.offset = offset or {}
         self.original_str = original_str or query_str
+        # Parenthesis depth before each token and operator indices by depth
+        self._depths: typing.List[int] = []
+        self._operators_by_depth: typing.Dict[int, typing.List[int]] = {}
 
     def print_tokens(self) -> None:
         """Print the tokens in a formatted table."""
@@ -139,147 +160,226 @@ class QueryStringParser(QueryParserBase, ABC):
             assert virtual_position == token.position[1]
             last_end = end
 
-    def _has_closing_quote(self, index: int) -> bool:
-        """Look ahead from a quote at `index` to see if a matching closing quote exists. Stops at defined structural boundaries to identify likely unbalanced quotes."""
-        if self.tokens[index].type != TokenTypes.QUOTATION_MARK:
-            return False
+    @staticmethod
+    def _is_word_character(char: str) -> bool:
+        """Check whether the character is a word character (regex: \\w)."""
+        return char.isalnum() or char == "_"
+
+    def _index_tokens(self, tokens: list) -> None:
+        """Index the parenthesis depth and the operators of the tokens."""
+        # Note: subqueries are parsed as index ranges (start, end) of the tokens.
+        # The operators at the top level of a range are those at the depth of its
+        # first (or last) token, which are looked up (bisect) instead of rescanned.
+        depth = 0
+        self._depths = []
+        self._operators_by_depth = {}
+        for i, token in enumerate(tokens):
+            self._depths.append(depth)
+            if token.type == TokenTypes.PARENTHESIS_OPEN:
+                depth += 1
+            elif token.type == TokenTypes.PARENTHESIS_CLOSED:
+                depth -= 1
+            elif token.type in self.OPERATOR_TOKEN_TYPES:
+                self._operators_by_depth.setdefault(depth, []).append(i)
+        self._depths.append(depth)
+
+    def _get_operators_at_depth(
+        self, start: int, end: int, depth: int
+    ) -> typing.Tuple[typing.List[int], int, int]:
+        """Get the operator indices at the depth within tokens[start:end].
+
+        Returns the (shared) list of operator indices at the depth and the
+        bounds (lo, hi) of the operators within the range.
+        """
+        operators = self._operators_by_depth.get(depth, [])
+        return (
+            operators,
+            bisect.bisect_left(operators, start),
+            bisect.bisect_left(operators, end),
+        )
 
-        open_paren = 0
-        index += 1
-        for token in self.tokens[index:]:
+    def _get_token_type(self, value: str) -> TokenTypes:
+        """Determine the token type from the value."""
+        if self.PARENTHESIS_REGEX.fullmatch(value):
+            if value == "(":
+                return TokenTypes.PARENTHESIS_OPEN
+            return TokenTypes.PARENTHESIS_CLOSED
+        if self.LOGIC_OPERATOR_REGEX.fullmatch(value):
+            return TokenTypes.LOGIC_OPERATOR
+        if self.PROXIMITY_OPERATOR_REGEX.fullmatch(value):
+            return TokenTypes.PROXIMITY_OPERATOR
+        if self.FIELD_REGEX.fullmatch(value):
+            return TokenTypes.FIELD
+        if self.QUOTATION_MARK_REGEX.fullmatch(value):
+            return TokenTypes.QUOTATION_MARK
+        if self.TERM_REGEX.fullmatch(value):
+            return TokenTypes.TERM
+        return TokenTypes.UNKNOWN  # pragma: no cover
+
+    def _get_closing_quotes(self) -> typing.List[bool]:
+        """Determine for each token whether it is a quote with a matching closing quote.
+
+        Looks ahead from each quote (in one pass over the tokens) and stops at
+        defined structural boundaries to identify likely unbalanced quotes."""
+        closing_quotes = [False] * len(self.tokens)
+
+        # Note: every quote ends the look-ahead of the previous quote,
+        # i.e., there is at most one quote looking for its closing quote.
+        open_quote: typing.Optional[int] = None
+        open_quote_depth = 0
+        depth = 0
+        for index, token in enumerate(self.tokens):
             if token.type == TokenTypes.PARENTHESIS_OPEN:
-                open_paren += 1
-            if token.type == TokenTypes.PARENTHESIS_CLOSED:
-                if open_paren <= 0:
+                depth += 1
+            elif token.type == TokenTypes.PARENTHESIS_CLOSED:
+                if depth <= open_quote_depth:
                     # Boundary: unmatched local closing paren → likely unbalanced quote
-                    break
-                open_paren -= 1
-            if (
+                    open_quote = None
+                depth -= 1
+            elif (
                 token.type in [TokenTypes.LOGIC_OPERATOR, TokenTypes.RANGE_OPERATOR]
                 and token.value.isupper()
             ):
                 # Boundary: upper case operator → likely unbalanced quote
-                break
-            if token.type == TokenTypes.FIELD:
-                # Boundary: search field -> likely unbalanced quote
-                break
-            if token.type == TokenTypes.QUOTATION_MARK:
-                if open_paren != 0:
-                    # Boundary: unmatched local opening paren → likely unbalanced quote
-                    break
-                # Matching closing quote found
-                return True
-
-        return False
+                open_quote = None
+            elif token.type in self.QUOTE_BOUNDARY_TOKEN_TYPES:
+                # Boundary: e.g., search field -> likely unbalanced quote
+                open_quote = None
+            elif token.type == TokenTypes.QUOTATION_MARK:
+                # Matching closing quote found (at another depth:
+                # unmatched local opening paren → likely unbalanced quote)
+                if open_quote is not None and depth == open_quote_depth:
+                    closing_quotes[open_quote] = True
+                open_quote = index
+                open_quote_depth = depth
+
+        return closing_quotes
 
     def combine_subsequent_terms(self) -> None:
         """Combine all consecutive TERM tokens into one. Combine contents inside quotation marks into single TERM token."""
+        tokens = self.tokens
+        closing_quotes = self._get_closing_quotes()
         combined_tokens = []
         i = 0
-        while i < len(self.tokens):
-            if self.tokens[i].type == TokenTypes.TERM:
-                value = self.tokens[i].value
-                start, end = self.tokens[i].position
+        while i < len(tokens):
+            if tokens[i].type == TokenTypes.TERM:
+                parts = [tokens[i].value]
+                start, end = tokens[i].position
                 i += 1
-                while i < len(self.tokens):
-                    if self.tokens[i].type == TokenTypes.TERM:
-                        value += " " * (
-                            self.tokens[i].position[0] - end
-                        )  # Preserve original whitespace amount between terms
-                        value += self.tokens[i].value
-                        end = self.tokens[i].position[1]
+                while i < len(tokens):
+                    if tokens[i].type == TokenTypes.TERM:
+                        # Preserve original whitespace amount between terms
+                        parts.append(" " * (tokens[i].position[0] - end))
+                        parts.append(tokens[i].value)
+                        end = tokens[i].position[1]
                         i += 1
-                    elif self.tokens[
-                        i
-                    ].type == TokenTypes.QUOTATION_MARK and not self._has_closing_quote(
-                        i
+                    elif (
+                        tokens[i].type == TokenTypes.QUOTATION_MARK
+                        and not closing_quotes[i]
                     ):
                         # Unbalanced closing quote found -> add to the end of latest search term
-                        value += " " * (self.tokens[i].position[0] - end)
-                        value += self.tokens[i].value
-                        end = self.tokens[i].position[1]
+                        parts.append(" " * (tokens[i].position[0] - end))
+                        parts.append(tokens[i].value)
+                        end = tokens[i].position[1]
                         i += 1
                         break
                     else:
                         break
                 combined_token = Token(
-                    value=value,
+                    value="".join(parts),
                     type=TokenTypes.TERM,
                     position=(start, end),
                 )
 
-            elif self.tokens[i].type == TokenTypes.QUOTATION_MARK:
-                search_phrase_mode = self._has_closing_quote(i)
-                value = self.tokens[i].value
-                start, end = self.tokens[i].position
+            elif tokens[i].type == TokenTypes.QUOTATION_MARK:
+                search_phrase_mode = closing_quotes[i]
+                parts = [tokens[i].value]
+                start, end = tokens[i].position
                 i += 1
-                while i < len(self.tokens):
-                    if self.tokens[i].type == TokenTypes.TERM or search_phrase_mode:
-                        value += " " * (self.tokens[i].position[0] - end)
-                        value += self.tokens[i].value
-                        end = self.tokens[i].position[1]
+                while i < len(tokens):
+                    if tokens[i].type == TokenTypes.TERM or search_phrase_mode:
+                        parts.append(" " * (tokens[i].position[0] - end))
+                        parts.append(tokens[i].value)
+                        end = tokens[i].position[1]
                         i += 1
-                        if self.tokens[i - 1].type == TokenTypes.QUOTATION_MARK:
+                        if tokens[i - 1].type == TokenTypes.QUOTATION_MARK:
                             # Stop if closing quote is found.
                             break
                     else:
                         break
                 combined_token = Token(
-                    value=value,
+                    value="".join(parts),
                     type=TokenTypes.TERM,
                     position=(start, end),
                 )
 
             else:
-                combined_token = self.tokens[i]
+                combined_token = tokens[i]
                 i += 1
             combined_tokens.append(combined_token)
 
         self.tokens = combined_tokens
 
+    @staticmethod
+    def _with_next_token(
+        tokens: typing.Iterable[Token],
+    ) -> typing.Iterator[typing.Tuple[Token, typing.Optional[Token]]]:
+        """Iterate over the tokens with the next token (None for the last token)."""
+        # Note: the next token is only read when the (previous) pair is requested,
+        # i.e., changes of a previous stage are visible to the next stage.
+        iterator = iter(tokens)
+        token = next(iterator, None)
+        for next_token in iterator:
+            yield token, next_token  # type: ignore
+            token = next_token
+        if token is not None:
+            yield token, None
+
     def split_operators_with_missing_whitespace(self) -> None:
         """Split operators that are not separated by whitespace."""
         # This is a workaround for the fact that some platforms do not support
         # operators without whitespace, e.g. "AND" or "OR"
         # This is not a problem for the parser, but for the linter
         # which expects whitespace between operators and search terms
+        self.tokens = list(self._split_operators_with_missing_whitespace(self.tokens))
 
-        i = 0
-        while i < len(self.tokens) - 1:
-            token = self.tokens[i]
-            next_token = self.tokens[i + 1]
-
-            appended_operator_match = re.search(r"(AND|OR|NOT)$", token.value)
-
-            # if the end of a search term (value) is a capitalized operator
-            # without a whitespace, split the tokens
+    def _split_operators_with_missing_whitespace(
+        self, tokens: typing.Iterable[Token]
+    ) -> typing.Iterator[Token]:
+        for token, next_token in self._with_next_token(tokens):
+            appended_operator_match = None
             if (
                 token.type == TokenTypes.TERM
+                and next_token is not None
                 and next_token.type != TokenTypes.LOGIC_OPERATOR
-                and appended_operator_match
             ):
-                # Split the operator from the search term
-
-                appended_operator = appended_operator_match.group(0)
-                token.value = token.value[: -len(appended_operator)]
-                token.position = (
-                    token.position[0],
-                    token.position[1] - len(appended_operator),
-                )
-                # insert operator token afterwards
-                operator_token = Token(
-                    value=appended_operator,
-                    type=TokenTypes.LOGIC_OPERATOR,
-                    position=(
-                        token.position[1],
-                        token.position[1] + len(appended_operator),
-                    ),
+                appended_operator_match = self.APPENDED_OPERATOR_REGEX.search(
+                    token.value
                 )
-                self.tokens.insert(i + 1, operator_token)
 
-                i += 2  # Skip over the newly inserted operator token
-            else:
-                i += 1
+            # if the end of a search term (value) is a capitalized operator
+            # without a whitespace, split the tokens
+            if not appended_operator_match:
+                yield token
+                continue
+
+            # Split the operator from the search term
+            appended_operator = appended_operator_match.group(0)
+            token.value = token.value[: -len(appended_operator)]
+            token.position = (
+                token.position[0],
+                token.position[1] - len(appended_operator),
+            )
+            yield token
+            # add operator token afterwards
+            yield Token(
+                value=appended_operator,
+                type=TokenTypes.LOGIC_OPERATOR,
+                position=(
+                    token.position[1],
+                    token.position[1] + len(appended_operator),
+                ),
+            )
 
     @abstractmethod
     def parse(self) -> Query:
@@ -400,7 +500,7 @@ class QueryListParser(QueryParserBase):
     def _resolve_reference(
         self, ref_nr: str, processed_lines: set, artificial_to_original_pos: dict
     ) -> typing.Tuple[str, dict, dict]:
-        """Recursively resolve query references."""
+        """Resolve query references (inline the referenced queries)."""
         # pylint: disable=too-many-locals
         assert ref_nr in self.query_dict
         processed_lines.add(ref_nr)
@@ -411,54 +511,96 @@ class QueryListParser(QueryParserBase):
             pos = node_content["content_pos"][0]
             return query, {0: pos}, artificial_to_original_pos
 
-        if node_content["type"] == ListTokenTypes.OPERATOR_NODE:
-            tokens = self.tokenize_operator_node(
-                node_content["node_content"], int(ref_nr)
-            )
-            operator_base_offset = node_content["content_pos"][0]
-
-            parts = []
-            local_pos_dict = {}
-            current_pos = 0
+        if node_content["type"] != ListTokenTypes.OPERATOR_NODE:  # pragma: no cover
+            return "", {}, artificial_to_original_pos
 
-            for token in tokens:
-                if token.type.name == "LIST_ITEM_REFERENCE":
-                    if not artificial_to_original_pos:
-                        next_paren_id = -2
-                    else:
-                        next_paren_id = min(artificial_to_original_pos) - 1
-                    artificial_to_original_pos[next_paren_id] = (
-                        token.position[0] + operator_base_offset,
-                        token.position[1] + operator_base_offset,
-                    )
-                    nested_ref_nr = self.extract_reference_value(token.value)
-                    (
-                        resolved_query,
-                        nested_pos_dict,
-                        artificial_to_original_pos,
-                    ) = self._resolve_reference(
-                        nested_ref_nr, processed_lines, artificial_to_original_pos
-                    )
-                    parts.append(f"({resolved_query})")
-                    local_pos_dict[current_pos] = next_paren_id
+        # Note: references are resolved depth-first with a stack (instead of
+        # recursively), writing each part of the query string (and its offset)
+        # once instead of copying the resolved subqueries at every level.
+        # Lines are tokenized once, even if they are referenced repeatedly.
+        parts: typing.List[str] = []
+        offset: typing.Dict[int, int] = {}
+        current_pos = 0
+        if not artificial_to_original_pos:
+            next_paren_id = -2
+        else:
+            next_paren_id = min(artificial_to_original_pos) - 1
+        line_tokens: typing.Dict[str, list] = {}
+
+        # Operator nodes being resolved:
+        # [line number, index of the next token, id of the enclosing parentheses]
+        stack: typing.List[list] = [[ref_nr, 0, None]]
+        # Lines on the stack (referencing one of them again would be circular)
+        lines_on_stack = {ref_nr}
+        while stack:
+            frame = stack[-1]
+            line_nr, index, paren_id = frame
+            node_content = self.query_dict[line_nr]
+            if line_nr not in line_tokens:
+                line_tokens[line_nr] = self.tokenize_operator_node(
+                    node_content["node_content"], int(line_nr)
+                )
+            tokens = line_tokens[line_nr]
+
+            if index == len(tokens):
+                stack.pop()
+                lines_on_stack.discard(line_nr)
+                if paren_id is not None:
+                    offset[current_pos] = paren_id
+                    parts.append(")")
                     current_pos += 1
-                    for rel_pos, orig_pos in nested_pos_dict.items():
-                        local_pos_dict[current_pos + rel_pos] = orig_pos
-                    local_pos_dict[current_pos + len(resolved_query)] = next_paren_id
-                    current_pos += len(resolved_query) + 1
-                else:
-                    parts.append(token.value)
-                    token_pos = operator_base_offset + token.position[0]
-                    local_pos_dict[current_pos] = token_pos
-                    current_pos += len(token.value)
+                continue
+            frame[1] += 1
 
+            if index > 0:
                 parts.append(" ")
                 current_pos += 1
 
-            resolved = "".join(parts).strip()
-            return resolved, local_pos_dict, artificial_to_original_pos
+            token = tokens[index]
+            operator_base_offset = node_content["content_pos"][0]
+            if token.type != OperatorNodeTokenTypes.LIST_ITEM_REFERENCE:
+                offset[current_pos] = operator_base_offset + token.position[0]
+                parts.append(token.value)
+                current_pos += len(token.value)
+                continue
+
+            # Inline the referenced query (in artificial parentheses)
+            artificial_to_original_pos[next_paren_id] = (
+                token.position[0] + operator_base_offset,
+                token.position[1] + operator_base_offset,
+            )
+            offset[current_pos] = next_paren_id
+            parts.append("(")
+            current_pos += 1
+
+            nested_ref_nr = self.extract_reference_value(token.value)
+            assert nested_ref_nr in self.query_dict
+            if nested_ref_nr in lines_on_stack:
+                self.linter.add_message(
+                    QueryErrorCode.LIST_QUERY_CIRCULAR_REFERENCE,
+                    list_position=line_nr,
+                    positions=[artificial_to_original_pos[next_paren_id]],
+                    details=f"List reference {token.value} is circular.",
+                    fatal=True,
+                )
+                self.linter.print_messages()
+                raise ListQuerySyntaxError(self.linter)
+            processed_lines.add(nested_ref_nr)
+            nested_content = self.query_dict[nested_ref_nr]
+            if nested_content["type"] == ListTokenTypes.OPERATOR_NODE:
+                lines_on_stack.add(nested_ref_nr)
+                stack.append([nested_ref_nr, 0, next_paren_id])
+            else:
+                if nested_content["type"] == ListTokenTypes.QUERY_NODE:
+                    offset[current_pos] = nested_content["content_pos"][0]
+                    parts.append(nested_content["node_content"])
+                    current_pos += len(nested_content["node_content"])
+                offset[current_pos] = next_paren_id
+                parts.append(")")
+                current_pos += 1
+            next_paren_id -= 1
 
-        return "", {}, artificial_to_original_pos
+        return "".join(parts), offset, artificial_to_original_pos
 
     def build_query_str(self) -> typing.Tuple[str, dict, set, dict]:
         """Build the query string from the list format."""
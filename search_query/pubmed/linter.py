@@ -173,10 +173,12 @@ class PubmedQueryStringLinter(QueryStringLinter):
         # pylint: disable=duplicate-code
         invalid_characters = self.INVALID_CHARACTERS
 
-        if query.is_term():
+        for node in query.walk():
+            if not node.is_term():
+                continue
             # Iterate over term to identify invalid characters
             # and replace them with whitespace
-            for i, char in enumerate(query.value):
+            for i, char in enumerate(node.value):
                 if char in invalid_characters:
                     details = (
                         f"Character '{char}' in search term "
@@ -185,17 +187,14 @@ class PubmedQueryStringLinter(QueryStringLinter):
                         "https://pubmed.ncbi.nlm.nih.gov/help/)"
                     )
                     positions = [(-1, -1)]
-                    if query.position:
-                        positions = [(query.position[0] + i, query.position[0] + i + 1)]
+                    if node.position:
+                        positions = [(node.position[0] + i, node.position[0] + i + 1)]
                     self.add_message(
                         QueryErrorCode.CHARACTER_REPLACEMENT,
                         positions=positions,
                         details=details,
                     )
 
-        for child in query.children:
-            self.check_character_replacement_in_term(child)
-
     def check_invalid_token_sequences(self) -> None:
         """Check token list for invalid token sequences."""
 
@@ -293,13 +292,14 @@ class PubmedQueryStringLinter(QueryStringLinter):
     def _print_unequal_precedence_warning(self) -> None:
         """Warn user about unequal precedence operators in the query string."""
         tokens = self.tokens
+        scoped_operators = self._get_scoped_operators(tokens)
 
         for index, token in enumerate(tokens):
             unequal_operators: typing.List[Token] = []
             if index == 0:
-                ops = self._get_scoped_operators(tokens, start=index)
+                ops = scoped_operators[-1]
             elif token.type == TokenTypes.PARENTHESIS_OPEN:
-                ops = self._get_scoped_operators(tokens, start=index + 1)
+                ops = scoped_operators[index]
             else:
                 continue
 
@@ -361,26 +361,23 @@ class PubmedQueryStringLinter(QueryStringLinter):
         details = (
             "Wildcards cannot be used for short strings (shorter than 4 characters)."
         )
-        if query.is_term():
-            if "*" not in query.value:
-                return
+        for node in query.walk():
+            if not node.is_term() or "*" not in node.value:
+                continue
 
-            if query.value[0] == '"':
+            if node.value[0] == '"':
                 k = 5
             else:
                 k = 4
-            if "*" in query.value[:k]:
+            if "*" in node.value[:k]:
                 # Wildcard * is invalid
                 # when applied to terms with less than 4 characters
                 self.add_message(
                     QueryErrorCode.INVALID_WILDCARD_USE,
-                    positions=[query.position] if query.position else [],
+                    positions=[node.position] if node.position else [],
                     details=details,
                 )
 
-        for child in query.children:
-            self.check_invalid_wildcard(child)
-
     def check_invalid_proximity_operator(self) -> None:
         """Check search field for invalid proximity operator"""
 
@@ -440,23 +437,23 @@ class PubmedQueryStringLinter(QueryStringLinter):
     def check_year_format(self, query: Query) -> None:
         """Check for the correct format of year."""
 
-        if query.is_term():
-            if not query.field:
-                return
+        for node in query.walk():
+            if node.is_term():
+                self._check_year_format_in_term(node)
 
-            if not YEAR_PUBLISHED_FIELD_REGEX.match(query.field.value):
-                return
+    def _check_year_format_in_term(self, query: Query) -> None:
+        if not query.field:
+            return
 
-            if not self.YEAR_VALUE_REGEX.match(query.value):
-                self.add_message(
-                    QueryErrorCode.YEAR_FORMAT_INVALID,
-                    positions=[query.position] if query.position else [],
-                    fatal=True,
-                )
-                return
+        if not YEAR_PUBLISHED_FIELD_REGEX.match(query.field.value):
+            return
 
-        for child in query.children:
-            self.check_year_format(child)
+        if not self.YEAR_VALUE_REGEX.match(query.value):
+            self.add_message(
+                QueryErrorCode.YEAR_FORMAT_INVALID,
+                positions=[query.position] if query.position else [],
+                fatal=True,
+            )
 
     def _get_generic_field_set(self, value: str) -> set:
         return syntax_str_to_generic_field_set(value)
@@ -31,19 +31,35 @@ class PubmedParser(QueryStringParser):
     QUOTATION_MARK_REGEX = re.compile(r'"')
     TERM_REGEX = re.compile(r'[^\s\[\]()|&"]+')
     PROXIMITY_REGEX = re.compile(r"^\[(.+):~(.*)]$")
+    OPERATOR_TOKEN_TYPES = (TokenTypes.LOGIC_OPERATOR, TokenTypes.RANGE_OPERATOR)
 
+    # Note: one named group per token type (see tokenize())
     pattern = re.compile(
         "|".join(
-            [
-                FIELD_REGEX.pattern,
-                LOGIC_OPERATOR_REGEX.pattern,
-                PARENTHESIS_REGEX.pattern,
-                QUOTATION_MARK_REGEX.pattern,
-                TERM_REGEX.pattern,
+            f"(?P<{token_type.name}>{token_pattern})"
+            for token_type, token_pattern in [
+                (TokenTypes.FIELD, FIELD_REGEX.pattern),
+                (TokenTypes.LOGIC_OPERATOR, LOGIC_OPERATOR_REGEX.pattern),
+                (TokenTypes.PARENTHESIS_OPEN, r"\("),
+                (TokenTypes.PARENTHESIS_CLOSED, r"\)"),
+                (TokenTypes.QUOTATION_MARK, QUOTATION_MARK_REGEX.pattern),
+                (TokenTypes.TERM, TERM_REGEX.pattern),
             ]
         ),
         flags=re.IGNORECASE,
     )
+    # Token types determined by the value (e.g., terms like "and" before fields)
+    TOKEN_TYPES = {
+        "AND": TokenTypes.LOGIC_OPERATOR,
+        "OR": TokenTypes.LOGIC_OPERATOR,
+        "NOT": TokenTypes.LOGIC_OPERATOR,
+        "|": TokenTypes.LOGIC_OPERATOR,
+        "&": TokenTypes.LOGIC_OPERATOR,
+        ":": TokenTypes.RANGE_OPERATOR,
+        "(": TokenTypes.PARENTHESIS_OPEN,
+        ")": TokenTypes.PARENTHESIS_CLOSED,
+        '"': TokenTypes.QUOTATION_MARK,
+    }
 
     # pylint: disable=too-many-arguments
     def __init__(
@@ -79,20 +95,10 @@ class PubmedParser(QueryStringParser):
         for match in self.pattern.finditer(self.query_str):
             value = match.group(0)
 
-            if value.upper() in {"AND", "OR", "NOT", "|", "&"}:
-                token_type = TokenTypes.LOGIC_OPERATOR
-            elif value == ":":
-                token_type = TokenTypes.RANGE_OPERATOR
-            elif value == "(":
-                token_type = TokenTypes.PARENTHESIS_OPEN
-            elif value == ")":
-                token_type = TokenTypes.PARENTHESIS_CLOSED
-            elif value.startswith("[") and value.endswith("]"):
-                token_type = TokenTypes.FIELD
-            elif value == '"':
-                token_type = TokenTypes.QUOTATION_MARK
-            else:
-                token_type = TokenTypes.TERM
+            token_type = self.TOKEN_TYPES.get(value.upper())
+            if token_type is None:
+                # FIELD or TERM (named group of the pattern)
+                token_type = TokenTypes[match.lastgroup]  # type: ignore
 
             self.tokens.append(
                 Token(value=value, type=token_type, position=match.span())
@@ -104,33 +110,44 @@ class PubmedParser(QueryStringParser):
     def parse_query_tree(self, tokens: list) -> Query:
         """Parse a query from a list of tokens"""
 
-        if self._is_compound_query(tokens):
-            query = self._parse_compound_query(tokens)
+        # Note: subqueries are parsed as index ranges of the (shared) tokens,
+        # and the query tree is validated once (not for every node)
+        self._index_tokens(tokens)
+        with Query.deferred_validation():
+            return self._parse_range(tokens, 0, len(tokens))
+
+    def _parse_range(self, tokens: list, start: int, end: int) -> Query:
+        """Parse a query from the tokens[start:end]"""
+
+        if self._is_compound_query(tokens, start, end):
+            query = self._parse_compound_query(tokens, start, end)
 
-        elif self._is_nested_query(tokens):
-            query = self._parse_nested_query(tokens)
+        elif self._is_nested_query(tokens, start, end):
+            query = self._parse_nested_query(tokens, start, end)
 
-        elif self._is_term_query(tokens):
-            query = self._parse_term(tokens)
+        elif self._is_term_query(tokens, start, end):
+            query = self._parse_term(tokens, start, end)
 
         else:  # pragma: no cover
             raise ValueError()
 
         return query
 
-    def _is_term_query(self, tokens: list) -> bool:
+    def _is_term_query(self, tokens: list, start: int, end: int) -> bool:
         """Check if the query is a search term"""
-        return tokens[0].type == TokenTypes.TERM and len(tokens) <= 2
+        return 0 < end - start <= 2 and tokens[start].type == TokenTypes.TERM
 
-    def _is_compound_query(self, tokens: list) -> bool:
+    def _is_compound_query(self, tokens: list, start: int, end: int) -> bool:
         """Check if the query is a compound query"""
-        return bool(self._get_operator_indices(tokens))
+        _, lo, hi = self._get_operator_indices(start, end)
+        return lo < hi
 
-    def _is_nested_query(self, tokens: list) -> bool:
+    def _is_nested_query(self, tokens: list, start: int, end: int) -> bool:
         """Check if the query is nested in parentheses"""
         return (
-            tokens[0].type == TokenTypes.PARENTHESIS_OPEN
-            and tokens[-1].type == TokenTypes.PARENTHESIS_CLOSED
+            end > start
+            and tokens[start].type == TokenTypes.PARENTHESIS_OPEN
+            and tokens[end - 1].type == TokenTypes.PARENTHESIS_CLOSED
         )
 
     def _get_operator_type(self, token: Token) -> str:
@@ -145,81 +162,73 @@ class PubmedParser(QueryStringParser):
             return Operators.RANGE
         raise ValueError()  # pragma: no cover
 
-    def _get_operator_indices(self, tokens: list) -> list[int]:
-        """Get indices of top-level operators in the token list"""
-        indices: list[int] = []
-        depth = 0
-        first_op = None
-        # Iterate over tokens in reverse
-        # to find and save positions of consecutive top-level operators
-        # matching the first encountered until a different type is found.
-        for token in reversed(tokens):
-            if token.type == TokenTypes.PARENTHESIS_OPEN:
-                depth += 1
-            elif token.type == TokenTypes.PARENTHESIS_CLOSED:
-                depth -= 1
-            if depth == 0 and token.type in [
-                TokenTypes.LOGIC_OPERATOR,
-                TokenTypes.RANGE_OPERATOR,
-            ]:
-                op = self._get_operator_type(token)
-                if first_op is None:
-                    first_op = op
-                if op == first_op:
-                    indices.append(tokens.index(token))
-                else:
-                    break
-        return indices
-
-    def _parse_compound_query(self, tokens: list) -> Query:
+    def _get_operator_indices(
+        self, start: int, end: int
+    ) -> typing.Tuple[typing.List[int], int, int]:
+        """Get indices of top-level operators in the token list
+        (as the shared list of operator indices with the bounds of the range)"""
+        # Note: the top-level operators are at the depth of the closing token
+        return self._get_operators_at_depth(start, end, self._depths[end])
+
+    def _parse_compound_query(self, tokens: list, start: int, end: int) -> Query:
         """Parse a compound query
         consisting of two or more subqueries connected by a boolean operator"""
 
-        operator_indices = self._get_operator_indices(tokens)
-
-        # Divide tokens into separate lists based on top-level operator positions.
-        token_lists = []
-        i = 0
-        for position in reversed(operator_indices):
-            token_lists.append(tokens[i:position])
-            i = position + 1
-        token_lists.append(tokens[i:])
-
-        # The token lists represent the subqueries (children)
-        # of the compound query and are parsed individually.
-        children = []
-        for token_list in token_lists:
-            query = self.parse_query_tree(token_list)
-            children.append(query)
-
-        operator_type = self._get_operator_type(tokens[operator_indices[0]])
-
-        query_start_pos = tokens[0].position[0]
-        query_end_pos = tokens[-1].position[1]
-
-        return Query.create(
-            value=operator_type,
-            field=None,
-            children=list(children),
-            position=(query_start_pos, query_end_pos),
-            platform="deactivated",
-        )
+        operators, lo, hi = self._get_operator_indices(start, end)
+
+        # Consecutive top-level operators of the same type are combined.
+        # Different operators are evaluated from left to right, i.e., the query
+        # preceding the operators is the first subquery (child).
+        query = None
+        i = lo
+        while i < hi:
+            operator_type = self._get_operator_type(tokens[operators[i]])
+            j = i + 1
+            while (
+                j < hi
+                and self._get_operator_type(tokens[operators[j]]) == operator_type
+            ):
+                j += 1
+            query_end = operators[j] if j < hi else end
+
+            # The token ranges represent the subqueries (children)
+            # of the compound query and are parsed individually.
+            if query is None:
+                children = [self._parse_range(tokens, start, operators[i])]
+            else:
+                children = [query]
+            for k in range(i, j):
+                child_end = operators[k + 1] if k + 1 < j else query_end
+                children.append(self._parse_range(tokens, operators[k] + 1, child_end))
+
+            query = Query.create(
+                value=operator_type,
+                field=None,
+                children=children,
+                position=(tokens[start].position[0], tokens[query_end - 1].position[1]),
+                platform="deactivated",
+            )
+            i = j
+
+        assert query is not None
+        return query
 
-    def _parse_nested_query(self, tokens: list) -> Query:
+    def _parse_nested_query(self, tokens: list, start: int, end: int) -> Query:
         """Parse a query nested inside a pair of parentheses"""
-        inner_query = self.parse_query_tree(tokens[1:-1])
+        inner_query = self._parse_range(tokens, start + 1, end - 1)
         return inner_query
 
-    def _parse_term(self, tokens: list) -> Query:
+    def _parse_term(self, tokens: list, start: int, end: int) -> Query:
         """Parse a search term"""
-        term_token = tokens[0]
+        term_token = tokens[start]
+        field_token = tokens[start + 1] if end - start > 1 else None
 
         # Determine the search field of the search term.
-        if len(tokens) > 1 and tokens[1].type == TokenTypes.FIELD:
-            if ":~" in tokens[1].value:
+        if field_token is not None and field_token.type == TokenTypes.FIELD:
+            if ":~" in field_token.value:
                 # Parse NEAR query
                 field_value, distance = self.PROXIMITY_REGEX.match(
-                    tokens[1].value
+                    field_token.value
                 ).groups()  # type: ignore
                 if not distance.isdigit():
                     distance = 3
@@ -231,18 +240,18 @@ class PubmedParser(QueryStringParser):
                         Term(
                             value=term_token.value,
                             field=SearchField(
-                                value=field_value, position=tokens[1].position
+                                value=field_value, position=field_token.position
                             ),
-                            position=tokens[0].position,
+                            position=term_token.position,
                             platform="deactivated",
                         )
                     ],
-                    position=(tokens[0].position[0], tokens[1].position[1]),
+                    position=(term_token.position[0], field_token.position[1]),
                     distance=int(distance),  # type: ignore
                     platform="deactivated",
                 )
 
-            field = SearchField(value=tokens[1].value, position=tokens[1].position)
+            field = SearchField(value=field_token.value, position=field_token.position)
         else:
             # Select default field "all" if no search field is found.
             field = SearchField(value="[all]", position=(-1, -1))
@@ -250,7 +259,7 @@ class PubmedParser(QueryStringParser):
         return Term(
             value=term_token.value,
             field=field,
-            position=tokens[0].position,
+            position=term_token.position,
             platform="deactivated",
         )
 
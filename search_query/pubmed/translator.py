@@ -41,7 +41,7 @@ class PubmedTranslator(QueryTranslator):
             for child in existing_children:
                 if not child.field:  # pragma: no cover
                     continue
-                child.field.value = Fields.TITLE
+                child.field = SearchField(Fields.TITLE)
                 new_child = Term(
                     value=child.value,
                     field=SearchField(value=Fields.ABSTRACT),
@@ -56,182 +56,234 @@ class PubmedTranslator(QueryTranslator):
 
     @classmethod
     def _translate_fields(cls, query: Query) -> None:
-        if query.operator:
-            for child in query.children:
-                cls._translate_fields(child)
-
-        else:
-            if query.field and query.field.value not in ["[tiab]"]:
-                query.field.value = generic_field_to_syntax_field(query.field.value)
+        for node in query.walk():
+            if node.operator:
+                continue
+            if node.field and node.field.value not in ["[tiab]"]:
+                node.field = SearchField(
+                    generic_field_to_syntax_field(node.field.value)
+                )
 
     @classmethod
     def _combine_tiab(cls, query: Query) -> None:
-        """Recursively combine identical terms from TI and AB into TIAB."""
-
-        if query.operator and query.value == "OR":
-            # ab does not exist: always expand to tiab
-            terms = []
-            for child in query.children:
-                if not child.operator and child.field and child.field.value == "ab":
-                    child.field.value = "[tiab]"
-                    terms.append(child.value)
-
-            if terms:
-                print(f"Info: combining terms from AB OR TI to TIAB: {terms}")
-
-            # Warn if the same terms are not available with ti
-            missing_terms = []
-            for term in terms:
-                if not any(
-                    term == child.value and child.field and child.field.value == "ti"
-                    for child in query.children
-                ):
-                    missing_terms.append(term)
-            if missing_terms:
-                print(
-                    "Info/Warning: Search field broadened for term "
-                    "(AB "
-                    "(without corresponding search for the same term with TI)"
-                    " -> TIAB): "
-                    f"{missing_terms}"
-                )
+        """Combine identical terms from TI and AB into TIAB."""
 
-            # Remove duplicates with ti
-            new_children = []
-            for child in query.children:
-                if child.operator:
-                    # unconditionally append operators
-                    new_children.append(child)
-                elif child.field and not (
-                    child.field.value == "ti" and child.value in terms
-                ):
-                    new_children.append(child)
-            query.children = new_children
+        # Note: pre-order, i.e., the (combined) children are processed next
+        for node in query.walk():
+            if node.operator and node.value == "OR":
+                cls._combine_tiab_node(node)
 
-        # Recursively apply to child queries
+    @classmethod
+    def _combine_tiab_node(cls, query: Query) -> None:
+        # ab does not exist: always expand to tiab
+        terms = []
         for child in query.children:
-            cls._combine_tiab(child)
+            if not child.operator and child.field and child.field.value == "ab":
+                child.field = SearchField("[tiab]")
+                terms.append(child.value)
+
+        if terms:
+            print(f"Info: combining terms from AB OR TI to TIAB: {terms}")
+
+        # Warn if the same terms are not available with ti
+        ti_terms = {
+            child.value
+            for child in query.children
+            if child.field and child.field.value == "ti"
+        }
+        missing_terms = [term for term in terms if term not in ti_terms]
+        if missing_terms:
+            print(
+                "Info/Warning: Search field broadened for term "
+                "(AB "
+                "(without corresponding search for the same term with TI)"
+                " -> TIAB): "
+                f"{missing_terms}"
+            )
+
+        # Remove duplicates with ti
+        tiab_terms = set(terms)
+        new_children = []
+        for child in query.children:
+            if child.operator:
+                # unconditionally append operators
+                new_children.append(child)
+            elif child.field and not (
+                child.field.value == "ti" and child.value in tiab_terms
+            ):
+                new_children.append(child)
+        query.children = new_children
 
-    # pylint: disable=too-many-locals, too-many-branches
     @classmethod
     def _collapse_near_queries(cls, query: Query) -> Query:
-        """Recursively collapse NEAR queries in the query tree."""
-        if not query.children:
-            return query
+        """Collapse NEAR queries in the query tree.
 
-        if query.value == Operators.NEAR:
-            query.children[
-                0
-            ].value = f'"{query.children[0].value} {query.children[1].value}"'
-            query.children.pop()
-            return query
+        Returns the query that replaces the query (if the root is replaced).
+        """
+
+        # Note: post-order, i.e., the children are processed first
+        for node in query.walk(post_order=True):
+            if not node.children:
+                continue
 
-        if query.value == Operators.OR:
-            # Extract NEAR queries
-            near_queries: typing.List[Query] = []
-            other_queries: typing.List[Query] = []
-            for child in query.children:
+            if node.value == Operators.NEAR:
+                parent = node.get_parent()
                 # pylint: disable=unidiomatic-typecheck
-                (near_queries if type(child) is NEARQuery else other_queries).append(
-                    child
+                if (
+                    type(node) is NEARQuery
+                    and parent
+                    and parent.operator
+                    and parent.value == Operators.OR
+                ):
+                    # NEAR queries are combined by the parent OR query
+                    continue
+                node.children[
+                    0
+                ].value = f'"{node.children[0].value} {node.children[1].value}"'
+                node.children.pop()
+                continue
+
+            if node.value == Operators.OR:
+                replacement = cls._combine_near_queries(node)
+                if replacement is not node:
+                    if node is query:
+                        return replacement
+                    node.replace(replacement)
+
+        return query
+
+    # pylint: disable=too-many-locals
+    @classmethod
+    def _combine_near_queries(cls, query: Query) -> Query:
+        """Combine the NEAR queries of an OR query.
+
+        Returns the query that replaces the OR query (if one query remains).
+        """
+        # Extract NEAR queries
+        near_queries: typing.List[Query] = []
+        other_queries: typing.List[Query] = []
+        for child in query.children:
+            # pylint: disable=unidiomatic-typecheck
+            (near_queries if type(child) is NEARQuery else other_queries).append(child)
+
+        # Group NEAR queries by their proximity distance
+        grouped_queries = defaultdict(list)
+        for near_query in near_queries:
+            key = near_query.distance if hasattr(near_query, "distance") else 0
+            grouped_queries[key].append(near_query)
+
+        combined_near_queries = []
+        for distance, queries in grouped_queries.items():
+            # For each group, extract term pairs from NEAR queries and
+            # map them to corresponding fields
+            term_field_map = defaultdict(set)
+            for q in queries:
+                term_a = q.children[0].value
+                term_b = q.children[1].value
+                assert q.children[0].field
+                term_field_map[(min(term_a, term_b), max(term_a, term_b))].add(
+                    q.children[0].field.value
                 )
 
-            for other_query in other_queries:
-                cls._collapse_near_queries(other_query)
-
-            # Group NEAR queries by their proximity distance
-            grouped_queries = defaultdict(list)
-            for near_query in near_queries:
-                key = near_query.distance if hasattr(near_query, "distance") else 0
-                grouped_queries[key].append(near_query)
-
-            combined_near_queries = []
-            for distance, queries in grouped_queries.items():
-                # For each group, extract term pairs from NEAR queries and
-                # map them to corresponding fields
-                term_field_map = defaultdict(set)
-                for q in queries:
-                    term_a = q.children[0].value
-                    term_b = q.children[1].value
-                    assert q.children[0].field
-                    term_field_map[(min(term_a, term_b), max(term_a, term_b))].add(
-                        q.children[0].field.value
+            for (term_a, term_b), fields in term_field_map.items():
+                if Fields.TITLE in fields and Fields.ABSTRACT in fields:
+                    # Merge 'Title' and 'Abstract' into '[tiab]' in the mapping
+                    fields.add("[tiab]")
+                    fields.remove(Fields.TITLE)
+                    fields.remove(Fields.ABSTRACT)
+                for field in fields:
+                    # Generate NEAR queries from the mapping
+                    combined_near_queries.append(
+                        NEARQuery(
+                            value=Operators.NEAR,
+                            children=[
+                                Term(
+                                    value=f'"{term_a} {term_b}"',
+                                    field=SearchField(value=field),
+                                    platform="deactivated",
+                                )
+                            ],
+                            distance=distance,
+                            platform="deactivated",
+                        )
                     )
 
-                for (term_a, term_b), fields in term_field_map.items():
-                    if Fields.TITLE in fields and Fields.ABSTRACT in fields:
-                        # Merge 'Title' and 'Abstract' into '[tiab]' in the mapping
-                        fields.add("[tiab]")
-                        fields.remove(Fields.TITLE)
-                        fields.remove(Fields.ABSTRACT)
-                    for field in fields:
-                        # Generate NEAR queries from the mapping
-                        combined_near_queries.append(
-                            NEARQuery(
-                                value=Operators.NEAR,
-                                children=[
-                                    Term(
-                                        value=f'"{term_a} {term_b}"',
-                                        field=SearchField(value=field),
-                                        platform="deactivated",
-                                    )
-                                ],
-                                distance=distance,
-                                platform="deactivated",
-                            )
-                        )
+                # Collapse proximity searches with 3+ terms ?
 
-                    # Collapse proximity searches with 3+ terms ?
+        query_children = other_queries + combined_near_queries
 
-            query_children = other_queries + combined_near_queries
+        if len(query_children) == 1:
+            # If only one NEAR query remains, replace the OR query with it
+            return query_children.pop()
+        query.children = query_children
+        return query
 
-            if len(query_children) == 1:
-                # If only one NEAR query remains, replace the OR query with it
-                if not query.get_parent():
-                    return query_children.pop()
-                query.replace(query_children.pop())
-            else:
-                query.children = query_children
+    @classmethod
+    def translate_fields_to_generic(cls, query: Query) -> Query:
+        """Translate search fields"""
 
+        translated_query = cls._translate_fields_to_generic(query)
+        if translated_query is not query and query.get_parent():
+            query.replace(translated_query)
             return query
+        return translated_query
 
-        for child in query.children:
-            cls._collapse_near_queries(child)
+    @classmethod
+    def _translate_fields_to_generic(cls, query: Query) -> Query:
+        """Translate the search fields of the subtree.
+
+        Returns the query that replaces the (expanded) query node.
+        """
+
+        # Note: post-order (explicit stack), i.e., the children are translated
+        # (and replaced) before their parent
+        replacements: typing.Dict[Query, Query] = {}
+        stack: typing.List[typing.Tuple[Query, bool]] = [(query, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if node.children and not expanded:
+                if node.value == Operators.NEAR:
+                    # Expand NEAR queries
+                    assert node.children[0].field
+                    field_set = syntax_str_to_generic_field_set(
+                        node.children[0].field.value
+                    )
+                    replacements[node] = cls._expand_near_query(node, field_set)
+                    continue
 
-        return query
+                stack.append((node, True))
+                if not cls._expand_flat_or_chains(node):
+                    stack.extend((child, False) for child in reversed(node.children))
+                continue
+
+            # Note: expanded children are replaced in one pass
+            node.splice_children(
+                {
+                    child: [replacements.pop(child)]
+                    for child in node.children
+                    if child in replacements
+                }
+            )
+            translated_node = cls._translate_field(node)
+            if translated_node is not node:
+                replacements[node] = translated_node
 
-    @classmethod
-    def translate_fields_to_generic(cls, query: Query) -> Query:
-        """Translate search fields"""
+        return replacements.get(query, query)
 
-        if query.children:
-            if query.value == Operators.NEAR:
-                # Expand NEAR queries
-                assert query.children[0].field
-                field_set = syntax_str_to_generic_field_set(
-                    query.children[0].field.value
-                )
-                expanded_query = cls._expand_near_query(query, field_set)
-                if not query.get_parent():
-                    return expanded_query
-                query.replace(expanded_query)
-            else:
-                expanded = cls._expand_flat_or_chains(query)
-                if not expanded:
-                    for child in query.children:
-                        cls.translate_fields_to_generic(child)
+    @classmethod
+    def _translate_field(cls, query: Query) -> Query:
+        """Translate the search field of a query node.
 
+        Returns the query that replaces the (expanded) query node.
+        """
         if query.field:
             field_set = syntax_str_to_generic_field_set(query.field.value)
             if len(field_set) == 1:
-                query.field.value = field_set.pop()
+                query.field = SearchField(field_set.pop())
             else:
                 # Convert queries in the form 'Term [tiab]'
                 # into 'Term [ti] OR Term [ab]'.
-                expanded_query = cls._expand_combined_fields(query, field_set)
-                if not query.get_parent():
-                    return expanded_query
-                query.replace(expanded_query)
+                return cls._expand_combined_fields(query, field_set)
 
         return query
 
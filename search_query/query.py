@@ -2,22 +2,54 @@
 """Query class."""
 from __future__ import annotations
 
-import copy
+import contextlib
+import contextvars
+import sys
 import typing
 
 from search_query.constants import Operators
 from search_query.constants import PLATFORM
 from search_query.constants import SearchField
+from search_query.evaluation import DEFAULT_CHUNK_SIZE
 from search_query.generic.serializer import GenericSerializer
 from search_query.serializer_structured import to_string_structured
 from search_query.serializer_structured import to_string_structured_2
 
+if typing.TYPE_CHECKING:  # pragma: no cover
+    from search_query.corpus import RecordCorpus
+    from search_query.frozen_query import FrozenQuery
+    from search_query.matcher import CompiledQuery
+
+_QueryT = typing.TypeVar("_QueryT", bound="Query")
+
+# Nodes created in Query.deferred_validation() (None: validate immediately)
+# Note: a context variable, i.e., separate for each thread (and async task)
+_DEFERRED_NODES: contextvars.ContextVar[
+    typing.Optional[typing.List[Query]]
+] = contextvars.ContextVar("deferred_nodes", default=None)
+
 
 # pylint: disable=too-many-public-methods
 # pylint: disable=too-many-instance-attributes
 class Query:
     """Query class."""
 
+    # Note: slots keep the nodes of large (generated) query trees compact.
+    # Subclasses must declare their (additional) slots.
+    __slots__ = (
+        "_value",
+        "_operator",
+        "_children",
+        "_field",
+        "field_position",
+        "position",
+        "marked",
+        "_platform",
+        "_resolved_platform",
+        "_silence_linter",
+        "_parent",
+    )
+
     # pylint: disable=too-many-arguments
     def __init__(
         self,
@@ -38,16 +70,18 @@ class Query:
         self._operator = operator
         self._children: typing.List[Query] = []
         self._field = None
+        self.field_position: typing.Optional[typing.Tuple[int, int]] = None
 
         self.value = value
         if isinstance(field, str):
             self.field = SearchField(field)
         else:
             self.field = field
-        self.position = position
+        self.position = tuple(position) if position is not None else None
         self.marked = False
-        # Note: platform is only set for root nodes
-        self._platform = platform
+        # Note: the platform is stored at the root (None: inherited from the parent)
+        self._platform: typing.Optional[str] = sys.intern(platform)
+        self._resolved_platform: typing.Optional[str] = None
         # helper flag to silence linter after parse() to avoid repeated linter printout
         self._silence_linter = False
 
@@ -56,7 +90,10 @@ class Query:
             for child in children:
                 self.add_child(child)
 
-        self._set_platform_recursively(platform)
+        deferred_nodes = _DEFERRED_NODES.get()
+        if deferred_nodes is not None:
+            deferred_nodes.append(self)
+            return
 
         self._ensure_children_not_circular()
 
@@ -64,6 +101,33 @@ class Query:
         # when queries are created programmatically
         self._validate_platform_constraints()
 
+    @classmethod
+    @contextlib.contextmanager
+    def deferred_validation(cls) -> typing.Iterator[None]:
+        """Context for building (large) query trees programmatically.
+
+        Nodes are created without setting the platform of their subtrees,
+        checking for circular references and running the linter. When the
+        context exits, this is done once for each query tree (root node)
+        created within the context.
+        """
+        if _DEFERRED_NODES.get() is not None:
+            # Nested contexts: the outermost context validates
+            yield
+            return
+
+        nodes: typing.List[Query] = []
+        token = _DEFERRED_NODES.set(nodes)
+        try:
+            yield
+        finally:
+            _DEFERRED_NODES.reset(token)
+
+        for node in nodes:
+            if node.get_parent() is None:
+                node._ensure_children_not_circular()
+                node._validate_platform_constraints()
+
     @classmethod
     def create(
         cls,
@@ -124,10 +188,31 @@ class Query:
 
         raise ValueError(f"Invalid operator value: {value}")
 
+    @staticmethod
+    def _create_from_terms(
+        query_class: typing.Type[_QueryT],
+        values: typing.Iterable[str],
+        *,
+        field: typing.Optional[typing.Union[SearchField, str]],
+        platform: str,
+    ) -> _QueryT:
+        """Create an operator query (of the query class) with search terms
+        as its children (see OrQuery.from_terms() and AndQuery.from_terms())."""
+        # pylint: disable=import-outside-toplevel
+        from search_query.query_term import Term
+
+        if isinstance(field, str):
+            field = SearchField(field)
+        with Query.deferred_validation():
+            terms = [Term(value, field=field, platform=platform) for value in values]
+            return query_class(terms, field=field, platform=platform)  # type: ignore
+
     def _validate_platform_constraints(self) -> None:
         if self.platform == "deactivated":
             return
 
+        self._normalize_fields()
+
         # pylint: disable=import-outside-toplevel
         if self.platform == PLATFORM.WOS.value:
             from search_query.wos.linter import WOSQueryStringLinter
@@ -166,30 +251,81 @@ class Query:
                 f"Validation for {self.platform} is not implemented"
             )
 
-    def _set_platform_recursively(self, platform: str) -> None:
-        """Set the origin platform for this query node and its children."""
-        self._platform = platform
-        self._normalize_field_for_platform()
-        for child in self._children:
+    def _set_platform(self, platform: str) -> None:
+        """Set the platform of the query (resolved lazily by its descendants)."""
+        self._invalidate_resolved_platforms()
+        self._platform = sys.intern(platform)
+
+    def _invalidate_resolved_platforms(self) -> None:
+        """Clear the platforms cached in the subtree (see platform)."""
+        # Note: a node only caches its platform if its parent caches the platform
+        # (or stores it), i.e., subtrees without cached platforms are skipped.
+        self._resolved_platform = None
+        stack = list(self._children)
+        while stack:
+            node = stack.pop()
+            if node._platform is not None or node._resolved_platform is None:
+                continue
+            node._resolved_platform = None
+            stack.extend(node._children)
+
+    def _has_normalized_fields(self) -> bool:
+        """Check whether the search fields are normalized for the platform."""
+        if self.platform != PLATFORM.GENERIC.value:
+            return True
+        # pylint: disable=protected-access
+        return all(
+            node._field is None or node._field.value == node._field.value.lower()
+            for node in self.walk()
+        )
+
+    def _normalize_fields(self) -> None:
+        """Normalize the search fields of the query based on its platform.
+
+        Note: fields are normalized when the query is validated, compiled or
+        translated (not when the platform is set). Serializers normalize a copy.
+        """
+        if self.platform != PLATFORM.GENERIC.value:
+            return
+        for node in self.walk():
             # pylint: disable=protected-access
-            child._set_platform_recursively(platform)
+            if node._field and node._field.value != node._field.value.lower():
+                node._field = SearchField(node._field.value.lower())
 
-    def _normalize_field_for_platform(self) -> None:
-        """Normalize field values based on the current platform."""
-        if self._field and self._platform == PLATFORM.GENERIC.value:
-            self._field.value = self._field.value.lower()
+    def _with_normalized_fields(self) -> Query:
+        """Return the query, or a normalized copy if its fields are not normalized."""
+        if self._has_normalized_fields():
+            return self
+        normalized = self.copy()
+        normalized._normalize_fields()
+        return normalized
 
     @property
     def platform(self) -> str:
         """Platform property."""
-        return self._platform
+        # Note: only the root (or a node whose platform was set) stores the platform.
+        # The descendants cache the resolved platform until a platform or parent
+        # in the tree changes, i.e., the parents are climbed once per traversal.
+        path = []
+        node = self
+        while node._platform is None:
+            if node._resolved_platform is not None:
+                platform = node._resolved_platform
+                break
+            path.append(node)
+            node = node._parent  # type: ignore
+        else:
+            platform = node._platform
+        for descendant in path:
+            descendant._resolved_platform = platform
+        return platform
 
     @platform.setter
     def platform(self, platform: str) -> None:
         """Set the platform property."""
         if platform not in [p.value for p in PLATFORM] + ["deactivated"]:
             raise ValueError(f"Invalid platform: {platform}")
-        self._set_platform_recursively(platform)
+        self._set_platform(platform)
         self._validate_platform_constraints()
 
     def set_platform_unchecked(self, platform: str, silent: bool = False) -> None:
@@ -199,34 +335,53 @@ class Query:
 
         if silent:
             self._silence_linter = True
-        self._set_platform_recursively(platform)
+        self._set_platform(platform)
 
     def __deepcopy__(self, memo: dict) -> Query:
-        cls = self.__class__
-        result = cls.__new__(cls)
-        memo[id(self)] = result
-
-        for k, v in self.__dict__.items():
-            if k == "_parent":
-                setattr(
-                    result, k, None
-                )  # parent will be reset manually during tree reconstruction
-            else:
-                setattr(result, k, copy.deepcopy(v, memo))
+        # Note: nodes shared with other deep-copied objects are copied once,
+        # parent links are not set (see copy())
+        return self._copy_tree(memo, set_parents=False)
 
-        return result
+    def _copy_node(self) -> Query:
+        """Copy the node without its children and parent."""
+        cls = self.__class__
+        copied = cls.__new__(cls)
+        copied._value = self._value
+        copied._operator = self._operator
+        copied._children = []
+        copied._field = self._field
+        copied.field_position = self.field_position
+        copied.position = self.position
+        copied.marked = self.marked
+        copied._platform = self._platform
+        copied._resolved_platform = None
+        copied._silence_linter = self._silence_linter
+        copied._parent = None
+        return copied
 
-    def _reset_parent_links(self) -> None:
-        """Reset parent pointers after deepcopy to restore correct tree structure."""
-        for child in self.children:
-            child._parent = self  # pylint: disable=protected-access
-            child._reset_parent_links()  # pylint: disable=protected-access
+    def _copy_tree(self, memo: dict, *, set_parents: bool) -> Query:
+        """Copy the tree in a single (iterative) pass."""
+        # pylint: disable=protected-access
+        copied_root = memo[id(self)] = self._copy_node()
+        copied_root._platform = self.platform
+        stack = [(self, copied_root)]
+        while stack:
+            node, copied = stack.pop()
+            for child in node._children:
+                copied_child = memo.get(id(child))
+                if copied_child is None:
+                    copied_child = memo[id(child)] = child._copy_node()
+                    # Note: copies without parents store their platform
+                    copied_child._platform = None if set_parents else copied._platform
+                    stack.append((child, copied_child))
+                if set_parents:
+                    copied_child._parent = copied
+                copied._children.append(copied_child)
+        return copied_root
 
     def copy(self) -> Query:
         """Return a deep copy of the Query instance without parent references."""
-        copied = copy.deepcopy(self, memo={})
-        copied._reset_parent_links()  # pylint: disable=protected-access
-        return copied
+        return self._copy_tree({}, set_parents=True)
 
     @property
     def value(self) -> str:
@@ -303,8 +458,42 @@ class Query:
         self._children.append(child)
         return child
 
+    def splice_children(
+        self, replacements: typing.Dict[Query, typing.List[Query]]
+    ) -> None:
+        """Replace children with lists of nodes (an empty list removes the child).
+
+        The children are rewritten in one pass (linear in the number of
+        children) and their parent pointers are updated. As in other rewrites,
+        the number of children is not validated.
+        """
+        if not replacements:
+            return
+        children = []
+        for child in self._children:
+            # Note: nodes are compared (and hashed) by identity
+            if child not in replacements:
+                children.append(child)
+                continue
+            child._set_parent(None)  # pylint: disable=protected-access
+            for new_child in replacements[child]:
+                new_child._set_parent(self)  # pylint: disable=protected-access
+                children.append(new_child)
+        self._children[:] = children
+
+    def remove_children(self, children: typing.Iterable[Query]) -> None:
+        """Remove children (in one pass, see splice_children())."""
+        self.splice_children({child: [] for child in children})
+
     def _set_parent(self, parent: typing.Optional[Query]) -> None:
         """Internal method to update the parent of this node."""
+        if parent is not None:
+            # Inherit the platform of the parent
+            self._platform = None
+        elif self._parent is not None:
+            # Detached nodes keep the platform of their (former) query
+            self._platform = self.platform
+        self._invalidate_resolved_platforms()
         self._parent = parent
 
     def get_parent(self) -> typing.Optional[Query]:
@@ -313,7 +502,10 @@ class Query:
 
     def get_root(self) -> Query:
         """Return the root of the query tree by climbing up parent pointers."""
-        return self if self._parent is None else self._parent.get_root()
+        node = self
+        while node._parent is not None:
+            node = node._parent
+        return node
 
     @property
     def field(self) -> typing.Optional[SearchField]:
@@ -322,10 +514,15 @@ class Query:
 
     @field.setter
     def field(self, sf: typing.Optional[SearchField]) -> None:
-        """Set search field property."""
-        self._field = copy.deepcopy(sf) if sf else None
-        if self._field and getattr(self, "_platform", None) == PLATFORM.GENERIC.value:
-            self._field.value = self._field.value.lower()
+        """Set search field property (the position is stored at the node)."""
+        if not sf:
+            self._field = None
+            self.field_position = None
+            return
+        # Note: search fields are shared (interned) instances and
+        # normalized for the platform with the query (see _normalize_fields())
+        self._field = SearchField(sf.value)
+        self.field_position = sf._position  # pylint: disable=protected-access
 
     def replace(self, new_query: Query) -> None:
         """Replace this query with a new query in the parent's children list."""
@@ -336,90 +533,97 @@ class Query:
             for index, child in enumerate(children):
                 if child is self:
                     children[index] = new_query
+                    new_query._set_parent(parent)  # pylint: disable=protected-access
+                    self._set_parent(None)
                     return
         raise RuntimeError("Root node of a query cannot be replaced")
 
-    def selects(self, *, record_dict: dict) -> bool:
-        """Indicates whether the query selects a given record."""
+    def freeze(self) -> FrozenQuery:
+        """Return an immutable (hash-consed) copy of the query tree, which
+        can be used as a dict key (see FrozenQuery.to_query())."""
         # pylint: disable=import-outside-toplevel
-        from search_query.translator_base import QueryTranslator
+        from search_query.frozen_query import FrozenQuery
 
-        query_with_term_fields = self.copy()
-        QueryTranslator.move_fields_to_terms(query_with_term_fields)
+        return FrozenQuery.from_query(self)
 
-        # pylint: disable=protected-access
-        return query_with_term_fields.selects_record(record_dict=record_dict)
+    def compile(self) -> CompiledQuery:
+        """Compile the query into an immutable matcher that can be applied
+        to many records (see selects() and evaluate())."""
+        # pylint: disable=import-outside-toplevel
+        from search_query.matcher import compile_query
+
+        return compile_query(self)
+
+    def selects(self, *, record_dict: dict) -> bool:
+        """Indicates whether the query selects a given record."""
+        return self.compile().matches(record_dict)
 
     def selects_record(self, record_dict: dict) -> bool:
-        """Abstract method to be implemented by subclasses to select records."""
-        raise NotImplementedError(
-            "This method should be implemented by subclasses of Query"
-        )
+        """Indicates whether the query selects a given record."""
+        return self.selects(record_dict=record_dict)
 
-    def _get_confusion_matrix(self, records_dict: dict) -> dict:
-        relevant_ids = set()
-        irrelevant_ids = set()
-        selected_ids = set()
-
-        for record_id, record in records_dict.items():
-            status = record.get("colrev_status")
-            if status == "rev_included":
-                relevant_ids.add(record_id)
-            elif status in {"rev_excluded", "rev_prescreen_excluded"}:
-                irrelevant_ids.add(record_id)
-
-            if self.selects(record_dict=record):
-                selected_ids.add(record_id)
-
-        # Only evaluate against relevant + irrelevant records
-        eval_ids = relevant_ids | irrelevant_ids
-        selected_eval_ids = selected_ids & eval_ids
-
-        true_positives = len(selected_eval_ids & relevant_ids)
-        false_positives = len(selected_eval_ids & irrelevant_ids)
-        false_negatives = len(relevant_ids - selected_ids)
-
-        return {
-            "total_evaluated": len(eval_ids),
-            "selected": len(selected_eval_ids),
-            "true_positives": true_positives,
-            "false_positives": false_positives,
-            "false_negatives": false_negatives,
-        }
+    def _get_confusion_matrix(
+        self,
+        records_dict: typing.Union[dict, RecordCorpus, typing.Iterable[dict]],
+        *,
+        workers: typing.Optional[int] = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> dict:
+        # pylint: disable=import-outside-toplevel
+        from search_query.evaluation import get_confusion_matrix
 
-    def evaluate(self, records_dict: dict) -> dict:
+        return get_confusion_matrix(
+            self.compile(), records_dict, workers=workers, chunk_size=chunk_size
+        )
+
+    def evaluate(
+        self,
+        records_dict: typing.Union[dict, RecordCorpus, typing.Iterable[dict]],
+        *,
+        workers: typing.Optional[int] = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> dict:
         """Evaluate the query against records using colrev_status labels.
 
         - rev_included: relevant
         - rev_excluded / rev_prescreen_excluded: irrelevant
         - others: ignored
-        """
 
-        results = self._get_confusion_matrix(records_dict)
+        Pass a RecordCorpus (instead of the records dict) to evaluate the query
+        on an inverted index, e.g., when many queries are evaluated against
+        the same records, or an iterable of records to stream them.
+        With workers > 1 (None: all CPU cores), the records are matched in
+        chunks (of chunk_size records) by a pool of worker processes
+        (workers < 1 raise a ValueError). A RecordCorpus is evaluated with
+        set operations in this process, i.e., workers and chunk_size are
+        not used.
+        """
+        # pylint: disable=import-outside-toplevel
+        from search_query.evaluation import get_metrics
 
-        precision = (
-            results["true_positives"]
-            / (results["true_positives"] + results["false_positives"])
-            if (results["true_positives"] + results["false_positives"]) > 0
-            else 0
-        )
-        recall = (
-            results["true_positives"]
-            / (results["true_positives"] + results["false_negatives"])
-            if (results["true_positives"] + results["false_negatives"]) > 0
-            else 0
-        )
-        f1 = (
-            (2 * precision * recall) / (precision + recall)
-            if (precision + recall) > 0
-            else 0
+        results = self._get_confusion_matrix(
+            records_dict, workers=workers, chunk_size=chunk_size
         )
+        return get_metrics(results)
 
-        results["precision"] = precision
-        results["recall"] = recall
-        results["f1_score"] = f1
+    def evaluate_file(
+        self,
+        path: str,
+        *,
+        workers: typing.Optional[int] = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> dict:
+        """Evaluate the query against the records of a JSONL, CSV or BibTeX
+        file (see evaluate()). Records are streamed, i.e., memory does not
+        grow with the size of the file."""
+        # pylint: disable=import-outside-toplevel
+        from search_query.evaluation import get_metrics
+        from search_query.evaluation import iter_records
 
-        return results
+        results = self._get_confusion_matrix(
+            iter_records(path), workers=workers, chunk_size=chunk_size
+        )
+        return get_metrics(results)
 
     def is_term(self) -> bool:
         """Check whether the SearchQuery is a term."""
@@ -430,9 +634,31 @@ class Query:
         return self._get_nr_leaves_from_node(self)
 
     def _get_nr_leaves_from_node(self, node: Query) -> int:
-        return sum(
-            self._get_nr_leaves_from_node(n) if n.operator else 1 for n in node.children
-        )
+        return sum(1 for n in node.walk() if not n.operator and n is not node)
+
+    def walk(self, *, post_order: bool = False) -> typing.Iterator[Query]:
+        """Iterate over the nodes of the query tree (depth-first).
+
+        Pre-order yields each node before its children, post-order after its
+        children. The traversal is iterative and works for deeply nested trees.
+        """
+        if post_order:
+            stack: typing.List[typing.Tuple[Query, bool]] = [(self, False)]
+            while stack:
+                node, expanded = stack.pop()
+                if expanded:
+                    yield node
+                    continue
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node._children))
+            return
+
+        nodes = [self]
+        while nodes:
+            node = nodes.pop()
+            yield node
+            # Note: children are read after the node was processed
+            nodes.extend(reversed(node._children))
 
     def _ensure_children_not_circular(
         self,
@@ -446,19 +672,15 @@ class Query:
 
     def _mark(self) -> None:
         """marks the node"""
-        if self.marked:
-            raise ValueError("Building Query Tree failed")
-        self.marked = True
-        for child in self.children:
-            # pylint: disable=protected-access
-            child._mark()
+        for node in self.walk():
+            if node.marked:
+                raise ValueError("Building Query Tree failed")
+            node.marked = True
 
     def _remove_marks(self) -> None:
         """removes the mark from the node"""
-        self.marked = False
-        for child in self.children:
-            # pylint: disable=protected-access
-            child._remove_marks()
+        for node in self.walk():
+            node.marked = False
 
     def to_structured_string(self) -> str:
         """Prints the query in generic syntax"""
@@ -470,7 +692,7 @@ class Query:
 
     def to_generic_string(self) -> str:
         """Prints the query in generic syntax"""
-        return GenericSerializer().to_string(self)
+        return GenericSerializer().to_string(self._with_normalized_fields())
 
     def to_string(self) -> str:
         """Prints the query as a string"""
@@ -481,7 +703,7 @@ class Query:
 
         serializer = LATEST_SERIALIZERS[self.platform]
 
-        return serializer().to_string(self)
+        return serializer().to_string(self._with_normalized_fields())
 
     def translate(self, target_syntax: str) -> Query:
         """Translate the query to the target syntax using the provided translator."""
@@ -496,7 +718,8 @@ class Query:
         from search_query.registry import LATEST_TRANSLATORS
 
         if self.platform == "generic":
-            generic_query = self.copy()
+            # Note: the translator copies the (normalized) query
+            generic_query = self._with_normalized_fields()
         else:
             if self.platform not in LATEST_TRANSLATORS:  # pragma: no cover
                 raise NotImplementedError(
@@ -517,3 +740,35 @@ class Query:
         target_query = translator.to_specific_syntax(generic_query)
         target_query.platform = target_syntax
         return target_query
+
+
+class QueryVisitor:
+    """Visitor for query trees (with parent context).
+
+    Subclasses override enter() and/or leave(), which are called for each
+    node before (pre-order) and after (post-order) its children.
+    If enter() returns False, the children of the node are skipped.
+    The traversal is iterative and works for deeply nested trees.
+    """
+
+    def enter(self, node: Query, parent: typing.Optional[Query]) -> bool:
+        """Called before the children of the node are visited."""
+        # pylint: disable=unused-argument
+        return True
+
+    def leave(self, node: Query, parent: typing.Optional[Query]) -> None:
+        """Called after the children of the node were visited."""
+
+    def visit(self, query: Query) -> None:
+        """Visit the query tree (depth-first)."""
+        stack: typing.List[typing.Tuple[Query, typing.Optional[Query], bool]] = [
+            (query, query.get_parent(), False)
+        ]
+        while stack:
+            node, parent, entered = stack.pop()
+            if entered:
+                self.leave(node, parent)
+                continue
+            stack.append((node, parent, True))
+            if self.enter(node, parent) is not False:
+                stack.extend((child, node, False) for child in reversed(node.children))
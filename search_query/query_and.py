@@ -12,6 +12,8 @@ from search_query.query import SearchField
 class AndQuery(Query):
     """AND Query"""
 
+    __slots__ = ()
+
     def __init__(
         self,
         children: typing.List[typing.Union[str, Query]],
@@ -38,6 +40,20 @@ class AndQuery(Query):
             platform=platform,
         )
 
+    @classmethod
+    def from_terms(
+        cls,
+        values: typing.Iterable[str],
+        *,
+        field: typing.Optional[typing.Union[SearchField, str]] = None,
+        platform: str = "generic",
+    ) -> AndQuery:
+        """Create an AND query of search terms (e.g., from a controlled vocabulary).
+
+        The terms are created in one pass and the query is validated once.
+        """
+        return cls._create_from_terms(cls, values, field=field, platform=platform)
+
     @property
     def children(self) -> typing.List[Query]:
         """Children property."""
@@ -57,6 +73,3 @@ class AndQuery(Query):
         # Add each new child using add_child (ensures parent is set)
         for child in children or []:
             self.add_child(child)
-
-    def selects_record(self, record_dict: dict) -> bool:
-        return all(x.selects(record_dict=record_dict) for x in self.children)
@@ -16,6 +16,8 @@ from search_query.query_term import Term
 class NEARQuery(Query):
     """NEAR Query"""
 
+    __slots__ = ("_distance",)
+
     # pylint: disable=too-many-arguments
     # pylint: disable=duplicate-code
 
@@ -57,6 +59,13 @@ class NEARQuery(Query):
         # )
         self.distance: int = distance
 
+    def _copy_node(self) -> Query:
+        copied = super()._copy_node()
+        # Note: the distance is not set yet when validating in __init__()
+        if hasattr(self, "_distance"):
+            copied._distance = self._distance  # type: ignore
+        return copied
+
     @property
     def distance(self) -> typing.Optional[int]:
         """Distance property."""
@@ -100,42 +109,3 @@ class NEARQuery(Query):
         # Add each new child using add_child (ensures parent is set)
         for child in children or []:
             self.add_child(child)
-
-    def selects_record(self, record_dict: dict) -> bool:
-        """Check if the record matches the NEAR query."""
-        assert len(self.children) == 2, "NEAR query must have two children"
-        assert self.children[0].field, "First child must have a search field"
-        assert self.children[1].field, "Second child must have a search field"
-        assert self.distance is not None, "NEAR query must have a distance"
-        assert (
-            self.children[0].field.value == self.children[1].field.value
-        ), "Both children of NEAR query must have the same search field"
-
-        # the self.children[0].value
-        # must be in self.distance words of self.children[1].value
-        field = self.children[0].field.value
-        text = record_dict.get(field, "")
-        if not isinstance(text, str):
-            return False
-
-        term1 = self.children[0].value.lower()
-        term2 = self.children[1].value.lower()
-
-        tokens = (
-            text.split()
-        )  # Simple whitespace tokenizer; can be replaced with a smarter one
-        # Get all positions of term1 and term2
-        positions_term1 = [
-            i for i, token in enumerate(tokens) if token.lower() == term1
-        ]
-        positions_term2 = [
-            i for i, token in enumerate(tokens) if token.lower() == term2
-        ]
-
-        # Check if any pair is within the allowed distance
-        for p1 in positions_term1:
-            for p2 in positions_term2:
-                if abs(p1 - p2) <= self.distance:
-                    return True
-
-        return False
@@ -14,6 +14,8 @@ from search_query.query import SearchField
 class RangeQuery(Query):
     """Range Query"""
 
+    __slots__ = ()
+
     def __init__(
         self,
         children: typing.List[typing.Union[str, Query]],
@@ -59,28 +61,3 @@ class RangeQuery(Query):
         # Add each new child using add_child (ensures parent is set)
         for child in children or []:
             self.add_child(child)
-
-    def selects_record(self, record_dict: dict) -> bool:
-        """Check if the record matches the range query."""
-        assert len(self.children) == 2, "RANGE query must have two children"
-        assert self.children[0].field, "First child must have a search field"
-        assert self.children[1].field, "Second child must have a search field"
-        assert (
-            self.children[0].field.value == self.children[1].field.value
-        ), "Both children of RANGE query must have the same search field"
-
-        term1 = self.children[0].value.lower()
-        term2 = self.children[1].value.lower()
-        record_field = record_dict.get(
-            self.children[0].field.value, record_dict.get("year", "")
-        )
-
-        if term1.isdigit() and term2.isdigit() and record_field.isdigit():
-            value1 = int(term1)
-            value2 = int(term2)
-            record_value = int(record_field)
-            return value1 <= record_value <= value2
-
-        # Match other cases here (e.g., dates)
-
-        raise ValueError("Both children of RANGE query must be numeric values")
@@ -25,66 +25,67 @@ class QueryTranslator:
     @classmethod
     def move_fields_to_terms(cls, query: Query) -> None:
         """Move the search field from the operator to the terms."""
-        if query.operator and query.field:
-            # move search field from operator to terms
-            for child in query.children:
-                if not child.field:
-                    child.field = query.field.copy()
-            query.field = None
-
-        for child in query.children:
-            # Recursively call the function on the child queries
-            cls.move_fields_to_terms(child)
+        for node in query.walk():
+            if node.operator and node.field:
+                # move search field from operator to terms
+                for child in node.children:
+                    if not child.field:
+                        child.field = node.field
+                        child.field_position = node.field_position
+                node.field = None
 
     @classmethod
     def flatten_nested_operators(cls, query: Query) -> None:
         """Check if there are double nested operators."""
 
-        del_children = []
-        if query.operator:
-            for child in query.children:
-                if child.operator:
-                    if child.value == query.value:
-                        # Get the child one level up
-                        for grandchild in child.children:
-                            query.children.append(grandchild)
-                        del_children.append(query.children.index(child))
-
-            # Delete the child
-            if del_children:
-                del_children.reverse()
-                for index in del_children:
-                    query.children.pop(index)
-
-        if query.children:
-            for child in query.children:
-                cls.flatten_nested_operators(child)
+        for node in query.walk():
+            if not node.operator:
+                continue
+            merged = [
+                child
+                for child in node.children
+                if child.operator and child.value == node.value
+            ]
+            if not merged:
+                continue
+
+            # Get the grandchildren one level up (nested operators are merged
+            # as well), appending them after the remaining children
+            node.remove_children(merged)
+            for nested in merged:
+                for grandchild in nested.children:
+                    if grandchild.operator and grandchild.value == node.value:
+                        merged.append(grandchild)
+                    else:
+                        node.add_child(grandchild)
 
     @classmethod
     def move_fields_to_operator(cls, query: Query) -> None:
         """move search fields to operator query"""
 
-        if query.is_term():
-            return
-
-        for child in query.children:
-            # recursive call
-            cls.move_fields_to_operator(child)
+        # Note: post-order, i.e., the children are processed first
+        for node in query.walk(post_order=True):
+            if node.is_term():
+                continue
+            cls._move_fields_to_operator_node(node)
 
-        common_term = ""
+    @classmethod
+    def _move_fields_to_operator_node(cls, query: Query) -> None:
+        # Note: search fields are shared instances (compared by identity)
+        common_field = None
         for child in query.children:
             if not child.field:  # pragma: no cover
                 return
-            if common_term == "":
-                common_term = child.field.value
+            if common_field is None:
+                common_field = child.field
                 continue
-            if common_term != child.field.value:
+            if child.field is not common_field:
                 # Search fields differ
                 return
 
         # all children have the same search field
         # move search field to operator
-        query.field = query.children[0].field
+        query.field = common_field
         # remove search field from children
         for child in query.children:
             child.field = None
@@ -93,25 +94,24 @@ class QueryTranslator:
     def _remove_redundant_terms(cls, query: Query) -> None:
         """Remove redundant terms from the query (same term, same field)."""
 
-        if query.is_term():
-            return
+        for node in query.walk():
+            if node.is_term():
+                continue
 
-        # Check for redundant terms in children
-        seen_terms = set()
-        for child in query.children:
-            if child.is_term():
-                if not child.field:
-                    continue
-                term_key = (child.field.value, child.value)
-                if term_key in seen_terms:
-                    query.children.remove(child)
-                    print(
-                        f"Removed redundant term: {child.value}"
-                        f"[{child.field.value}]"
-                    )
-                else:
-                    seen_terms.add(term_key)
-
-        # Recursively check children
-        for child in query.children:
-            cls._remove_redundant_terms(child)
+            # Check for redundant terms in children
+            seen_terms = set()
+            redundant_terms = []
+            for child in node.children:
+                if child.is_term():
+                    if not child.field:
+                        continue
+                    term_key = (child.field.value, child.value)
+                    if term_key in seen_terms:
+                        redundant_terms.append(child)
+                        print(
+                            f"Removed redundant term: {child.value}"
+                            f"[{child.field.value}]"
+                        )
+                    else:
+                        seen_terms.add(term_key)
+            node.remove_children(redundant_terms)
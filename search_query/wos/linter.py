@@ -232,43 +232,44 @@ class WOSQueryStringLinter(QueryStringLinter):
     def check_year_format(self, query: Query) -> None:
         """Check for the correct format of year."""
 
-        if query.is_term():
-            if not query.field:
-                return
-            if not YEAR_PUBLISHED_FIELD_REGEX.match(query.field.value):
-                return
-            if any(char in query.value for char in ["*", "?", "$"]):
-                self.add_message(
-                    QueryErrorCode.WILDCARD_IN_YEAR,
-                    positions=[query.position] if query.position else [],
-                    fatal=True,
-                )
-                return
+        for node in query.walk():
+            if node.is_term():
+                self._check_year_format_in_term(node)
 
-            if not self.YEAR_VALUE_REGEX.match(query.value):
-                self.add_message(
-                    QueryErrorCode.YEAR_FORMAT_INVALID,
-                    positions=[query.position] if query.position else [],
-                    fatal=True,
-                )
-                return
+    def _check_year_format_in_term(self, query: Query) -> None:
+        if not query.field:
+            return
+        if not YEAR_PUBLISHED_FIELD_REGEX.match(query.field.value):
+            return
+        if any(char in query.value for char in ["*", "?", "$"]):
+            self.add_message(
+                QueryErrorCode.WILDCARD_IN_YEAR,
+                positions=[query.position] if query.position else [],
+                fatal=True,
+            )
+            return
 
-            # # Check if the yearspan is not more than 5 years
-            # if len(query.value) > 4:
-            #     if int(query.value[5:9]) - int(query.value[0:4]) > 5:
-            #         # Change the year span to five years
-            #         query.value = (
-            #             str(int(query.value[5:9]) - 5) + "-" + query.value[5:9]
-            #         )
+        if not self.YEAR_VALUE_REGEX.match(query.value):
+            self.add_message(
+                QueryErrorCode.YEAR_FORMAT_INVALID,
+                positions=[query.position] if query.position else [],
+                fatal=True,
+            )
+            return
 
-            #         self.add_message(
-            #             QueryErrorCode.YEAR_SPAN_VIOLATION,
-            #             positions=[query.position] if query.position else [],
-            #             fatal=True,
-            #         )
+        # # Check if the yearspan is not more than 5 years
+        # if len(query.value) > 4:
+        #     if int(query.value[5:9]) - int(query.value[0:4]) > 5:
+        #         # Change the year span to five years
+        #         query.value = (
+        #             str(int(query.value[5:9]) - 5) + "-" + query.value[5:9]
+        #         )
 
-        for child in query.children:
-            self.check_year_format(child)
+        #         self.add_message(
+        #             QueryErrorCode.YEAR_SPAN_VIOLATION,
+        #             positions=[query.position] if query.position else [],
+        #             fatal=True,
+        #         )
 
     def check_invalid_token_sequences(self) -> None:
         """Check for the correct order of tokens in the query."""
@@ -367,58 +368,60 @@ class WOSQueryStringLinter(QueryStringLinter):
     def check_unsupported_wildcards(self, query: Query) -> None:
         """Check for unsupported characters in the search string."""
 
-        if query.is_term():
-            # Web of Science does not support "!"
-            for match in re.finditer(r"\!+", query.value):
-                position = (-1, -1)
-                if query.position:
-                    position = (
-                        query.position[0] + match.start(),
-                        query.position[0] + match.end(),
-                    )
-                self.add_message(
-                    QueryErrorCode.WOS_WILDCARD_UNSUPPORTED,
-                    positions=[position],
-                    details="The '!' character is not supported in WOS search strings.",
-                    fatal=True,
+        for node in query.walk():
+            if node.is_term():
+                self._check_unsupported_wildcards_in_term(node)
+
+    def _check_unsupported_wildcards_in_term(self, query: Query) -> None:
+        # Web of Science does not support "!"
+        for match in re.finditer(r"\!+", query.value):
+            position = (-1, -1)
+            if query.position:
+                position = (
+                    query.position[0] + match.start(),
+                    query.position[0] + match.end(),
                 )
-
-        for child in query.children:
-            self.check_unsupported_wildcards(child)
+            self.add_message(
+                QueryErrorCode.WOS_WILDCARD_UNSUPPORTED,
+                positions=[position],
+                details="The '!' character is not supported in WOS search strings.",
+                fatal=True,
+            )
 
     def check_wildcards(self, query: Query) -> None:
         """Check for the usage of wildcards in the search string."""
 
-        if query.is_term():
-            value = query.value.replace('"', "")
-
-            # Implement constrains from Web of Science for Wildcards
-            for index, charachter in enumerate(value):
-                if charachter in self.WILDCARD_CHARS:
-                    # Check if wildcard is left or right-handed or standalone
-                    if index == 0 and len(value) == 1:
-                        self.add_message(
-                            QueryErrorCode.WILDCARD_STANDALONE,
-                            positions=[query.position] if query.position else [],
-                            details=(
-                                f"Wildcard '{charachter}' "
-                                "cannot be used as a standalone character."
-                            ),
-                            fatal=True,
-                        )
-
-                    elif len(value) == index + 1:
-                        # Right-hand wildcard
-                        self.check_unsupported_right_hand_wildcards(
-                            query=query, index=index
-                        )
-
-                    elif index == 0 and len(value) > 1:
-                        # Left-hand wildcard
-                        self.check_format_left_hand_wildcards(query)
-
-        for child in query.children:
-            self.check_wildcards(child)
+        for node in query.walk():
+            if node.is_term():
+                self._check_wildcards_in_term(node)
+
+    def _check_wildcards_in_term(self, query: Query) -> None:
+        value = query.value.replace('"', "")
+
+        # Implement constrains from Web of Science for Wildcards
+        for index, charachter in enumerate(value):
+            if charachter in self.WILDCARD_CHARS:
+                # Check if wildcard is left or right-handed or standalone
+                if index == 0 and len(value) == 1:
+                    self.add_message(
+                        QueryErrorCode.WILDCARD_STANDALONE,
+                        positions=[query.position] if query.position else [],
+                        details=(
+                            f"Wildcard '{charachter}' "
+                            "cannot be used as a standalone character."
+                        ),
+                        fatal=True,
+                    )
+
+                elif len(value) == index + 1:
+                    # Right-hand wildcard
+                    self.check_unsupported_right_hand_wildcards(
+                        query=query, index=index
+                    )
+
+                elif index == 0 and len(value) > 1:
+                    # Left-hand wildcard
+                    self.check_format_left_hand_wildcards(query)
 
     def check_unsupported_right_hand_wildcards(self, query: Query, index: int) -> None:
         """Check for unsupported right-hand wildcards in the search string."""
@@ -454,25 +457,23 @@ class WOSQueryStringLinter(QueryStringLinter):
     def check_issn_isbn_format(self, query: Query) -> None:
         """Check for the correct format of ISSN and ISBN."""
 
-        if query.is_term():
-            if not query.field:
-                return
-
-            if query.field.value == "IS=":
-                if not self.ISSN_VALUE_REGEX.match(
-                    query.value
-                ) and not self.ISBN_VALUE_REGEX.match(query.value):
-                    self.add_message(
-                        QueryErrorCode.ISBN_FORMAT_INVALID,
-                        positions=[query.position] if query.position else [],
-                        fatal=True,
-                    )
+        for node in query.walk():
+            if node.is_term():
+                self._check_issn_isbn_format_in_term(node)
 
+    def _check_issn_isbn_format_in_term(self, query: Query) -> None:
+        if not query.field:
             return
 
-        # Recursively call the function on the child queries
-        for child in query.children:
-            self.check_issn_isbn_format(child)
+        if query.field.value == "IS=":
+            if not self.ISSN_VALUE_REGEX.match(
+                query.value
+            ) and not self.ISBN_VALUE_REGEX.match(query.value):
+                self.add_message(
+                    QueryErrorCode.ISBN_FORMAT_INVALID,
+                    positions=[query.position] if query.position else [],
+                    fatal=True,
+                )
 
     def validate_field_general(self, field: str) -> None:
         if not field:
@@ -489,128 +490,118 @@ class WOSQueryStringLinter(QueryStringLinter):
     def check_deprecated_field_tags(self, query: Query) -> None:
         """Check for deprecated field tags."""
 
-        if query.is_term():
-            if not query.field:
-                return
-
-            # use of the following field tags in the search interface prints
-            # Search Error: Invalid field tag.
-            if query.field.value in [
-                "FN=",
-                "VR=",
-                "PT=",
-                "AF=",
-                "BA=",
-                "BF=",
-                "CA=",
-                "BE=",
-                "BS=",
-                "CL=",
-                "SP=",
-                "HO=",
-                "DE=",
-                "ID=",
-                "C1=",
-                "RP=",
-                "EM=",
-                "RI=",
-                "OI=",
-                "FU=",
-                "CR=",
-                "NR=",
-                "TC=",
-                "Z9=",
-                "U1=",
-                "U2=",
-                "PI=",
-                "PU=",
-                "SN=",
-                "EI=",
-                "BN=",
-                "J9=",
-                "JI=",
-                "PD=",
-                "SI=",
-                "PN=",
-                "MA=",
-                "BP=",
-                "EP=",
-                "AR=",
-            ]:
-                self.add_message(
-                    QueryErrorCode.LINT_DEPRECATED_SYNTAX,
-                    positions=[query.field.position] if query.field.position else [],
-                    fatal=True,
-                    details=f"The '{query.field.value}' field is deprecated.",
-                )
-            elif query.field.value == "DI=":
-                self.add_message(
-                    QueryErrorCode.LINT_DEPRECATED_SYNTAX,
-                    positions=[query.field.position] if query.field.position else [],
-                    fatal=True,
-                    details="The 'DI=' field is deprecated. Use 'DO=' instead. "
-                    + "Use search-query upgrade XY to upgrade the search query",
-                )
-            elif query.field.value in [
-                "D2=",
-                "EY=",
-                "P2=",
-                "SC=",
-                "GA=",
-                "HP=",
-                "HC=",
-                "DA=",
-                "ER=",
-                "EF=",
-            ]:
-                self.add_message(
-                    QueryErrorCode.LINT_DEPRECATED_SYNTAX,
-                    positions=[query.field.position] if query.field.position else [],
-                    fatal=True,
-                    details=f"The '{query.field.value}' field is deprecated.",
-                )
+        for node in query.walk():
+            if node.is_term():
+                self._check_deprecated_field_tags_in_term(node)
 
+    def _check_deprecated_field_tags_in_term(self, query: Query) -> None:
+        if not query.field:
             return
 
-        # Recursively call the function on the child queries
-        for child in query.children:
-            self.check_deprecated_field_tags(child)
+        # use of the following field tags in the search interface prints
+        # Search Error: Invalid field tag.
+        if query.field.value in [
+            "FN=",
+            "VR=",
+            "PT=",
+            "AF=",
+            "BA=",
+            "BF=",
+            "CA=",
+            "BE=",
+            "BS=",
+            "CL=",
+            "SP=",
+            "HO=",
+            "DE=",
+            "ID=",
+            "C1=",
+            "RP=",
+            "EM=",
+            "RI=",
+            "OI=",
+            "FU=",
+            "CR=",
+            "NR=",
+            "TC=",
+            "Z9=",
+            "U1=",
+            "U2=",
+            "PI=",
+            "PU=",
+            "SN=",
+            "EI=",
+            "BN=",
+            "J9=",
+            "JI=",
+            "PD=",
+            "SI=",
+            "PN=",
+            "MA=",
+            "BP=",
+            "EP=",
+            "AR=",
+        ]:
+            self.add_message(
+                QueryErrorCode.LINT_DEPRECATED_SYNTAX,
+                positions=[query.field_position] if query.field_position else [],
+                fatal=True,
+                details=f"The '{query.field.value}' field is deprecated.",
+            )
+        elif query.field.value == "DI=":
+            self.add_message(
+                QueryErrorCode.LINT_DEPRECATED_SYNTAX,
+                positions=[query.field_position] if query.field_position else [],
+                fatal=True,
+                details="The 'DI=' field is deprecated. Use 'DO=' instead. "
+                + "Use search-query upgrade XY to upgrade the search query",
+            )
+        elif query.field.value in [
+            "D2=",
+            "EY=",
+            "P2=",
+            "SC=",
+            "GA=",
+            "HP=",
+            "HC=",
+            "DA=",
+            "ER=",
+            "EF=",
+        ]:
+            self.add_message(
+                QueryErrorCode.LINT_DEPRECATED_SYNTAX,
+                positions=[query.field_position] if query.field_position else [],
+                fatal=True,
+                details=f"The '{query.field.value}' field is deprecated.",
+            )
 
     def check_doi_format(self, query: Query) -> None:
         """Check for the correct format of DOI."""
 
-        if query.is_term():
-            if not query.field:
-                return
+        for node in query.walk():
+            if node.is_term():
+                self._check_doi_format_in_term(node)
 
-            if query.field.value == "DO=":
-                if not self.DOI_VALUE_REGEX.match(query.value):
-                    self.add_message(
-                        QueryErrorCode.DOI_FORMAT_INVALID,
-                        positions=[query.position] if query.position else [],
-                        fatal=True,
-                    )
+    def _check_doi_format_in_term(self, query: Query) -> None:
+        if not query.field:
             return
 
-        # Recursively call the function on the child queries
-        for child in query.children:
-            self.check_doi_format(child)
+        if query.field.value == "DO=":
+            if not self.DOI_VALUE_REGEX.match(query.value):
+                self.add_message(
+                    QueryErrorCode.DOI_FORMAT_INVALID,
+                    positions=[query.position] if query.position else [],
+                    fatal=True,
+                )
 
     def get_nr_terms_all(self, query: Query) -> int:
         """Get the number of terms in the query."""
 
-        if query.is_term():
-            if query.field and query.field.value == "ALL=":
-                return 1
-
-            return 0
-
-        # Count the number of terms in the query
-        nr_terms = 0
-        for child in query.children:
-            nr_terms += self.get_nr_terms_all(child)
-
-        return nr_terms
+        return sum(
+            1
+            for node in query.walk()
+            if node.is_term() and node.field and node.field.value == "ALL="
+        )
 
     def check_nr_terms(self, query: Query) -> None:
         """Check the number of search terms in the query."""
@@ -633,11 +624,10 @@ class WOSQueryStringLinter(QueryStringLinter):
 
     def _check_invalid_near_query(self, query: Query) -> None:
         """Check if NEAR operator is applied to an AND query."""
-        if not query.operator:
-            return
-
-        if query.value == "NEAR":
-            for child in query.children:
+        for node in query.walk():
+            if not (node.operator and node.value == "NEAR"):
+                continue
+            for child in node.children:
                 if child.operator and child.value == "AND":
                     self.add_message(
                         QueryErrorCode.WOS_INVALID_NEAR_QUERY,
@@ -645,9 +635,6 @@ class WOSQueryStringLinter(QueryStringLinter):
                         fatal=True,
                     )
 
-        for child in query.children:
-            self._check_invalid_near_query(child)
-
     def _get_generic_field_set(self, value: str) -> set:
         return syntax_str_to_generic_field_set(value)
 
@@ -678,8 +665,9 @@ class WOSQueryStringLinter(QueryStringLinter):
         self.check_nr_terms(term_field_query)
         self.check_issn_isbn_format(term_field_query)
         self.check_doi_format(term_field_query)
-        self._check_non_global_date_filter(term_field_query)
-        self._check_non_global_journal_filter(term_field_query)
+        # Note: filters in nested AND/NOT subqueries are not reported
+        self._check_non_global_date_filter(term_field_query, check_nested=False)
+        self._check_non_global_journal_filter(term_field_query, check_nested=False)
         self._check_for_wildcard_usage(term_field_query)
         self.check_deprecated_field_tags(term_field_query)
 
@@ -37,18 +37,21 @@ class WOSParser(QueryStringParser):
     # 3) fallback term:
     # exclude structural WOS characters (space, parens, equals, quotation marks).
     PERMISSIVE_TERM_REGEX = re.compile(r'[^\s()"]+')
+    TERM_REGEX = PERMISSIVE_TERM_REGEX
 
-    # build the combined pattern:
+    # build the combined pattern (one named group per token type):
     # fields → logic/proximity → parens → quotes → term
     pattern = re.compile(
         "|".join(
-            [
-                FIELD_REGEX.pattern,
-                LOGIC_OPERATOR_REGEX.pattern,
-                PROXIMITY_OPERATOR_REGEX.pattern,
-                PARENTHESIS_REGEX.pattern,
-                QUOTATION_MARK_REGEX.pattern,
-                PERMISSIVE_TERM_REGEX.pattern,
+            f"(?P<{token_type.name}>{token_pattern})"
+            for token_type, token_pattern in [
+                (TokenTypes.FIELD, FIELD_REGEX.pattern),
+                (TokenTypes.LOGIC_OPERATOR, LOGIC_OPERATOR_REGEX.pattern),
+                (TokenTypes.PROXIMITY_OPERATOR, PROXIMITY_OPERATOR_REGEX.pattern),
+                (TokenTypes.PARENTHESIS_OPEN, r"\("),
+                (TokenTypes.PARENTHESIS_CLOSED, r"\)"),
+                (TokenTypes.QUOTATION_MARK, QUOTATION_MARK_REGEX.pattern),
+                (TokenTypes.TERM, PERMISSIVE_TERM_REGEX.pattern),
             ]
         ),
         flags=re.IGNORECASE,
@@ -85,28 +88,22 @@ class WOSParser(QueryStringParser):
         """Tokenize the query_str."""
 
         self.tokens = []
+        previous_end = -1
         for match in self.pattern.finditer(self.query_str):
             value = match.group(0)
             position = match.span()
 
-            # Determine token type
-            if self.PARENTHESIS_REGEX.fullmatch(value):
-                if value == "(":
-                    token_type = TokenTypes.PARENTHESIS_OPEN
-                else:
-                    token_type = TokenTypes.PARENTHESIS_CLOSED
-            elif self.LOGIC_OPERATOR_REGEX.fullmatch(value):
-                token_type = TokenTypes.LOGIC_OPERATOR
-            elif self.PROXIMITY_OPERATOR_REGEX.fullmatch(value):
-                token_type = TokenTypes.PROXIMITY_OPERATOR
-            elif self.FIELD_REGEX.fullmatch(value):
-                token_type = TokenTypes.FIELD
-            elif self.QUOTATION_MARK_REGEX.fullmatch(value):
-                token_type = TokenTypes.QUOTATION_MARK
-            elif self.PERMISSIVE_TERM_REGEX.fullmatch(value):
-                token_type = TokenTypes.TERM
-            else:  # pragma: no cover
-                token_type = TokenTypes.UNKNOWN
+            # Determine token type (named group of the pattern)
+            token_type = TokenTypes[match.lastgroup]  # type: ignore
+            if (
+                token_type == TokenTypes.TERM
+                and position[0] == previous_end
+                and self._is_word_character(self.query_str[position[0] - 1])
+            ):
+                # Note: terms attached to a previous word (no word boundary)
+                # are classified by their value
+                token_type = self._get_token_type(value)
+            previous_end = position[1]
 
             self.tokens.append(Token(value=value, type=token_type, position=position))
 
@@ -118,30 +115,40 @@ class WOSParser(QueryStringParser):
     def parse_query_tree(self, tokens: list[Token]) -> Query:
         """Top-down predictive parser for query tree."""
 
-        if self._is_compound_query(tokens):
-            return self._parse_compound_query(tokens)
-        if self._is_nested_query(tokens):
-            return self._parse_nested_query(tokens)
-        if self._is_term_query(tokens):
-            return self._parse_term(tokens)
+        # Note: subqueries are parsed as index ranges of the (shared) tokens,
+        # and the query tree is validated once (not for every node)
+        self._index_tokens(tokens)
+        with Query.deferred_validation():
+            return self._parse_range(tokens, 0, len(tokens))
 
-        raise ValueError(f"Unrecognized query structure: {tokens}")
+    def _parse_range(self, tokens: list[Token], start: int, end: int) -> Query:
+        if self._is_compound_query(tokens, start, end):
+            return self._parse_compound_query(tokens, start, end)
+        if self._is_nested_query(tokens, start, end):
+            return self._parse_nested_query(tokens, start, end)
+        if self._is_term_query(tokens, start, end):
+            return self._parse_term(tokens, start, end)
 
-    def _is_term_query(self, tokens: list[Token]) -> bool:
-        return bool(tokens and len(tokens) <= 2 and tokens[-1].type == TokenTypes.TERM)
+        raise ValueError(f"Unrecognized query structure: {tokens[start:end]}")
 
-    def _is_compound_query(self, tokens: list[Token]) -> bool:
-        return bool(self._get_operator_indices(tokens))
+    def _is_term_query(self, tokens: list[Token], start: int, end: int) -> bool:
+        return 0 < end - start <= 2 and tokens[end - 1].type == TokenTypes.TERM
 
-    def _is_nested_query(self, tokens: list[Token]) -> bool:
+    def _is_compound_query(self, tokens: list[Token], start: int, end: int) -> bool:
+        _, lo, hi = self._get_operators_at_depth(start, end, self._depths[start])
+        return lo < hi
+
+    def _is_nested_query(self, tokens: list[Token], start: int, end: int) -> bool:
+        if start >= end:
+            return False
         return (
-            tokens[0].type == TokenTypes.PARENTHESIS_OPEN
+            tokens[start].type == TokenTypes.PARENTHESIS_OPEN
             or (
-                tokens[0].type == TokenTypes.FIELD
-                and len(tokens) > 1
-                and tokens[1].type == TokenTypes.PARENTHESIS_OPEN
+                tokens[start].type == TokenTypes.FIELD
+                and end - start > 1
+                and tokens[start + 1].type == TokenTypes.PARENTHESIS_OPEN
             )
-        ) and tokens[-1].type == TokenTypes.PARENTHESIS_CLOSED
+        ) and tokens[end - 1].type == TokenTypes.PARENTHESIS_CLOSED
 
     def _get_operator_type(self, token: Token) -> str:
         val = token.value.upper()
@@ -155,35 +162,33 @@ class WOSParser(QueryStringParser):
             return "NEAR"
         raise ValueError(f"Unrecognized operator: {token.value}")
 
-    def _get_operator_indices(self, tokens: list[Token]) -> list[int]:
+    def _get_operator_indices(
+        self, tokens: list[Token], start: int, end: int
+    ) -> list[int]:
         """Get indices of top-level operators with the lowest precedence value."""
+        operators, lo, hi = self._get_operators_at_depth(
+            start, end, self._depths[start]
+        )
+        if lo == hi:
+            return []
+
+        # The operators of the same type as the first operator, starting
+        # at the last operator with a lower precedence (if any)
+        first_op = self._get_operator_type(tokens[operators[lo]])
+        first_precedence = self.linter.get_precedence(first_op)
         indices: list[int] = []
-        depth = 0
-        prev_op = None
-
-        for i, token in enumerate(tokens):
-            if token.type == TokenTypes.PARENTHESIS_OPEN:
-                depth += 1
-            elif token.type == TokenTypes.PARENTHESIS_CLOSED:
-                depth -= 1
-            elif depth == 0 and token.type in [
-                TokenTypes.LOGIC_OPERATOR,
-                TokenTypes.PROXIMITY_OPERATOR,
-            ]:
-                op = self._get_operator_type(token)
-                if prev_op is None:
-                    prev_op = op
-                    indices.append(i)
-                elif op == prev_op:
-                    indices.append(i)
-                elif self.linter.get_precedence(op) < self.linter.get_precedence(
-                    prev_op
-                ):
-                    indices = [i]
+        for i in reversed(range(lo, hi)):
+            op = self._get_operator_type(tokens[operators[i]])
+            if op == first_op:
+                indices.append(operators[i])
+            elif self.linter.get_precedence(op) < first_precedence:
+                indices.append(operators[i])
+                break
+        indices.reverse()
         return indices
 
-    def _parse_compound_query(self, tokens: list[Token]) -> Query:
-        op_indices = self._get_operator_indices(tokens)
+    def _parse_compound_query(self, tokens: list[Token], start: int, end: int) -> Query:
+        op_indices = self._get_operator_indices(tokens, start, end)
         if not op_indices:
             raise ValueError("No operator found for compound query.")
 
@@ -196,54 +201,53 @@ class WOSParser(QueryStringParser):
 
         children = []
 
-        start = 0
+        child_start = start
         for idx in op_indices:
-            sub_tokens = tokens[start:idx]
-            children.append(self.parse_query_tree(sub_tokens))
-            start = idx + 1
+            children.append(self._parse_range(tokens, child_start, idx))
+            child_start = idx + 1
 
-        children.append(self.parse_query_tree(tokens[start:]))
+        children.append(self._parse_range(tokens, child_start, end))
 
         return Query.create(
             value=op_type,
             children=children,  # type: ignore
-            position=(tokens[0].position[0], tokens[-1].position[1]),
+            position=(tokens[start].position[0], tokens[end - 1].position[1]),
             platform="deactivated",
             distance=distance,
         )
 
-    def _parse_nested_query(self, tokens: list[Token]) -> Query:
-        if tokens[0].type == TokenTypes.PARENTHESIS_OPEN:
-            nested_query = self.parse_query_tree(tokens[1:-1])
+    def _parse_nested_query(self, tokens: list[Token], start: int, end: int) -> Query:
+        if tokens[start].type == TokenTypes.PARENTHESIS_OPEN:
+            nested_query = self._parse_range(tokens, start + 1, end - 1)
         elif (
-            tokens[0].type == TokenTypes.FIELD
-            and len(tokens) > 1
-            and tokens[1].type == TokenTypes.PARENTHESIS_OPEN
+            tokens[start].type == TokenTypes.FIELD
+            and end - start > 1
+            and tokens[start + 1].type == TokenTypes.PARENTHESIS_OPEN
         ):
-            nested_query = self.parse_query_tree(tokens[2:-1])
+            nested_query = self._parse_range(tokens, start + 2, end - 1)
             nested_query.field = SearchField(
-                value=tokens[0].value, position=tokens[0].position
+                value=tokens[start].value, position=tokens[start].position
             )
         else:
             raise ValueError("Invalid nested query structure.")
 
         return nested_query
 
-    def _parse_term(self, tokens: list[Token]) -> Query:
+    def _parse_term(self, tokens: list[Token], start: int, end: int) -> Query:
         # term or field + term
-        if len(tokens) == 1:
+        if end - start == 1:
             return Term(
-                value=tokens[0].value,
-                position=tokens[0].position,
+                value=tokens[start].value,
+                position=tokens[start].position,
                 platform="deactivated",
             )
-        assert len(tokens) == 2
+        assert end - start == 2
         return Term(
-            value=tokens[1].value,
-            position=tokens[1].position,
+            value=tokens[start + 1].value,
+            position=tokens[start + 1].position,
             field=SearchField(
-                value=tokens[0].value,
-                position=tokens[0].position or (-1, -1),
+                value=tokens[start].value,
+                position=tokens[start].position or (-1, -1),
             ),
             platform="deactivated",
         )
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import re
+import typing
 
 from search_query.constants import Fields
 from search_query.constants import PLATFORM
@@ -23,23 +24,42 @@ class WOSTranslator(QueryTranslator):
     def translate_fields_to_generic(cls, query: Query) -> None:
         """Translate search fields."""
 
+        replacement = cls._translate_field(query)
+        if replacement is not None:
+            parent = query.get_parent()
+            if parent:
+                parent.splice_children({query: replacement})
+            elif replacement:
+                # Note: raises an error (the root cannot be replaced)
+                query.replace(replacement[0])
+            return
+
+        # Note: the children of each node are replaced in one pass
+        for node in query.walk():
+            replacements = {}
+            for child in node.children:
+                replacement = cls._translate_field(child)
+                if replacement is not None:
+                    replacements[child] = replacement
+            node.splice_children(replacements)
+
+    @classmethod
+    def _translate_field(cls, query: Query) -> typing.Optional[typing.List[Query]]:
+        """Translate the search field of a query node.
+
+        Returns the nodes replacing the query node (None: keep the node).
+        """
         if query.field and query.field.value not in Fields.all():
             generic_fields = syntax_str_to_generic_field_set(query.field.value)
             if len(generic_fields) == 1:
-                query.field.value = generic_fields.pop()
+                query.field = SearchField(generic_fields.pop())
             else:
-                cls._expand_combined_fields(query, generic_fields)
-
-        if query.children:
-            for child in query.children:
-                cls.translate_fields_to_generic(child)
-
-        # at this point it may be necessary to split (OR)
-        # queries for combined search fields
-        # see _expand_combined_fields() in pubmed
+                # Split queries for combined search fields
+                return [cls._expand_combined_fields(query, generic_fields)]
+        return None
 
     @classmethod
-    def _expand_combined_fields(cls, query: Query, fields: set) -> None:
+    def _expand_combined_fields(cls, query: Query, fields: set) -> Query:
         """Expand queries with combined search fields into an OR query"""
         query_children = []
 
@@ -52,31 +72,27 @@ class WOSTranslator(QueryTranslator):
                 )
             )
 
-        query.replace(
-            OrQuery(
-                children=query_children,  # type: ignore
-            )
+        return OrQuery(
+            children=query_children,  # type: ignore
         )
 
     @classmethod
     def combine_equal_fields(cls, query: Query) -> None:
         """Combine queries with the same search field into an OR query."""
 
-        if query.is_term():
-            return
-
-        # recursive call
-        for child in query.children:
-            cls.combine_equal_fields(child)
+        # Note: post-order, i.e., the children are processed first
+        for node in query.walk(post_order=True):
+            if node.is_term():
+                continue
 
-        # check if all children have the same search field
-        child_fields = [child.field.value for child in query.children if child.field]
-        if len(set(child_fields)) == 1:
-            # all children have the same search field
-            # move search field to operator
-            query.field = SearchField(value=child_fields[0])
-            for child in query.children:
-                child.field = None
+            # check if all children have the same search field
+            child_fields = {child.field for child in node.children if child.field}
+            if len(child_fields) == 1:
+                # all children have the same search field
+                # move search field to operator
+                node.field = child_fields.pop()
+                for child in node.children:
+                    child.field = None
 
     @classmethod
     def to_generic_syntax(cls, query: Query) -> Query:
@@ -92,44 +108,42 @@ class WOSTranslator(QueryTranslator):
     def _remove_contradicting_fields(cls, query: Query) -> None:
         """remove search fields that contradict the operator"""
 
-        if query.is_term():
-            return
-
-        for child in query.children:
-            # recursive call
-            cls._remove_contradicting_fields(child)
+        # Note: post-order, i.e., the children are processed first
+        for node in query.walk(post_order=True):
+            if node.is_term():
+                continue
 
-        child_fields = [child.field.value for child in query.children if child.field]
-        if len(child_fields) > 1:
-            # all children have the same search field
-            # move search field to operator
-            query.field = None
+            child_fields = [child.field.value for child in node.children if child.field]
+            if len(child_fields) > 1:
+                # all children have the same search field
+                # move search field to operator
+                node.field = None
 
     @classmethod
     def _translate_fields(cls, query: Query) -> None:
-        if query.field:
-            query.field.value = generic_field_to_syntax_field(query.field.value)
-
-        for child in query.children:
-            cls._translate_fields(child)
+        for node in query.walk():
+            if node.field:
+                node.field = SearchField(
+                    generic_field_to_syntax_field(node.field.value)
+                )
 
     @classmethod
     def _format_year(cls, query: Query) -> None:
         """Format year search fields to WOS syntax."""
 
-        if query.is_term() and query.field and query.field.value == "PY=":
-            if re.fullmatch(r"^\d{4}$", query.value):
+        for node in query.walk():
+            if not (node.is_term() and node.field and node.field.value == "PY="):
+                continue
+
+            if re.fullmatch(r"^\d{4}$", node.value):
                 pass
 
-            match = re.search(r"\d{4}", query.value)
+            match = re.search(r"\d{4}", node.value)
             if match:
-                query.value = match.group(0)
-                return
-
-            raise ValueError(f"Invalid year format: {query.value}")
+                node.value = match.group(0)
+                continue
 
-        for child in query.children:
-            cls._format_year(child)
+            raise ValueError(f"Invalid year format: {node.value}")
 
     @classmethod
     def to_specific_syntax(cls, query: Query) -> Query:
@@ -7,6 +7,7 @@ import warnings
 
 from search_query.constants import Fields
 from search_query.query import Query
+from search_query.query import SearchField
 from search_query.wos.translator import WOSTranslator
 
 if typing.TYPE_CHECKING:  # pragma: no cover
@@ -40,35 +41,30 @@ class WOSTranslator_v0(WOSTranslator):
     }
 
     @classmethod
-    def translate_fields_to_generic(cls, query: Query) -> None:
+    def _translate_field(cls, query: Query) -> typing.Optional[typing.List[Query]]:
         """Translate deprecated 0 field tags to generic field names."""
 
-        if query.field:
-            field_val = query.field.value
+        if not query.field:
+            return None
 
-            if field_val in cls.DEPRECATED_FIELD_MAP:
-                query.field.value = cls.DEPRECATED_FIELD_MAP[field_val]
-            else:
-                # Try default translation first; if it fails, emit a warning
-                # and drop the term as it cannot be represented in newer
-                # versions.
-                try:
-                    super().translate_fields_to_generic(query)
-                except ValueError:
-                    warnings.warn(
-                        f"Field '{field_val}' is deprecated and cannot be "
-                        "translated; the term will be ignored.",
-                        UserWarning,
-                        stacklevel=2,
-                    )
-                    parent = query.get_parent()
-                    if parent:
-                        parent.children.remove(query)
+        field_val = query.field.value
+        if field_val in cls.DEPRECATED_FIELD_MAP:
+            query.field = SearchField(cls.DEPRECATED_FIELD_MAP[field_val])
+            return None
 
-            return
-
-        for child in list(query.children):
-            cls.translate_fields_to_generic(child)
+        # Try default translation first; if it fails, emit a warning
+        # and drop the term as it cannot be represented in newer
+        # versions.
+        try:
+            return super()._translate_field(query)
+        except ValueError:
+            warnings.warn(
+                f"Field '{field_val}' is deprecated and cannot be "
+                "translated; the term will be ignored.",
+                UserWarning,
+                stacklevel=2,
+            )
+            return []
 
 
 def register(registry: Registry, *, platform: str, version: str) -> None:
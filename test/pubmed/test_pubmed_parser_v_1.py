@@ -1136,6 +1136,20 @@ def test_parser(query_str: str, field_general: str, expected_parsed: str) -> Non
     )
 
 
+def test_parser_operators_left_to_right() -> None:
+    """Different operators are evaluated from left to right."""
+    query_str = "a[ti] OR b[ti] AND c[ti] AND d[ti] OR e[ti]"
+    parser = PubMedParser_v1(query_str, silent=True)
+    query = parser.parse()
+
+    assert (
+        query.to_generic_string()
+        == "OR[AND[OR[a[[ti]], b[[ti]]], c[[ti]], d[[ti]]], e[[ti]]]"
+    )
+    assert query.children[0].position == (0, 34)
+    assert query.children[0].children[0].position == (0, 14)
+
+
 def test_list_parser_case_1() -> None:
     query_list = """
 1. (Peer leader*[Title/Abstract] OR Shared leader*[Title/Abstract] OR "Distributed leader*"[Title/Abstract])
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""Tests for the indexed record corpus"""
+import pytest
+
+from search_query.constants import Fields
+from search_query.corpus import RecordCorpus
+from search_query.evaluation import evaluate_many
+from search_query.evaluation import get_node_report
+from search_query.matcher import compile_query
+from search_query.query_and import AndQuery
+from search_query.query_near import NEARQuery
+from search_query.query_not import NotQuery
+from search_query.query_or import OrQuery
+
+# flake8: noqa: E501
+
+RECORDS = {
+    "r1": {
+        "title": "Microsourcing platforms for online labor",
+        "abstract": "Crowd work and digital labor markets.",
+        "colrev_status": "rev_included",
+    },
+    "r2": {
+        "title": "Online work and the future of microsourcing",
+        "abstract": "We study e-health platforms and crowd-work.",
+        "colrev_status": "rev_included",
+    },
+    "r3": {
+        "title": "Microsourcing case studies",
+        "abstract": "Offline labor in rural areas.",
+        "colrev_status": "rev_excluded",
+    },
+    "r4": {
+        "title": "Freelancing and online job platforms",
+        "colrev_status": "rev_prescreen_excluded",
+    },
+    "r5": {
+        "title": "Online labor markets",
+        "abstract": "Unlabelled record",
+        "colrev_status": "md_processed",
+    },
+}
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        AndQuery(
+            [
+                OrQuery(["microsourcing"], field=Fields.TITLE),
+                OrQuery(["online"], field=Fields.TITLE),
+            ],
+            field=Fields.TITLE,
+        ),
+        OrQuery(["platform*", '"crowd work"', "e-health"], field=Fields.ABSTRACT),
+        OrQuery(["labor", "sourc"], field=Fields.TITLE),
+        NotQuery(["online", "micro*ing"], field=Fields.TITLE),
+        OrQuery(["line lab", "work.", "labo#r", "lab?r"], field=Fields.ABSTRACT),
+        NEARQuery("NEAR", children=["online", "labor"], field=Fields.TITLE, distance=2),
+    ],
+)
+def test_corpus_evaluation_equals_record_evaluation(query) -> None:  # type: ignore
+    corpus = RecordCorpus(RECORDS)
+
+    assert query.evaluate(corpus) == query.evaluate(RECORDS)
+    assert {corpus.record_ids[index] for index in query.compile().select(corpus)} == {
+        record_id
+        for record_id, record in RECORDS.items()
+        if query.selects(record_dict=record)
+    }
+
+
+def test_corpus_index() -> None:
+    corpus = RecordCorpus(RECORDS)
+
+    assert len(corpus) == 5
+    assert {corpus.record_ids[i] for i in corpus.relevant_ids} == {"r1", "r2"}
+    assert {corpus.record_ids[i] for i in corpus.irrelevant_ids} == {"r3", "r4"}
+    assert corpus.records_with_token(Fields.TITLE, "online") == frozenset({0, 1, 3, 4})
+    assert corpus.records_with_fragment(Fields.TITLE, "sourc") == frozenset({0, 1, 2})
+
+
+def test_evaluate_many() -> None:
+    synonyms = OrQuery(["microsourcing", "crowd*"], field=Fields.TITLE)
+    queries = [
+        AndQuery([synonyms.copy(), OrQuery(["online", x], field=Fields.TITLE)])
+        for x in ["labor", "work", "platforms"]
+    ] + [synonyms]
+
+    results = evaluate_many(queries, RECORDS)
+    assert results == [query.evaluate(RECORDS) for query in queries]
+
+    # Identical subtrees are compiled into shared nodes
+    interned: dict = {}
+    compiled_1 = compile_query(queries[0], interned=interned)
+    compiled_2 = compile_query(queries[1], interned=interned)
+    assert compiled_1.root.children[0] is compiled_2.root.children[0]  # type: ignore
+    assert compile_query(synonyms, interned=interned).root is (
+        compiled_1.root.children[0]  # type: ignore
+    )
+    memo: dict = {}
+    corpus = RecordCorpus(RECORDS)
+    compiled_1.select(corpus, memo)
+    assert compiled_1.root.children[0] in memo  # type: ignore
+
+
+def test_get_node_report() -> None:
+    query = AndQuery(
+        [
+            OrQuery(["microsourcing", "crowd*"], field=Fields.TITLE),
+            NotQuery(["online", "job"], field=Fields.TITLE),
+        ],
+        field=Fields.TITLE,
+    )
+
+    report = get_node_report(query, RECORDS)
+    assert {
+        key: value for key, value in report.items() if key not in {"nodes", "terms"}
+    } == query.evaluate(RECORDS)
+
+    nodes = {node["path"]: node for node in report["nodes"]}
+    assert nodes[(0,)]["selected"] == 3
+    assert nodes[(0,)]["true_positives"] == 2
+    assert nodes[(0,)]["false_positives"] == 1
+    assert nodes[(1, 1)]["query"] == "job[title]"
+    assert nodes[(1, 1)]["selected"] == 1
+
+    terms = {term["path"]: term for term in report["terms"]}
+    assert list(terms) == [(0, 0), (0, 1), (1, 0), (1, 1)]
+    # The only term of the OR that selects the relevant records
+    assert terms[(0, 0)]["true_positives_lost"] == 2
+    assert terms[(0, 0)]["recall_loss"] == 1.0
+    assert terms[(0, 1)]["true_positives_lost"] == 0
+    # Removing the positive child of the NOT removes the NOT query
+    assert terms[(1, 0)]["true_positives_lost"] == 0
+    assert terms[(1, 1)]["true_positives_lost"] == 0
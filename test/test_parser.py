@@ -1,8 +1,15 @@
 #!/usr/bin/env python
 """Tests for search query translation"""
+import typing
+
 import pytest
 
+from search_query.constants import TokenTypes
+from search_query.ebscohost.parser import EBSCOParser
 from search_query.parser import get_platform
+from search_query.parser_base import QueryStringParser
+from search_query.pubmed.parser import PubmedParser
+from search_query.wos.parser import WOSParser
 
 
 # pylint: disable=line-too-long
@@ -18,3 +25,38 @@ def test_get_platform(query_setup: dict) -> None:
 
     with pytest.raises(ValueError):
         get_platform("unknown_platform")
+
+
+@pytest.mark.parametrize(
+    "parser_class, block",
+    [
+        (WOSParser, 'TS=(term{i} OR "word{i} phrase" OR x{i}*)'),
+        (PubmedParser, '(term{i}[tiab] OR "word{i} phrase"[mh] OR x{i}*[tiab])'),
+        (EBSCOParser, 'TI (term{i} OR "word{i} phrase" OR x{i}*)'),
+    ],
+    ids=["wos", "pubmed", "ebscohost"],
+)
+def test_tokenize_long_query(
+    parser_class: typing.Type[QueryStringParser],
+    block: str,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    nr_blocks = 2000
+    query_str = " AND ".join(block.format(i=i) for i in range(nr_blocks))
+    parser = parser_class(query_str, silent=True)  # type: ignore
+
+    # Token types are determined by the named groups of the (single) pattern,
+    # i.e., tokens are not classified by matching their value again
+    classified_by_value: typing.List[str] = []
+    monkeypatch.setattr(
+        parser_class,
+        "_get_token_type",
+        lambda self, value: classified_by_value.append(value),
+    )
+
+    parser.tokenize()
+
+    assert not classified_by_value
+    terms = [token for token in parser.tokens if token.type == TokenTypes.TERM]
+    assert len(terms) == 3 * nr_blocks
+    assert terms[-1].value == f"x{nr_blocks - 1}*"
@@ -1,10 +1,15 @@
 #!/usr/bin/env python
 """Tests for search query translation"""
+import gc
+import threading
+import typing
+
 import pytest
 
 from search_query.constants import Colors
 from search_query.constants import Fields
 from search_query.query import Query
+from search_query.query import QueryVisitor
 from search_query.query import SearchField
 from search_query.query_and import AndQuery
 from search_query.query_near import NEARQuery
@@ -12,6 +17,7 @@ from search_query.query_not import NotQuery
 from search_query.query_or import OrQuery
 from search_query.query_range import RangeQuery
 from search_query.query_term import Term
+from search_query.translator_base import QueryTranslator
 from search_query.utils import format_query_string_positions
 
 # pylint: disable=line-too-long
@@ -62,7 +68,7 @@ def test_selects(query_setup: dict) -> None:
     assert not query_complete.selects(record_dict=record_3)
 
     with pytest.raises(ValueError):
-        query_complete.children[0].children[0].field.value = "au"
+        query_complete.children[0].children[0].field = SearchField("au")
         print(query_complete.to_structured_string())
         query_complete.selects(record_dict=record_1)
 
@@ -131,6 +137,25 @@ def test_near_query_selects() -> None:
         broken_query.selects(record_dict=record_1)
 
 
+def test_near_query_selects_phrases_and_wildcards() -> None:
+    near_query = NEARQuery(
+        value="NEAR",
+        children=['"machine learning"', "health*"],
+        field=SearchField("abstract"),
+        distance=2,
+    )
+
+    record_1 = {"abstract": "Machine learning for healthcare."}
+    record_2 = {"abstract": "Health (and machine-learning methods)."}
+    record_3 = {"abstract": "Machine models for learning in health care."}
+    record_4 = {"abstract": "Machine learning in clinical settings, not in health."}
+
+    assert near_query.selects(record_dict=record_1)
+    assert near_query.selects(record_dict=record_2)
+    assert not near_query.selects(record_dict=record_3)
+    assert not near_query.selects(record_dict=record_4)
+
+
 def test_parent_and_root() -> None:
     """Test parent and root."""
 
@@ -211,6 +236,20 @@ def test_field() -> None:
     )
     assert ethics.field.value == Fields.ABSTRACT  # type: ignore
 
+    # Search fields are interned (while referenced)
+    assert SearchField(Fields.ABSTRACT) is ethics.field
+    assert SearchField(Fields.ABSTRACT, position=(0, 2)) is not ethics.field
+    interned = SearchField._INTERNED  # pylint: disable=protected-access
+    SearchField("unused-field")
+    gc.collect()
+    assert "unused-field" not in interned
+
+    # The position is stored at the query node (SearchField.position is deprecated)
+    term = Term("ethics", field=SearchField(Fields.TITLE, position=(7, 9)))
+    assert term.field_position == (7, 9)
+    with pytest.warns(DeprecationWarning, match="Query.field_position"):
+        assert term.field.position is None  # type: ignore
+
 
 def test_platform_setter() -> None:
     """Test platform setter."""
@@ -352,3 +391,307 @@ def test_children_setter() -> None:
 
     with pytest.raises(ValueError):
         range_query.children = ["new_child", "another_child", "third_child"]  # type: ignore
+
+
+def test_deferred_validation(query_setup: dict) -> None:
+    terms = [f"term{i}" for i in range(200)]
+    with Query.deferred_validation():
+        query = AndQuery(
+            [
+                OrQuery(terms, field=Fields.TITLE),
+                OrQuery(["digital", "online"], field=Fields.ABSTRACT),
+            ],
+        )
+    assert (
+        query.to_generic_string()
+        == AndQuery(
+            [
+                OrQuery(terms, field=Fields.TITLE),
+                OrQuery(["digital", "online"], field=Fields.ABSTRACT),
+            ],
+        ).to_generic_string()
+    )
+
+    # Trees are validated when the context exits
+    with pytest.raises(ValueError):
+        with Query.deferred_validation():
+            AndQuery(
+                ["invalid", query_setup["query_complete"], query_setup["query_ai"]],
+                field=SearchField(Fields.TITLE),
+            )
+
+    # Queries created by other threads are not deferred (and validated immediately)
+    errors: typing.List[Exception] = []
+
+    def create_invalid_query() -> None:
+        try:
+            AndQuery(
+                ["invalid", query_setup["query_complete"], query_setup["query_ai"]],
+                field=SearchField(Fields.TITLE),
+            )
+        except ValueError as exc:
+            errors.append(exc)
+
+    with Query.deferred_validation():
+        thread = threading.Thread(target=create_invalid_query)
+        thread.start()
+        thread.join()
+        assert len(errors) == 1
+
+
+def test_copy() -> None:
+    near_query = NEARQuery(
+        value="NEAR",
+        children=["online", "labor"],
+        field=SearchField(Fields.TITLE),
+        distance=2,
+    )
+    query = AndQuery([OrQuery(["ai", "ml"], field=Fields.TITLE), near_query])
+
+    copied = query.copy()
+    assert copied.to_generic_string() == query.to_generic_string()
+    assert copied.get_parent() is None
+    assert all(child.get_parent() is copied for child in copied.children)
+    assert copied.children[1].distance == 2  # type: ignore
+    # Search fields are shared (immutable) instances
+    assert copied.children[1].field is near_query.field
+    copied.children[0].children[0].field = SearchField("abstract")
+    assert query.children[0].children[0].field.value == "title"  # type: ignore
+
+
+def test_copy_sets_parent_links(monkeypatch: pytest.MonkeyPatch) -> None:
+    # AND of 100 ORs with 100 terms (about 10k nodes)
+    with Query.deferred_validation():
+        query = AndQuery(
+            [
+                OrQuery([f"term{i}x{j}" for j in range(100)], field=Fields.TITLE)
+                for i in range(100)
+            ],
+            field=Fields.TITLE,
+        )
+
+    # The tree is copied in one pass that sets the parent links directly,
+    # i.e., without adding the children (and resetting their parents) again
+    def fail(*args: object) -> None:
+        raise AssertionError("copy() should set the parent links directly")
+
+    monkeypatch.setattr(Query, "add_child", fail)
+    monkeypatch.setattr(Query, "_set_parent", fail)
+
+    copied = query.copy()
+
+    assert copied.to_generic_string() == query.to_generic_string()
+    for node in copied.walk():
+        for child in node.children:
+            assert child.get_parent() is node
+    assert sum(1 for _ in copied.walk()) == 100 * 101 + 1
+
+
+def test_deep_query_tree() -> None:
+    depth = 10000
+    with Query.deferred_validation():
+        query: Query = Term("leaf", field=SearchField("ti"), platform="deactivated")
+        deepest = query
+        for level in range(depth):
+            operator = OrQuery if level % 2 else AndQuery
+            query = operator(
+                [f"t{level}", query], field=SearchField("ab"), platform="deactivated"
+            )
+
+    assert deepest.get_root() is query
+    assert query.get_nr_leaves() == depth + 1
+    assert sum(1 for _ in query.walk()) == 2 * depth + 1
+    assert next(query.walk(post_order=True)).value == "t9999"
+    assert query.to_generic_string().startswith("OR[ab][t9999[ab], AND[ab][t9998[ab], ")
+
+    class DepthVisitor(QueryVisitor):
+        def __init__(self) -> None:
+            self.depth = self.max_depth = 0
+
+        def enter(self, node: Query, parent: typing.Optional[Query]) -> bool:
+            assert parent is node.get_parent()
+            self.depth += 1
+            self.max_depth = max(self.max_depth, self.depth)
+            return True
+
+        def leave(self, node: Query, parent: typing.Optional[Query]) -> None:
+            self.depth -= 1
+
+    visitor = DepthVisitor()
+    visitor.visit(query)
+    assert visitor.max_depth == depth + 1
+
+    copied = query.copy()
+    QueryTranslator.move_fields_to_terms(copied)
+    QueryTranslator.flatten_nested_operators(copied)
+    copied.set_platform_unchecked("generic")
+    assert copied.field is None
+    assert copied.children[0].field.value == "ab"  # type: ignore
+    assert copied.get_nr_leaves() == depth + 1
+    assert deepest.platform == "deactivated"
+
+
+@pytest.mark.parametrize("platform", ["wos", "pubmed", "ebscohost"])
+def test_deep_query_tree_translation(platform: str) -> None:
+    depth = 10000
+    with Query.deferred_validation():
+        query: Query = Term("leaf", field=SearchField(Fields.TITLE))
+        for level in range(depth):
+            operator = OrQuery if level % 2 else AndQuery
+            query = operator([f"t{level}", query], field=SearchField(Fields.TITLE))
+    query.set_platform_unchecked("generic")
+
+    translated = query.translate(platform)
+    assert translated.platform == platform
+    assert translated.get_nr_leaves() == depth + 1
+
+    generic = translated.translate("generic")
+    assert generic.platform == "generic"
+    assert generic.get_nr_leaves() == depth + 1
+
+
+def test_splice_children() -> None:
+    query = OrQuery(["a", "b", "c", "d"], field=Fields.TITLE)
+    a, b, c, d = query.children
+    e = Term("e", field=Fields.TITLE)
+    f = Term("f", field=Fields.TITLE)
+
+    query.splice_children({b: [e, f], d: []})
+    assert query.children == [a, e, f, c]
+    assert e.get_parent() is query and f.get_parent() is query
+    assert b.get_parent() is None and d.get_parent() is None
+
+    query.remove_children([a, c])
+    assert query.children == [e, f]
+    assert a.get_parent() is None
+
+
+def test_translator_rewrites() -> None:
+    query = AndQuery(
+        [
+            AndQuery(["x", AndQuery(["y", "z"])]),
+            OrQuery(["a", "a", "a", "b"], field=Fields.TITLE),
+        ],
+        field=Fields.TITLE,
+    )
+    QueryTranslator.flatten_nested_operators(query)
+    assert [child.value for child in query.children] == ["OR", "x", "y", "z"]
+    assert all(child.get_parent() is query for child in query.children)
+
+    QueryTranslator._remove_redundant_terms(query)  # pylint: disable=protected-access
+    assert query.to_generic_string() == (
+        "AND[title][OR[title][a[title], b[title]], x, y, z]"
+    )
+
+
+def test_from_terms() -> None:
+    query = OrQuery.from_terms(
+        (f"term {i}" for i in range(1000)), field="TI=", platform="wos"
+    )
+    assert len(query.children) == 1000
+    assert query.children[999].value == "term 999"
+    assert query.children[999].field.value == "TI="  # type: ignore
+    assert query.children[0].field is query.children[1].field
+    assert all(child.get_parent() is query for child in query.children)
+    assert query.children[0].platform == "wos"
+
+    query = AndQuery.from_terms(["digital", "work"], field=Fields.TITLE)
+    assert query.to_generic_string() == "AND[title][digital[title], work[title]]"
+
+
+def test_lazy_platform() -> None:
+    term = Term("ai", field=SearchField("TITLE"), platform="deactivated")
+    query = AndQuery(
+        [OrQuery([term, "ml"], platform="deactivated"), "ethics"],
+        platform="deactivated",
+    )
+    assert term.platform == "deactivated"
+
+    # The platform is stored at the root and resolved by the descendants
+    query.set_platform_unchecked("generic")
+    assert term.platform == "generic"
+    assert term.field.value == "TITLE"  # type: ignore
+    # Fields are normalized when the query is serialized (without modifying it)
+    assert query.to_generic_string() == "AND[OR[ai[title], ml], ethics]"
+    assert query.to_string() == "AND[OR[ai[title], ml], ethics]"
+    assert term.field.value == "TITLE"  # type: ignore
+    # ... or when it is validated
+    query.platform = "generic"
+    assert term.field.value == "title"  # type: ignore
+
+    # Detached nodes keep the platform, attached nodes inherit it
+    or_query = query.children[0]
+    query.remove_children([or_query])
+    query.set_platform_unchecked("deactivated")
+    assert or_query.platform == "generic"
+    assert term.platform == "generic"
+    query.add_child(or_query)
+    assert term.platform == "deactivated"
+    assert or_query.copy().children[0].platform == "deactivated"
+
+    # The resolved platform is cached until a platform or parent changes
+    assert term._resolved_platform == "deactivated"  # type: ignore
+    query.set_platform_unchecked("generic")
+    assert term.platform == "generic"
+    or_query.set_platform_unchecked("deactivated")
+    assert term.platform == "deactivated"
+
+    # ... in the modified subtree only (not in other trees)
+    other_term = Term("robotics")
+    other_query = OrQuery([other_term, "vision"], platform="generic")
+    assert other_term.platform == "generic"
+    query.set_platform_unchecked("generic")
+    query.add_child(Term("privacy"))
+    assert other_term._resolved_platform == "generic"  # type: ignore
+
+    # Moved subtrees resolve the platform of their new query
+    assert term.platform == "deactivated"
+    other_query.add_child(or_query)
+    assert term.platform == "generic"
+    assert or_query.get_parent() is other_query
+
+
+def test_freeze() -> None:
+    query = AndQuery(
+        [
+            OrQuery(["ai", "ml"], field=Fields.TITLE),
+            OrQuery(["ml", "ai"], field=Fields.TITLE),
+            NEARQuery(
+                "NEAR", children=["robot", "ethics"], field=Fields.TITLE, distance=3
+            ),
+        ],
+        field=Fields.TITLE,
+    )
+    frozen = query.freeze()
+
+    # Identical subtrees share one object, reordered ones are equal
+    assert frozen is query.copy().freeze()
+    assert frozen.children[0] == frozen.children[1]
+    assert frozen.children[0] is not frozen.children[1]
+    assert frozen.children[0].children[0] is frozen.children[1].children[1]
+    assert len({frozen.children[0], frozen.children[1]}) == 1
+    assert frozen.children[2].distance == 3
+    with pytest.raises(AttributeError):
+        frozen.value = "OR"  # type: ignore
+
+    assert frozen.to_query().to_generic_string() == query.to_generic_string()
+
+
+def test_freeze_within_order() -> None:
+    within = NEARQuery(
+        "WITHIN", children=["health", "care"], field=Fields.TITLE, distance=2
+    )
+    reordered = NEARQuery(
+        "WITHIN", children=["care", "health"], field=Fields.TITLE, distance=2
+    )
+    assert within.freeze() != reordered.freeze()
+    assert hash(within.freeze()) != hash(reordered.freeze())
+
+    # NEAR is not order-sensitive
+    near = NEARQuery(
+        "NEAR", children=["health", "care"], field=Fields.TITLE, distance=2
+    )
+    reordered = NEARQuery(
+        "NEAR", children=["care", "health"], field=Fields.TITLE, distance=2
+    )
+    assert near.freeze() == reordered.freeze()
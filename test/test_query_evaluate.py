@@ -1,6 +1,22 @@
+import csv
+import json
+import pickle
+import typing
+
+import pytest
+
 from search_query import AndQuery
 from search_query import OrQuery
 from search_query.constants import Fields
+from search_query.corpus import RecordCorpus
+from search_query.evaluation import DEFAULT_SAMPLE_SIZE
+from search_query.evaluation import EvaluationSession
+from search_query.evaluation import iter_records
+from search_query.matcher import CompiledQuery
+from search_query.matcher import term_pattern
+from search_query.query import Query
+from search_query.query_not import NotQuery
+from search_query.query_term import Term
 
 
 def test_case1() -> None:
@@ -40,3 +56,313 @@ def test_case1() -> None:
         "recall": 1.0,
         "f1_score": 1.0,
     }
+
+
+def test_compiled_query_matches() -> None:
+    query = AndQuery(
+        [
+            OrQuery(["microsourc*", '"crowd work"'], field=Fields.TITLE),
+            OrQuery(["online"], field=Fields.ABSTRACT),
+        ],
+        field=Fields.TITLE,
+    )
+    compiled_query = query.compile()
+
+    record_1 = {"title": "Microsourcing platforms", "abstract": "Online labor"}
+    record_2 = {"title": "Crowd work in practice", "abstract": "Online markets"}
+    record_3 = {"title": "Crowd work in practice", "abstract": "Offline markets"}
+
+    assert compiled_query.matches(record_1)
+    assert compiled_query.matches(record_2)
+    assert not compiled_query.matches(record_3)
+    for record in [record_1, record_2, record_3]:
+        assert compiled_query.matches(record) == query.selects(record_dict=record)
+
+    # Compiling does not modify the original query
+    assert query.field.value == Fields.TITLE  # type: ignore
+
+
+def test_term_wildcards_and_word_boundaries() -> None:
+    record = {"title": "Ethical AI for women's e-health (labour markets)"}
+
+    def selects(value: str) -> bool:
+        return Term(value, field=Fields.TITLE).selects(record_dict=record)
+
+    assert selects("ethic*")
+    assert selects("wom?n")
+    assert selects("labo#r")
+    assert selects("labo$r")
+    assert selects("labou$r")
+    assert selects("e-health")
+    assert selects('"AI for women"')
+    assert not selects("ethic")
+    assert not selects("heal")
+    assert not selects("wo?n")
+    assert not selects("ethical*ai")
+
+    # Identical terms share the same precompiled pattern
+    assert term_pattern('"AI"') is term_pattern('"AI"')
+
+
+def test_parallel_evaluation() -> None:
+    records_dict = {
+        f"r{i}": {
+            "title": title,
+            "colrev_status": "rev_included" if i % 3 else "rev_excluded",
+        }
+        for i, title in enumerate(
+            [
+                "Microsourcing platforms for online labor",
+                "Online work and the future of microsourcing",
+                "Microsourcing case studies",
+                "Freelancing and online job platforms",
+                "Crowd work in practice",
+            ]
+            * 4
+        )
+    }
+    query = OrQuery(["microsourc*", "online"], field=Fields.TITLE)
+
+    # The compiled query is shipped to the worker processes
+    compiled_query = query.compile()
+    assert pickle.loads(pickle.dumps(compiled_query)).matches(records_dict["r0"])
+
+    expected = query.evaluate(records_dict)
+    assert query.evaluate(records_dict, workers=2, chunk_size=3) == expected
+
+    with pytest.raises(ValueError):
+        query.evaluate(records_dict, workers=0)
+
+
+def test_evaluate_file(tmp_path) -> None:  # type: ignore
+    records = [
+        {
+            "ID": "r1",
+            "title": "Microsourcing platforms for online labor",
+            "colrev_status": "rev_included",
+        },
+        {
+            "ID": "r2",
+            "title": "Online work and the future of microsourcing",
+            "colrev_status": "rev_included",
+        },
+        {
+            "ID": "r3",
+            "title": "Microsourcing case studies",
+            "colrev_status": "rev_excluded",
+        },
+        {
+            "ID": "r4",
+            "title": "Freelancing and online job platforms",
+            "colrev_status": "rev_prescreen_excluded",
+        },
+    ]
+    query = OrQuery(["microsourcing", "job"], field=Fields.TITLE)
+    expected = query.evaluate({record["ID"]: record for record in records})
+
+    jsonl_path = tmp_path / "records.jsonl"
+    jsonl_path.write_text("\n".join(json.dumps(record) for record in records))
+
+    csv_path = tmp_path / "records.csv"
+    with open(csv_path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=["ID", "title", "colrev_status"])
+        writer.writeheader()
+        writer.writerows(records)
+
+    bib_path = tmp_path / "records.bib"
+    bib_path.write_text(
+        "@comment{ignored}\n\n"
+        + "\n\n".join(
+            f"@article{{{record['ID']},\n"
+            f"  colrev_status = {{{record['colrev_status']}}},\n"
+            f"  title = {{{{{record['title'][:4]}}}{record['title'][4:]}}},\n"
+            "}"
+            for record in records
+        )
+    )
+
+    for path in [jsonl_path, csv_path, bib_path]:
+        assert query.evaluate_file(str(path)) == expected
+
+    assert list(iter_records(str(bib_path)))[0] == {
+        "ENTRYTYPE": "article",
+        "ID": "r1",
+        "colrev_status": "rev_included",
+        "title": "Microsourcing platforms for online labor",
+    }
+    with pytest.raises(ValueError):
+        query.evaluate_file(str(tmp_path / "records.xlsx"))
+
+
+def test_iter_bib_braces_in_values(tmp_path) -> None:  # type: ignore
+    bib_path = tmp_path / "records.bib"
+    bib_path.write_text(
+        "@article{r1,\n"
+        '  title = "Set } operations { in",\n'
+        '  abstract = "An \\} escaped brace"}\n'
+        "@article{r2,\n"
+        "  title = {Online \\{labor},\n"
+        "  colrev_status = {rev_included}\n"
+        "} @article{r3, title = {Online work}}\n"
+    )
+    records = list(iter_records(str(bib_path)))
+    assert [record["ID"] for record in records] == ["r1", "r2", "r3"]
+    assert records[0]["title"] == "Set operations in"
+    assert records[0]["abstract"] == "An \\ escaped brace"
+    assert records[1]["colrev_status"] == "rev_included"
+    assert records[2]["title"] == "Online work"
+
+
+def test_evaluate_file_missing_values(tmp_path) -> None:  # type: ignore
+    query = OrQuery(["microsourcing", "job"], field=Fields.ABSTRACT)
+
+    jsonl_path = tmp_path / "records.jsonl"
+    jsonl_path.write_text(
+        json.dumps({"abstract": "Microsourcing", "colrev_status": "rev_included"})
+        + "\n"
+        + json.dumps({"abstract": None, "colrev_status": "rev_included"})
+    )
+    csv_path = tmp_path / "records.csv"
+    csv_path.write_text(
+        "colrev_status,title,abstract\n"
+        "rev_included,Microsourcing,Microsourcing\n"
+        "rev_included,Crowd work\n"
+    )
+
+    for path in [jsonl_path, csv_path]:
+        results = query.evaluate_file(str(path))
+        assert results["true_positives"] == 1
+        assert results["false_negatives"] == 1
+
+    # None values are matched like empty fields
+    assert not query.selects(record_dict={"abstract": None})
+
+
+def test_reorder_by_match_rates(monkeypatch: pytest.MonkeyPatch) -> None:
+    records = [
+        {"title": "online labor platforms"},
+        {"title": "online work"},
+        {"title": "online microsourcing"},
+        {"title": "offline labor"},
+    ]
+    query = AndQuery(
+        [
+            OrQuery(["labor", "online"], field=Fields.TITLE),
+            NotQuery(["online", "labor"], field=Fields.TITLE),
+            OrQuery(["microsourcing"], field=Fields.TITLE),
+        ],
+        field=Fields.TITLE,
+    )
+    compiled = query.compile()
+    reordered = compiled.reorder(records)
+
+    # The selective children are checked first, the results are unchanged
+    root = reordered.root
+    assert root.children[0].children[0].pattern.value == "microsourcing"  # type: ignore
+    assert root.children[1].negative_first  # type: ignore
+    assert root.children[2].children[0].pattern.value == "online"  # type: ignore
+    assert [reordered.matches(record) for record in records] == [
+        compiled.matches(record) for record in records
+    ]
+    assert compiled.reorder([]).matches(records[0]) == compiled.matches(records[0])
+
+    # evaluate() reorders the query based on the first records (the sample)
+    samples: typing.List[list] = []
+    reorder = CompiledQuery.reorder
+
+    def record_sample(self: CompiledQuery, records: list) -> CompiledQuery:
+        samples.append(records)
+        return reorder(self, records)
+
+    monkeypatch.setattr(CompiledQuery, "reorder", record_sample)
+    records_dict = {
+        str(i): dict(record, colrev_status="rev_included")
+        for i, record in enumerate(records * 50)
+    }
+    assert query.evaluate(records_dict)["true_positives"] == 50
+    assert [len(sample) for sample in samples] == [DEFAULT_SAMPLE_SIZE]
+
+    # No sample is matched when there are fewer records than the sample size
+    samples.clear()
+    small_records_dict = dict(list(records_dict.items())[: DEFAULT_SAMPLE_SIZE - 1])
+    query.evaluate(small_records_dict)
+    assert not samples
+
+
+def test_evaluation_session() -> None:
+    records_dict = {
+        "r1": {"title": "Online labor", "colrev_status": "rev_included"},
+        "r2": {"title": "Online work", "colrev_status": "rev_excluded"},
+        "r3": {"title": "Offline labor", "colrev_status": "md_processed"},
+    }
+    query = OrQuery(["online"], field=Fields.TITLE)
+    session = EvaluationSession()
+
+    assert session.evaluate(query, records_dict) == query.evaluate(records_dict)
+    assert session.nr_matched == 3
+
+    # Relabelled records are not matched again
+    records_dict["r3"]["colrev_status"] = "rev_included"
+    assert session.evaluate(query, records_dict) == query.evaluate(records_dict)
+    assert session.nr_matched == 3
+
+    # Only new and changed records are matched
+    records_dict["r2"]["title"] = "Offline work"
+    records_dict["r4"] = {"title": "Online platforms", "colrev_status": "rev_included"}
+    assert session.evaluate(query.copy(), records_dict) == query.evaluate(records_dict)
+    assert session.nr_matched == 5
+
+
+def test_evaluation_session_eviction() -> None:
+    records_dict = {
+        "r1": {"title": "Online labor", "colrev_status": "rev_included"},
+        "r2": {"title": "Online work", "colrev_status": "rev_excluded"},
+    }
+    online = OrQuery(["online", "digital"], field=Fields.TITLE)
+    labor = OrQuery(["labor"], field=Fields.TITLE)
+    work = OrQuery(["work"], field=Fields.TITLE)
+    session = EvaluationSession(max_queries=2)
+
+    session.evaluate(online, records_dict)
+    session.evaluate(labor, records_dict)
+    session.evaluate(online, records_dict)
+    assert session.nr_matched == 4
+
+    # The least recently evaluated query (labor) is evicted
+    session.evaluate(work, records_dict)
+    assert session.nr_matched == 6
+    assert len(session._matches) == 2  # pylint: disable=protected-access
+    assert len(session._interned) == 5  # pylint: disable=protected-access
+    session.evaluate(online, records_dict)
+    assert session.nr_matched == 6
+    assert session.evaluate(labor, records_dict) == labor.evaluate(records_dict)
+    assert session.nr_matched == 8
+
+
+def test_deep_query_evaluation() -> None:
+    depth = 10000
+    with Query.deferred_validation():
+        query: Query = Term("leaf", field=Fields.TITLE)
+        for level in range(depth):
+            operator = OrQuery if level % 2 else AndQuery
+            # Note: the nested query comes first, i.e., matching descends to the leaf
+            query = operator([query, f"t{level}"], field=Fields.TITLE)
+
+    records = {
+        "r1": {"title": "t9999", "colrev_status": "rev_included"},
+        "r2": {"title": "leaf t0", "colrev_status": "rev_excluded"},
+        "r3": {"title": "t9997", "colrev_status": "rev_included"},
+        "r4": {"title": "t9997 t9998", "colrev_status": "rev_excluded"},
+    }
+    compiled = query.compile()
+    assert [compiled.matches(record) for record in records.values()] == [
+        True,
+        False,
+        False,
+        True,
+    ]
+    for evaluated_records in [records, RecordCorpus(records)]:
+        results = query.evaluate(evaluated_records)
+        assert results["selected"] == 2
+        assert results["true_positives"] == 1
+        assert results["false_negatives"] == 1
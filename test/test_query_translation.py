@@ -214,3 +214,31 @@ def test_translation_pubmed_date_to_wos_year() -> None:
 
     expected = 'TI="quantum" AND PY=2022'
     assert converted_query == expected
+
+
+def test_translation_copies(monkeypatch: pytest.MonkeyPatch) -> None:
+    query = search_query.parser.parse(
+        '"digital health"[tiab] AND privacy[ti]', platform=PLATFORM.PUBMED.value
+    )
+    query_str = query.to_string()
+
+    generic_query = PubmedTranslator.to_generic_syntax(query)
+    assert query.to_string() == query_str
+    assert generic_query.children[0].get_parent() is generic_query
+
+    generic_query = query.translate("generic")
+    copies = []
+    copy = Query.copy
+    monkeypatch.setattr(
+        Query, "copy", lambda self: copies.append(self) or copy(self)  # type: ignore
+    )
+
+    # Generic queries are copied once (by the translator)
+    wos_query = generic_query.translate(PLATFORM.WOS.value)
+    assert sum(1 for copied in copies if copied is generic_query) == 1
+    assert wos_query.to_string() == (
+        '(AB="digital health" OR TI="digital health") AND TI=privacy'
+    )
+    assert generic_query.platform == "generic"
+    assert query.translate(PLATFORM.WOS.value).to_string() == wos_query.to_string()
+    assert query.to_string() == query_str
@@ -1,9 +1,13 @@
 #!/usr/bin/env python3
 """Web-of-Science unit tests for internals of query parser."""
+import pytest
+
 from search_query.constants import Fields
 from search_query.constants import Token
 from search_query.constants import TokenTypes
+from search_query.exception import ListQuerySyntaxError
 from search_query.wos.constants import syntax_str_to_generic_field_set
+from search_query.wos.parser import WOSListParser
 from search_query.wos.parser import WOSParser
 
 # ruff: noqa: E501
@@ -252,3 +256,173 @@ def test_query_parsing_2() -> None:
     assert query.children[1].value == "OR"
     assert query.children[1].children[1].value == "John Wayne"
     assert query.children[1].children[1].field.value == "AU="  # type: ignore
+
+
+def test_query_parsing_precedence() -> None:
+    parser = WOSParser(
+        query_str="TI=a OR TI=b AND TI=c NOT TI=d OR TI=e",
+        silent=True,
+    )
+    query = parser.parse()
+
+    assert (
+        query.to_generic_string()
+        == "OR[a[TI=], AND[b[TI=], NOT[c[TI=], d[TI=]]], e[TI=]]"
+    )
+    assert query.position == (0, 38)
+    assert query.children[1].position == (8, 30)
+
+
+def test_query_parsing_long_query() -> None:
+    query_str = " AND ".join(
+        f"TS=(term{i}a OR term{i}b OR (term{i}c NEAR/2 term{i}d))" for i in range(500)
+    )
+    parser = WOSParser(query_str=query_str, silent=True)
+    query = parser.parse()
+
+    assert query.value == "AND"
+    assert len(query.children) == 500
+    assert query.children[-1].field.value == "TS="  # type: ignore
+    assert query.children[-1].children[2].value == "NEAR"
+    assert query.children[-1].children[2].distance == 2  # type: ignore
+
+
+def test_closing_quotes() -> None:
+    parser = WOSParser(query_str='"a b" OR ("c OR d") AND "e f" OR ("g)"')
+    parser.tokens = [
+        Token(value='"', type=TokenTypes.QUOTATION_MARK, position=(0, 1)),
+        Token(value="a b", type=TokenTypes.TERM, position=(1, 4)),
+        Token(value='"', type=TokenTypes.QUOTATION_MARK, position=(4, 5)),
+        Token(value="OR", type=TokenTypes.LOGIC_OPERATOR, position=(6, 8)),
+        Token(value="(", type=TokenTypes.PARENTHESIS_OPEN, position=(9, 10)),
+        Token(value='"', type=TokenTypes.QUOTATION_MARK, position=(10, 11)),
+        Token(value="c", type=TokenTypes.TERM, position=(11, 12)),
+        Token(value="OR", type=TokenTypes.LOGIC_OPERATOR, position=(13, 15)),
+        Token(value="d", type=TokenTypes.TERM, position=(16, 17)),
+        Token(value='"', type=TokenTypes.QUOTATION_MARK, position=(17, 18)),
+        Token(value=")", type=TokenTypes.PARENTHESIS_CLOSED, position=(18, 19)),
+        Token(value="AND", type=TokenTypes.LOGIC_OPERATOR, position=(20, 23)),
+        Token(value='"', type=TokenTypes.QUOTATION_MARK, position=(24, 25)),
+        Token(value="e f", type=TokenTypes.TERM, position=(25, 28)),
+        Token(value='"', type=TokenTypes.QUOTATION_MARK, position=(28, 29)),
+        Token(value="OR", type=TokenTypes.LOGIC_OPERATOR, position=(30, 32)),
+        Token(value="(", type=TokenTypes.PARENTHESIS_OPEN, position=(33, 34)),
+        Token(value='"', type=TokenTypes.QUOTATION_MARK, position=(34, 35)),
+        Token(value="g", type=TokenTypes.TERM, position=(35, 36)),
+        Token(value=")", type=TokenTypes.PARENTHESIS_CLOSED, position=(36, 37)),
+        Token(value='"', type=TokenTypes.QUOTATION_MARK, position=(37, 38)),
+    ]
+
+    closing_quotes = parser._get_closing_quotes()
+
+    # Upper case operators and unmatched parentheses end the look-ahead
+    assert [i for i, closing in enumerate(closing_quotes) if closing] == [0, 12]
+    assert len(closing_quotes) == len(parser.tokens)
+
+
+def test_split_operators_with_missing_whitespace() -> None:
+    parser = WOSParser(query_str="")
+    parser.tokens = [
+        Token(value="cancerAND", type=TokenTypes.TERM, position=(0, 9)),
+        Token(value="tumorOR", type=TokenTypes.TERM, position=(10, 17)),
+        Token(value="OR", type=TokenTypes.LOGIC_OPERATOR, position=(18, 20)),
+        Token(value="growthNOT", type=TokenTypes.TERM, position=(21, 30)),
+    ]
+    parser.split_operators_with_missing_whitespace()
+
+    assert parser.tokens == [
+        Token(value="cancer", type=TokenTypes.TERM, position=(0, 6)),
+        Token(value="AND", type=TokenTypes.LOGIC_OPERATOR, position=(6, 9)),
+        Token(value="tumorOR", type=TokenTypes.TERM, position=(10, 17)),
+        Token(value="OR", type=TokenTypes.LOGIC_OPERATOR, position=(18, 20)),
+        Token(value="growthNOT", type=TokenTypes.TERM, position=(21, 30)),
+    ]
+
+
+def test_build_query_str_reused_references() -> None:
+    query_list = "1. TS=a\n2. #1 OR b\n3. #2 AND #1\n4. #3 NOT #2"
+    list_parser = WOSListParser(query_list)
+    list_parser.tokenize_list()
+
+    (
+        query_str,
+        offset,
+        processed_lines,
+        artificial_to_original_pos,
+    ) = list_parser.build_query_str()
+
+    assert query_str == "(((TS=a) OR b) AND (TS=a)) NOT ((TS=a) OR b)"
+    assert processed_lines == {"1", "2", "3", "4"}
+    # Each reference is inlined in artificial parentheses (negative offsets),
+    # which are mapped to the position of the reference
+    assert offset[0] == -2 and offset[25] == -2
+    assert artificial_to_original_pos[-2] == (35, 37)
+    assert artificial_to_original_pos[-7] == (11, 13)
+    # Terms of reused lines are mapped to their original position
+    assert offset[3] == offset[20] == offset[33] == query_list.index("TS=a")
+
+
+def test_build_query_str_long_list() -> None:
+    # References are resolved iteratively (not limited by the recursion depth)
+    nr_lines = 3000
+    query_list = "1. TS=a\n" + "\n".join(
+        f"{i}. #{i - 1} OR t{i}" for i in range(2, nr_lines + 1)
+    )
+    list_parser = WOSListParser(query_list)
+    list_parser.tokenize_list()
+
+    query_str, _, processed_lines, _ = list_parser.build_query_str()
+
+    assert query_str.startswith("(" * (nr_lines - 1) + "TS=a) OR t2) OR t3)")
+    assert query_str.endswith(f"OR t{nr_lines}")
+    assert len(processed_lines) == nr_lines
+
+    # Parsing the query string (and linting the query tree) is recursive,
+    # which limits the depth of the history (about 300 chained references)
+    nr_lines = 200
+    query_list = "1. TS=a\n" + "\n".join(
+        f"{i}. #{i - 1} OR TS=t{i}" for i in range(2, nr_lines + 1)
+    )
+    query = WOSListParser(query_list).parse()
+    assert query.get_nr_leaves() == nr_lines
+    assert query.children[-1].value == f"t{nr_lines}"
+
+
+def test_build_query_str_mutual_references() -> None:
+    list_parser = WOSListParser("1. TS=a\n2. #3 AND #1\n3. #2 OR #1\n")
+    list_parser.tokenize_list()
+
+    with pytest.raises(ListQuerySyntaxError):
+        list_parser.build_query_str()
+
+    assert list_parser.linter.messages == {
+        "2": [
+            {
+                "code": "PARSE_1003",
+                "label": "list-query-circular-reference",
+                "message": "Query line references itself",
+                "is_fatal": True,
+                "position": [(11, 13)],
+                "details": "List reference #3 is circular.",
+            }
+        ]
+    }
+    with pytest.raises(ListQuerySyntaxError):
+        WOSListParser("1. TS=a\n2. #3 AND #1\n3. #2 OR #1\n").parse()
+
+
+def test_query_with_normalized_fields_at_terms() -> None:
+    query = WOSParser("TI=(a OR b) AND AB=c").parse()
+    linter = WOSParser("").linter
+
+    term_field_query = linter.get_query_with_normalized_fields_at_terms(query)
+
+    fields = [node.field.value for node in term_field_query.walk() if node.field]  # type: ignore
+    assert fields == ["TI=", "TI=", "AB="]
+    # The copy is a consistent tree (and the query is not modified)
+    for node in term_field_query.walk():
+        for child in node.children:
+            assert child.get_parent() is node
+    assert term_field_query.children[0].children[0].get_root() is term_field_query
+    assert query.children[0].field.value == "TI="  # type: ignore
+    assert query.children[0].children[0].field is None
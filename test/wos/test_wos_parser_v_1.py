@@ -847,6 +847,10 @@ def test_tokenization(query_str: str, expected_tokens: list) -> None:
                 },
             ],
         ),
+        (
+            "TI=device OR (TI=wearable AND PY=2000-2010)",
+            [],
+        ),
     ],
 )
 def test_linter(